@@ -0,0 +1,77 @@
+"""Digest definitions for multi-topic runs of scripts/daily_scan.py.
+
+A config file is JSON:
+
+    {"digests": [
+        {"name": "lending", "query": "small business lending",
+         "recipients": ["ops@example.com"], "prompt_path": "app/llm/prompts/content_radar_system.md"},
+        {"name": "tech", "query": "fintech", "prompt": "You are ...", "per_source": 5}
+    ]}
+
+`recipients` defaults to EMAIL_TO (comma-separated), `name` to the query,
+and `prompt`/`prompt_path` to the IDEA_SYSTEM_PROMPT(_PATH) env vars.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class DigestSpec:
+    name: str
+    query: str
+    recipients: Tuple[str, ...]
+    prompt: Optional[str] = None
+    prompt_path: Optional[str] = None
+    per_source: int = 3
+
+    @property
+    def slug(self) -> str:
+        return re.sub(r"[^a-z0-9]+", "-", self.name.lower()).strip("-") or "digest"
+
+
+def _default_recipients() -> Tuple[str, ...]:
+    return _split_recipients(os.environ.get("EMAIL_TO", ""))
+
+
+def _split_recipients(value) -> Tuple[str, ...]:
+    if isinstance(value, str):
+        value = value.split(",")
+    return tuple(addr.strip() for addr in value or [] if addr and addr.strip())
+
+
+def single_digest(query: str, per_source: int = 3) -> DigestSpec:
+    """The one-query digest used when no config file is given."""
+    return DigestSpec(name=query, query=query, recipients=_default_recipients(), per_source=per_source)
+
+
+def load_digest_config(path: str) -> List[DigestSpec]:
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    entries = raw.get("digests", []) if isinstance(raw, dict) else raw
+    digests: List[DigestSpec] = []
+    seen = set()
+    for entry in entries:
+        query = (entry.get("query") or "").strip()
+        if not query:
+            raise ValueError(f"Digest entry without a query in {path}: {entry}")
+        spec = DigestSpec(
+            name=(entry.get("name") or query).strip(),
+            query=query,
+            recipients=_split_recipients(entry.get("recipients")) or _default_recipients(),
+            prompt=entry.get("prompt"),
+            prompt_path=entry.get("prompt_path"),
+            per_source=int(entry.get("per_source", 3)),
+        )
+        if spec.slug in seen:
+            raise ValueError(f"Duplicate digest name '{spec.name}' in {path}")
+        seen.add(spec.slug)
+        digests.append(spec)
+    if not digests:
+        raise ValueError(f"No digests defined in {path}")
+    return digests
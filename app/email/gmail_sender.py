@@ -1,13 +1,26 @@
 import base64
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from email.message import EmailMessage
+from functools import lru_cache
+from typing import List, Sequence, Tuple
 
+import google_auth_httplib2
+import httplib2
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 
+from ..metrics import stage
 
-def send_email(to_address: str, subject: str, body_text: str) -> None:
-    creds = Credentials(
+SEND_WORKERS = int(os.environ.get("GMAIL_SEND_WORKERS", "4"))
+
+_thread_local = threading.local()
+
+
+@lru_cache(maxsize=1)
+def _credentials() -> Credentials:
+    return Credentials(
         token=None,
         refresh_token=os.environ["GOOGLE_REFRESH_TOKEN"],
         token_uri="https://oauth2.googleapis.com/token",
@@ -16,8 +29,23 @@ def send_email(to_address: str, subject: str, body_text: str) -> None:
         scopes=["https://www.googleapis.com/auth/gmail.send"],
     )
 
-    service = build("gmail", "v1", credentials=creds)
 
+@lru_cache(maxsize=1)
+def _gmail_service():
+    """Build the Gmail client once per process; requests run on `_thread_http()`."""
+    return build("gmail", "v1", credentials=_credentials(), cache_discovery=False)
+
+
+def _thread_http() -> google_auth_httplib2.AuthorizedHttp:
+    # httplib2 connections are not thread-safe, so each sender thread gets its own.
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(_credentials(), http=httplib2.Http(timeout=60))
+        _thread_local.http = http
+    return http
+
+
+def send_email(to_address: str, subject: str, body_text: str) -> None:
     msg = EmailMessage()
     msg.set_content(body_text)
     msg["To"] = to_address
@@ -26,7 +54,26 @@ def send_email(to_address: str, subject: str, body_text: str) -> None:
 
     raw = base64.urlsafe_b64encode(msg.as_bytes()).decode("utf-8")
 
-    service.users().messages().send(
-        userId="me",
-        body={"raw": raw},
-    ).execute()
+    with stage("gmail.send", messages=1, bytes=len(raw)):
+        _gmail_service().users().messages().send(
+            userId="me",
+            body={"raw": raw},
+        ).execute(http=_thread_http())
+
+
+def send_emails(messages: Sequence[Tuple[str, str, str]], max_workers: int = SEND_WORKERS) -> List[Exception]:
+    """Send (to_address, subject, body_text) messages with bounded parallelism.
+
+    Returns the errors (empty when everything was sent) so one bad recipient
+    doesn't stop the rest.
+    """
+    if not messages:
+        return []
+    errors: List[Exception] = []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(messages)))) as pool:
+        futures = [pool.submit(send_email, *message) for message in messages]
+        for future in futures:
+            exc = future.exception()
+            if exc is not None:
+                errors.append(exc)
+    return errors
@@ -0,0 +1,88 @@
+"""On-disk cache for LLM responses.
+
+Entries are JSON files under `data/cache/llm/`, named by a SHA-256 of
+everything that determines the completion (prompt, inputs, model, params).
+Entries older than `LLM_CACHE_TTL` seconds are ignored and swept on write.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+CACHE_DIR = Path("data") / "cache" / "llm"
+
+
+def _ttl_s() -> int:
+    # Read on use so a value loaded from .env applies.
+    return int(os.environ.get("LLM_CACHE_TTL", str(24 * 3600)))
+
+
+_stats = {"hits": 0, "misses": 0}
+_stats_lock = threading.Lock()
+
+
+def cache_key(payload: dict) -> str:
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def _count(name: str) -> None:
+    with _stats_lock:
+        _stats[name] += 1
+
+
+def get_cached(key: str) -> Optional[str]:
+    path = CACHE_DIR / f"{key}.json"
+    ttl_s = _ttl_s()
+    if ttl_s <= 0 or not path.exists():
+        _count("misses")
+        return None
+    try:
+        entry = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        entry = None
+    if not entry or time.time() - entry.get("created_at", 0) > ttl_s:
+        _count("misses")
+        return None
+    _count("hits")
+    return entry["response"]
+
+
+def put_cached(key: str, response: str) -> None:
+    if _ttl_s() <= 0:
+        return
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    path = CACHE_DIR / f"{key}.json"
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps({"created_at": time.time(), "response": response}), encoding="utf-8")
+    tmp_path.replace(path)
+    evict_expired()
+
+
+def evict_expired() -> int:
+    """Delete expired entries; returns how many were removed."""
+    if not CACHE_DIR.exists():
+        return 0
+    cutoff = time.time() - _ttl_s()
+    removed = 0
+    for path in CACHE_DIR.glob("*.json"):
+        try:
+            if path.stat().st_mtime < cutoff:
+                path.unlink()
+                removed += 1
+        except FileNotFoundError:
+            continue
+    return removed
+
+
+def cache_stats() -> dict:
+    """Hits/misses since process start, plus the hit rate (None before any lookup)."""
+    with _stats_lock:
+        hits, misses = _stats["hits"], _stats["misses"]
+    total = hits + misses
+    return {"hits": hits, "misses": misses, "hit_rate": hits / total if total else None}
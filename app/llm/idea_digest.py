@@ -3,17 +3,23 @@
 from __future__ import annotations
 
 import os
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from openai import OpenAI
 
+from ..metrics import count, stage
+from .cache import cache_key, get_cached, put_cached
+
 DEFAULT_PROMPT = """
 You are a sharp content strategist. Read the new items and propose concise ideas for tweets, blog posts, and TikTok hooks. Keep tone clear and actionable, avoid fluff, and include links when provided.
 """.strip()
 
 
-def _load_system_prompt() -> str:
-    path = os.environ.get("IDEA_SYSTEM_PROMPT_PATH")
+def _load_system_prompt(path: Optional[str] = None, prompt: Optional[str] = None) -> str:
+    """Resolve the system prompt: explicit path/prompt first, then the env vars."""
+    if prompt and not path:
+        return prompt.strip()
+    path = path or os.environ.get("IDEA_SYSTEM_PROMPT_PATH")
     if path and os.path.exists(path):
         try:
             return open(path, "r", encoding="utf-8").read().strip() or DEFAULT_PROMPT
@@ -25,35 +31,62 @@ def _load_system_prompt() -> str:
     return DEFAULT_PROMPT
 
 
-def _format_items(new_items: Iterable[dict], limit: int = 12) -> str:
+def format_item_line(rec: dict) -> str:
+    title = (rec.get("title") or rec.get("summary") or rec.get("text") or "").strip()
+    title = title[:280]
+    url = rec.get("url") or ""
+    src = rec.get("source") or ""
+    also = rec.get("also_in") or []
+    covered = f" (also covered by: {', '.join(also)})" if also else ""
+    return f"- [{src}] {title}{' ' + url if url else ''}{covered}"
+
+
+def _format_items(new_items: Iterable[dict], limit: Optional[int] = 12) -> str:
     lines: List[str] = []
     for idx, rec in enumerate(new_items):
-        if idx >= limit:
+        if limit is not None and idx >= limit:
             break
-        title = (rec.get("title") or rec.get("summary") or rec.get("text") or "").strip()
-        title = title[:280]
-        url = rec.get("url") or ""
-        src = rec.get("source") or ""
-        lines.append(f"- [{src}] {title}{' ' + url if url else ''}")
+        lines.append(format_item_line(rec))
     if not lines:
         return "(no new items today; pull ideas from evergreen content)"
     return "\n".join(lines)
 
 
-def build_content_ideas(new_items: List[dict], query: str) -> str:
-    prompt = _load_system_prompt()
-    items_text = _format_items(new_items)
+def build_content_ideas(
+    new_items: List[dict],
+    query: str,
+    refresh: bool = False,
+    ranked: bool = False,
+    prompt: Optional[str] = None,
+    prompt_path: Optional[str] = None,
+) -> str:
+    """Return GPT content ideas for the new items.
+
+    Pass `ranked=True` when the items were already chosen and ordered by
+    relevance under a token budget (see app/llm/item_selection.py); otherwise
+    the first 12 are used in the order given.
+
+    Responses are cached on disk by prompt, items, query, model and params, so
+    re-runs (e.g. after a failed send) cost no LLM call. `refresh` bypasses the
+    cached entry and overwrites it.
+
+    `prompt` / `prompt_path` override the IDEA_SYSTEM_PROMPT(_PATH) env vars
+    for one digest.
+    """
+    prompt = _load_system_prompt(path=prompt_path, prompt=prompt)
+    items_text = _format_items(new_items, limit=None if ranked else 12)
+    items_header = "New items (most relevant first):" if ranked else "New items (most recent first):"
     model = os.environ.get("IDEA_MODEL", "gpt-5.2")
+    params = {"temperature": 0.6, "max_completion_tokens": 700}
 
-    client = OpenAI()
     messages = [
         {"role": "system", "content": prompt},
         {
             "role": "user",
             "content": (
                 "Topic focus: " + query + "\n\n"
-                "New items (most recent first):\n" + items_text + "\n\n"
-                "Return concise bullets:\n"
+                + items_header + "\n" + items_text + "\n\n"
+                + "Return concise bullets:\n"
                 "- 3 tweet ideas (one line each, include links when useful)\n"
                 "- 2 blog post ideas (titles + 1-line angle)\n"
                 "- 2 TikTok hooks (short hook + angle)\n"
@@ -61,11 +94,28 @@ def build_content_ideas(new_items: List[dict], query: str) -> str:
         },
     ]
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=messages,
-        temperature=0.6,
-        max_completion_tokens=700,
+    key = cache_key({"model": model, "messages": messages, **params})
+    if not refresh:
+        cached = get_cached(key)
+        if cached is not None:
+            count("llm.ideas", cache_hits=1)
+            return cached
+
+    client = OpenAI()
+    with stage("llm.ideas", api_calls=1):
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            **params,
+        )
+    usage = getattr(response, "usage", None)
+    count(
+        "llm.ideas",
+        prompt_tokens=getattr(usage, "prompt_tokens", 0),
+        completion_tokens=getattr(usage, "completion_tokens", 0),
     )
 
-    return response.choices[0].message.content.strip() if response.choices else ""
+    ideas = response.choices[0].message.content.strip() if response.choices else ""
+    if ideas:
+        put_cached(key, ideas)
+    return ideas
@@ -0,0 +1,74 @@
+"""Relevance-ranked, token-budgeted selection of new items for the idea prompt.
+
+Items are scored by cosine similarity between their document vector (the
+centroid of the chunk embeddings computed at ingest) and the query vector,
+then picked greedily with maximal marginal relevance so near-duplicate
+stories don't crowd out the rest. Selection stops when the formatted item
+lines would exceed the token budget.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+DEFAULT_TOKEN_BUDGET = 800
+MMR_LAMBDA = 0.6
+# MMR is quadratic in candidates; only the most relevant ones can win anyway.
+MAX_CANDIDATES = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough BPE token count (~4 characters per token for English prose)."""
+    return max(1, (len(text) + 3) // 4)
+
+
+def select_items(
+    items: Sequence[dict],
+    vectors: Dict[Tuple[str, str], np.ndarray],
+    query_vector: np.ndarray,
+    format_line: Callable[[dict], str],
+    token_budget: Optional[int] = None,
+    mmr_lambda: float = MMR_LAMBDA,
+) -> List[dict]:
+    """Return items in selection order, fitting `token_budget` once formatted.
+
+    `vectors` maps (source, external_id) to unit-length document vectors and
+    `query_vector` is unit length. Items without a vector are skipped.
+    `token_budget` defaults to IDEA_ITEMS_TOKEN_BUDGET, read on each call so
+    a value loaded from .env applies.
+    """
+    if token_budget is None:
+        token_budget = int(os.environ.get("IDEA_ITEMS_TOKEN_BUDGET", str(DEFAULT_TOKEN_BUDGET)))
+    candidates = [item for item in items if (item.get("source"), item.get("external_id")) in vectors]
+    if not candidates:
+        return []
+
+    matrix = np.stack([vectors[(item["source"], item["external_id"])] for item in candidates])
+    relevance = matrix @ query_vector
+    order = np.argsort(-relevance)[:MAX_CANDIDATES]
+    candidates = [candidates[i] for i in order]
+    matrix, relevance = matrix[order], relevance[order]
+
+    selected: List[dict] = []
+    used_tokens = 0
+    # Highest similarity of each candidate to anything already selected.
+    redundancy = np.full(len(candidates), -1.0, dtype=np.float32)
+    available = np.ones(len(candidates), dtype=bool)
+
+    while available.any():
+        scores = mmr_lambda * relevance - (1 - mmr_lambda) * np.maximum(redundancy, 0.0)
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+        available[best] = False
+
+        cost = estimate_tokens(format_line(candidates[best]))
+        if used_tokens + cost > token_budget:
+            # A shorter line further down may still fit.
+            continue
+        selected.append(candidates[best])
+        used_tokens += cost
+        redundancy = np.maximum(redundancy, matrix @ matrix[best])
+    return selected
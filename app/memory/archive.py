@@ -0,0 +1,229 @@
+"""Hot/cold tiering for short-lived feed chunks.
+
+Each source has a retention period (RETENTION_POLICY_PATH, a JSON object of
+source name or glob pattern -> days, with "*" as the fallback; default
+RETENTION_DEFAULT_DAYS). Chunks older than that move out of the hot
+`embeddings` table into compressed segment files under `data/cold/<source>/`.
+Each segment is an .npz holding float16 vectors plus zlib-compressed
+metadata, registered in the `cold_segments` table. wordpress and tiktok are
+never archived. After a move the hot file is compacted with VACUUM, so
+`search_memory` only ever scans recent chunks; `search_archive` scans the
+segments on demand.
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..metrics import count, stage
+from .storage import DATA_DIR, EMBEDDINGS_TABLE, _active_model, decode_embedding, embedding_db
+from .vectors import cosine_scores
+
+COLD_DIR = DATA_DIR / "cold"
+PERMANENT_SOURCES = frozenset({"wordpress", "tiktok"})
+DEFAULT_RETENTION_DAYS = float(os.environ.get("RETENTION_DEFAULT_DAYS", "90"))
+# Rows per segment file; bounds memory while archiving and loading.
+SEGMENT_ROWS = int(os.environ.get("COLD_SEGMENT_ROWS", "20000"))
+
+_COLUMNS = ("external_id", "chunk_id", "text_excerpt", "token_count", "similarity_hint", "ingested_at")
+
+
+def load_retention_policy(path: Optional[str] = None) -> Dict[str, float]:
+    """Source name/pattern -> retention days. Permanent sources are dropped from it."""
+    path = path or os.environ.get("RETENTION_POLICY_PATH")
+    policy: Dict[str, float] = {"*": DEFAULT_RETENTION_DAYS}
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            policy.update({str(k): float(v) for k, v in json.load(f).items()})
+    return {k: v for k, v in policy.items() if k not in PERMANENT_SOURCES}
+
+
+def retention_days(source: str, policy: Dict[str, float]) -> Optional[float]:
+    """Days `source` stays hot; None means forever. Exact names beat patterns, longer patterns beat shorter."""
+    if source in PERMANENT_SOURCES:
+        return None
+    if source in policy:
+        return policy[source]
+    matches = [pattern for pattern in policy if fnmatch.fnmatchcase(source, pattern)]
+    if not matches:
+        return None
+    return policy[max(matches, key=len)]
+
+
+def _ensure_table(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS cold_segments (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            source TEXT NOT NULL,
+            path TEXT NOT NULL,
+            rows INTEGER NOT NULL,
+            model TEXT,
+            dimensions INTEGER,
+            oldest REAL,
+            newest REAL,
+            created_at REAL NOT NULL
+        )
+        """
+    )
+
+
+def _write_segment(path: Path, vectors: np.ndarray, meta: Dict[str, list]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(".tmp.npz")
+    packed = zlib.compress(json.dumps(meta, ensure_ascii=False).encode("utf-8"), 6)
+    np.savez_compressed(tmp_path, vectors=vectors.astype(np.float16), meta=np.frombuffer(packed, dtype=np.uint8))
+    tmp_path.replace(path)
+
+
+def _read_segment(path: Path) -> tuple[np.ndarray, Dict[str, list]]:
+    with np.load(path) as data:
+        vectors = data["vectors"].astype(np.float32)
+        meta = json.loads(zlib.decompress(data["meta"].tobytes()).decode("utf-8"))
+    return vectors, meta
+
+
+def archive_source(conn, source: str, cutoff: float) -> int:
+    """Move `source` chunks ingested before `cutoff` into cold segments; returns rows moved.
+
+    Registering a segment, writing its file and deleting the hot rows happen
+    in one transaction, so a crash leaves the rows hot (and at worst an
+    unregistered file that the next run overwrites).
+    """
+    _ensure_table(conn)
+    moved = 0
+    while True:
+        rows = conn.execute(
+            f"""
+            SELECT rowid, embedding, model, {', '.join(_COLUMNS)} FROM {EMBEDDINGS_TABLE}
+            WHERE source = ? AND ingested_at < ? ORDER BY model, ingested_at LIMIT ?
+            """,
+            (source, cutoff, SEGMENT_ROWS),
+        ).fetchall()
+        # A segment holds one model's vectors; split at the first model change.
+        rows = [row for row in rows if row[2] == rows[0][2]] if rows else rows
+        if not rows:
+            return moved
+        vectors = [decode_embedding(row[1]) for row in rows]
+        dims = max(len(v) for v in vectors)
+        matrix = np.zeros((len(rows), dims), dtype=np.float32)
+        for idx, vector in enumerate(vectors):
+            if len(vector) == dims:
+                matrix[idx] = vector
+        meta = {name: [row[3 + i] for row in rows] for i, name in enumerate(_COLUMNS)}
+        oldest, newest = min(meta["ingested_at"]), max(meta["ingested_at"])
+        cur = conn.execute(
+            """
+            INSERT INTO cold_segments (source, path, rows, model, dimensions, oldest, newest, created_at)
+            VALUES (?, '', ?, ?, ?, ?, ?, ?)
+            """,
+            (source, len(rows), rows[0][2], dims, oldest, newest, time.time()),
+        )
+        path = COLD_DIR / source / f"{cur.lastrowid:08d}.npz"
+        _write_segment(path, matrix, meta)
+        conn.execute("UPDATE cold_segments SET path = ? WHERE id = ?", (str(path.relative_to(DATA_DIR)), cur.lastrowid))
+        conn.executemany(f"DELETE FROM {EMBEDDINGS_TABLE} WHERE rowid = ?", [(row[0],) for row in rows])
+        conn.executemany(
+            "INSERT OR REPLACE INTO archived_content (source, external_id, segment_id) VALUES (?, ?, ?)",
+            [(source, external_id, cur.lastrowid) for external_id in set(meta["external_id"])],
+        )
+        conn.commit()
+        moved += len(rows)
+
+
+def apply_retention(policy: Optional[Dict[str, float]] = None, now: Optional[float] = None, vacuum: bool = True) -> Dict[str, int]:
+    """Archive every source past its retention; returns rows moved per source.
+
+    Standing queries are marked for a full recompute when anything moved, so
+    archived chunks drop out of their stored top-k on the next run.
+    """
+    policy = load_retention_policy() if policy is None else policy
+    now = time.time() if now is None else now
+    moved: Dict[str, int] = {}
+    with stage("archive"), embedding_db() as conn:
+        sources = [row[0] for row in conn.execute(f"SELECT DISTINCT source FROM {EMBEDDINGS_TABLE}")]
+        for source in sources:
+            days = retention_days(source, policy)
+            if days is None:
+                continue
+            rows = archive_source(conn, source, now - days * 86400)
+            if rows:
+                moved[source] = rows
+        if moved and conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'standing_queries'").fetchone():
+            conn.execute("UPDATE standing_queries SET refreshed_at = 0")
+    count("archive", rows=sum(moved.values()), sources=len(moved))
+    if moved and vacuum:
+        compact()
+    return moved
+
+
+def compact() -> None:
+    """VACUUM the hot store so the archived rows' pages are returned to the filesystem."""
+    with stage("archive.vacuum"), embedding_db() as conn:
+        conn.isolation_level = None
+        conn.execute("VACUUM")
+
+
+def list_segments(sources: Optional[Sequence[str]] = None) -> List[dict]:
+    with embedding_db() as conn:
+        _ensure_table(conn)
+        rows = conn.execute(
+            "SELECT id, source, path, rows, model, dimensions, oldest, newest, created_at FROM cold_segments ORDER BY id"
+        ).fetchall()
+    keys = ("id", "source", "path", "rows", "model", "dimensions", "oldest", "newest", "created_at")
+    segments = [dict(zip(keys, row)) for row in rows]
+    if sources:
+        segments = [seg for seg in segments if seg["source"] in set(sources)]
+    return segments
+
+
+def search_archive(
+    query_embedding: Sequence[float],
+    sources: Optional[Sequence[str]] = None,
+    top_k: int = 10,
+    since: Optional[float] = None,
+) -> List[dict]:
+    """Top matches from the cold segments, one segment in memory at a time.
+
+    Segments built with a model other than the active one are skipped (a
+    re-index converts them before it switches over), and `since` (epoch
+    seconds) skips segments whose newest chunk is older.
+    """
+    with embedding_db() as conn:
+        model, _ = _active_model(conn)
+    results: List[dict] = []
+    scanned = 0
+    with stage("search.archive"):
+        for seg in list_segments(sources):
+            if seg["model"] != model or seg["dimensions"] != len(query_embedding):
+                continue
+            if since is not None and seg["newest"] is not None and seg["newest"] < since:
+                continue
+            vectors, meta = _read_segment(DATA_DIR / seg["path"])
+            scanned += len(vectors)
+            scores = cosine_scores(vectors, query_embedding)
+            top = np.argsort(-scores, kind="stable")[:top_k]
+            for idx in top:
+                results.append(
+                    {
+                        "source": seg["source"],
+                        "external_id": meta["external_id"][idx],
+                        "chunk_id": meta["chunk_id"][idx],
+                        "score": float(scores[idx]),
+                        "text_excerpt": meta["text_excerpt"][idx],
+                        "similarity_hint": meta["similarity_hint"][idx],
+                        "token_count": meta["token_count"][idx],
+                        "archived": True,
+                    }
+                )
+            results = sorted(results, key=lambda item: item["score"], reverse=True)[:top_k]
+    count("search.archive", chunks=scanned)
+    return results
@@ -0,0 +1,91 @@
+"""Process-pool record building for large backfills.
+
+HTML extraction, summarizing, chunking and chunk-id hashing are pure CPU
+work per item, so a backfill fans them out over worker processes. `build`
+turns one raw item (a `wp/v2/posts` dict, a mirrored transcript) into a
+ContentRecord or None; it must be a module-level function so it pickles.
+Results come back in input order and are consumed lazily, so the embedding
+stage starts on the first batch while workers are still chunking the rest.
+Items are submitted in a sliding window of `workers * BACKFILL_INFLIGHT`
+tasks, so a slow consumer holds back the reading of `items` instead of the
+whole backfill queueing up in memory.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from .ingest import chunk_records
+from .models import ContentRecord, EmbeddingRecord
+
+BACKFILL_WORKERS = int(os.environ.get("BACKFILL_WORKERS", str(os.cpu_count() or 1)))
+# Items per task sent to a worker; larger amortizes pickling, smaller streams sooner.
+BACKFILL_CHUNKSIZE = int(os.environ.get("BACKFILL_CHUNKSIZE", "16"))
+# Tasks in flight per worker: enough to keep workers busy while results are consumed.
+BACKFILL_INFLIGHT = int(os.environ.get("BACKFILL_INFLIGHT", "4"))
+
+Prepared = Tuple[ContentRecord, List[EmbeddingRecord]]
+
+
+def prepare_item(build: Callable[[dict], Optional[ContentRecord]], item: dict) -> Optional[Prepared]:
+    """Build one record and its chunks; runs inside a worker process."""
+    record = build(item)
+    if record is None:
+        return None
+    return record, chunk_records(record)
+
+
+def prepare_chunk(build: Callable[[dict], Optional[ContentRecord]], items: List[dict]) -> List[Prepared]:
+    """`prepare_item` over one task's items, dropping rejected ones."""
+    return [result for result in map(partial(prepare_item, build), items) if result is not None]
+
+
+def prepare_records(
+    items: Iterable[dict],
+    build: Callable[[dict], Optional[ContentRecord]],
+    workers: int = BACKFILL_WORKERS,
+    chunksize: int = BACKFILL_CHUNKSIZE,
+) -> Iterator[Prepared]:
+    """Yield (record, chunks) for every item `build` accepts, in input order.
+
+    `workers <= 1` runs inline without a pool (same output, easier to debug
+    and profile).
+    """
+    task = partial(prepare_item, build)
+    if workers <= 1:
+        results: Iterable[Optional[Prepared]] = map(task, items)
+        for result in results:
+            if result is not None:
+                yield result
+        return
+
+    it = iter(items)
+    chunksize = max(1, chunksize)
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while True:
+            while len(pending) < workers * max(1, BACKFILL_INFLIGHT):
+                chunk = list(islice(it, chunksize))
+                if not chunk:
+                    break
+                pending.append(pool.submit(prepare_chunk, build, chunk))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def batched(prepared: Iterable[Prepared], size: int) -> Iterator[Tuple[List[ContentRecord], List[EmbeddingRecord]]]:
+    """Group the prepared stream into (records, chunks) batches of `size` records."""
+    it = iter(prepared)
+    while True:
+        batch = list(islice(it, size))
+        if not batch:
+            return
+        records = [record for record, _ in batch]
+        chunks = [chunk for _, record_chunks in batch for chunk in record_chunks]
+        yield records, chunks
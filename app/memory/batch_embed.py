@@ -0,0 +1,306 @@
+"""Offline batch-embedding jobs for bulk backfills.
+
+Instead of calling `embeddings.create` per document, `export_batch_job`
+writes every pending chunk as a request line in the Batch API format and
+records a job under `data/batches/<job id>/`:
+
+    manifest.json      model, counts, request files, batch ids, status
+    requests-NNN.jsonl {"custom_id", "method", "url", "body"} per chunk
+    chunks.jsonl       chunk metadata by custom_id (excerpt, hint, ...)
+    imported.txt       custom_ids already upserted, one per line
+
+`import_batch_results` streams a results file and upserts vectors by
+custom_id. Ids in imported.txt are skipped, so re-running an import (or
+resuming one that died halfway) only writes what is missing.
+`write_fake_results` produces a results file locally for offline runs.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from ..metrics import count, stage
+from .ingest import build_embedding_records, record_to_json
+from .models import ContentRecord, EmbeddingRecord
+from .storage import active_embedding_model, append_jsonl, upsert_embeddings
+
+BATCH_DIR = Path("data") / "batches"
+# Batch API limit per input file.
+BATCH_MAX_REQUESTS = int(os.environ.get("BATCH_MAX_REQUESTS", "50000"))
+BATCH_IMPORT_ROWS = int(os.environ.get("BATCH_IMPORT_ROWS", "1000"))
+EMBEDDINGS_URL = "/v1/embeddings"
+
+
+def custom_id(rec: EmbeddingRecord) -> str:
+    return f"{rec.source}:{rec.external_id}:{rec.chunk_id}"
+
+
+def load_manifest(job_dir: Path) -> dict:
+    with (job_dir / "manifest.json").open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(job_dir: Path, manifest: dict) -> None:
+    tmp_path = job_dir / "manifest.json.tmp"
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(job_dir / "manifest.json")
+
+
+def _read_jsonl(path: Path) -> Iterator[dict]:
+    with path.open("r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def list_jobs() -> List[Path]:
+    if not BATCH_DIR.exists():
+        return []
+    return sorted(p for p in BATCH_DIR.iterdir() if (p / "manifest.json").exists())
+
+
+def pending_content_keys() -> set[tuple[str, str]]:
+    """(source, external_id) pairs exported in jobs that are not fully imported yet."""
+    keys = set()
+    for job_dir in list_jobs():
+        if load_manifest(job_dir).get("status") == "imported":
+            continue
+        for row in _read_jsonl(job_dir / "chunks.jsonl"):
+            keys.add((row["source"], row["external_id"]))
+    return keys
+
+
+def export_batch_job(
+    records: Sequence[ContentRecord],
+    embedding_records: Optional[List[EmbeddingRecord]] = None,
+) -> Optional[Path]:
+    """Write a batch job for `records`; returns its directory (None if nothing to do).
+
+    Requests use the active embedding model. Content records are appended to
+    content_records.jsonl now, like store_content does; vectors arrive with
+    the import.
+    """
+    records = list(records)
+    if not records:
+        return None
+    model, dimensions = active_embedding_model()
+    body = {"model": model, **({"dimensions": dimensions} if dimensions else {})}
+    chunks = embedding_records if embedding_records is not None else build_embedding_records(records)
+    job_id = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ") + f"_{len(chunks)}"
+    job_dir = BATCH_DIR / job_id
+    job_dir.mkdir(parents=True, exist_ok=False)
+
+    request_files: List[str] = []
+    with stage("batch.export", chunks=len(chunks)), (job_dir / "chunks.jsonl").open("w", encoding="utf-8") as meta:
+        for offset in range(0, len(chunks), BATCH_MAX_REQUESTS):
+            name = f"requests-{len(request_files):03d}.jsonl"
+            with (job_dir / name).open("w", encoding="utf-8") as out:
+                for rec in chunks[offset : offset + BATCH_MAX_REQUESTS]:
+                    cid = custom_id(rec)
+                    out.write(json.dumps({
+                        "custom_id": cid,
+                        "method": "POST",
+                        "url": EMBEDDINGS_URL,
+                        "body": {**body, "input": rec.text_excerpt},
+                    }, ensure_ascii=False) + "\n")
+                    meta.write(json.dumps({
+                        "custom_id": cid,
+                        "source": rec.source,
+                        "external_id": rec.external_id,
+                        "chunk_id": rec.chunk_id,
+                        "text_excerpt": rec.text_excerpt,
+                        "token_count": rec.token_count,
+                        "similarity_hint": rec.similarity_hint,
+                    }, ensure_ascii=False) + "\n")
+            request_files.append(name)
+        append_jsonl(record_to_json(rec) for rec in records)
+
+    _save_manifest(job_dir, {
+        "job_id": job_id,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "model": model,
+        "dimensions": dimensions,
+        "documents": len(records),
+        "requests": len(chunks),
+        "request_files": request_files,
+        "batches": {},
+        "imported": 0,
+        "remaining": len(chunks),
+        "status": "exported",
+    })
+    return job_dir
+
+
+def submit_batch_job(job_dir: Path) -> dict:
+    """Upload each request file and create a batch for it; skips files already submitted."""
+    from openai import OpenAI
+
+    client = OpenAI()
+    manifest = load_manifest(job_dir)
+    for name in manifest["request_files"]:
+        if name in manifest["batches"]:
+            continue
+        with (job_dir / name).open("rb") as f:
+            uploaded = client.files.create(file=f, purpose="batch")
+        batch = client.batches.create(input_file_id=uploaded.id, endpoint=EMBEDDINGS_URL, completion_window="24h")
+        manifest["batches"][name] = {"batch_id": batch.id, "status": batch.status, "output_file": None}
+        manifest["status"] = "submitted"
+        _save_manifest(job_dir, manifest)
+    return manifest
+
+
+def download_batch_results(job_dir: Path) -> List[Path]:
+    """Refresh batch statuses and download finished outputs; returns the result files on disk."""
+    from openai import OpenAI
+
+    client = OpenAI()
+    manifest = load_manifest(job_dir)
+    for name, info in manifest["batches"].items():
+        if info.get("output_file"):
+            continue
+        batch = client.batches.retrieve(info["batch_id"])
+        info["status"] = batch.status
+        if batch.status == "completed" and batch.output_file_id:
+            out_name = name.replace("requests-", "results-")
+            (job_dir / out_name).write_bytes(client.files.content(batch.output_file_id).read())
+            info["output_file"] = out_name
+    _save_manifest(job_dir, manifest)
+    return [job_dir / info["output_file"] for info in manifest["batches"].values() if info.get("output_file")]
+
+
+def _imported_ids(job_dir: Path) -> set[str]:
+    path = job_dir / "imported.txt"
+    if not path.exists():
+        return set()
+    return {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+
+def import_batch_results(job_dir: Path, results_path: Path, batch_rows: int = BATCH_IMPORT_ROWS) -> dict:
+    """Upsert the vectors in `results_path` by custom_id; safe to re-run or resume.
+
+    Each block of `batch_rows` vectors is committed before its ids are logged
+    to imported.txt, so a crash at worst re-upserts one block. Returns counts
+    for this call.
+    """
+    manifest = load_manifest(job_dir)
+    meta: Dict[str, dict] = {row["custom_id"]: row for row in _read_jsonl(job_dir / "chunks.jsonl")}
+    done = _imported_ids(job_dir)
+    stats = {"imported": 0, "skipped": 0, "failed": 0, "unknown": 0}
+    pending: List[EmbeddingRecord] = []
+
+    def flush() -> None:
+        if not pending:
+            return
+        upsert_embeddings(pending, model=manifest["model"])
+        with (job_dir / "imported.txt").open("a", encoding="utf-8") as log:
+            log.writelines(custom_id(rec) + "\n" for rec in pending)
+        done.update(custom_id(rec) for rec in pending)
+        stats["imported"] += len(pending)
+        pending.clear()
+
+    with stage("batch.import"):
+        for line in _read_jsonl(results_path):
+            cid = line.get("custom_id")
+            row = meta.get(cid)
+            if row is None:
+                stats["unknown"] += 1
+                continue
+            if cid in done:
+                stats["skipped"] += 1
+                continue
+            response = line.get("response") or {}
+            data = (response.get("body") or {}).get("data") or []
+            if line.get("error") or response.get("status_code") != 200 or not data:
+                stats["failed"] += 1
+                continue
+            pending.append(
+                EmbeddingRecord(
+                    source=row["source"],
+                    external_id=row["external_id"],
+                    chunk_id=row["chunk_id"],
+                    embedding=data[0]["embedding"],
+                    text_excerpt=row["text_excerpt"],
+                    token_count=row["token_count"],
+                    similarity_hint=row["similarity_hint"],
+                )
+            )
+            if len(pending) >= batch_rows:
+                flush()
+        flush()
+    count("batch.import", **stats)
+
+    manifest = load_manifest(job_dir)
+    manifest["imported"] = len(done)
+    manifest["remaining"] = manifest["requests"] - len(done)
+    manifest["status"] = "imported" if len(done) >= manifest["requests"] else "partial"
+    manifest["imported_at"] = datetime.now(timezone.utc).isoformat()
+    _save_manifest(job_dir, manifest)
+    return stats
+
+
+def failed_requests(job_dir: Path, out_path: Path) -> int:
+    """Write the request lines not imported yet to `out_path` for resubmission."""
+    done = _imported_ids(job_dir)
+    manifest = load_manifest(job_dir)
+    written = 0
+    with out_path.open("w", encoding="utf-8") as out:
+        for name in manifest["request_files"]:
+            for request in _read_jsonl(job_dir / name):
+                if request["custom_id"] not in done:
+                    out.write(json.dumps(request, ensure_ascii=False) + "\n")
+                    written += 1
+    return written
+
+
+def fake_embedding(text: str, dim: int) -> List[float]:
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def write_fake_results(job_dir: Path, out_path: Path, dim: int = 3072, fail_rate: float = 0.0, seed: int = 7) -> int:
+    """Answer every request in the job with deterministic vectors, in Batch API output format.
+
+    `fail_rate` marks that fraction of lines as errors, to exercise partial
+    imports. Returns the number of lines written.
+    """
+    rng = np.random.default_rng(seed)
+    manifest = load_manifest(job_dir)
+    written = 0
+    with out_path.open("w", encoding="utf-8") as out:
+        for name in manifest["request_files"]:
+            for request in _read_jsonl(job_dir / name):
+                text = request["body"]["input"]
+                if rng.random() < fail_rate:
+                    line = {
+                        "id": f"batch_req_{written}",
+                        "custom_id": request["custom_id"],
+                        "response": {"status_code": 500, "body": {"error": {"message": "fake failure"}}},
+                        "error": None,
+                    }
+                else:
+                    line = {
+                        "id": f"batch_req_{written}",
+                        "custom_id": request["custom_id"],
+                        "response": {
+                            "status_code": 200,
+                            "request_id": f"req_{written}",
+                            "body": {
+                                "object": "list",
+                                "data": [{"object": "embedding", "index": 0, "embedding": fake_embedding(text, dim)}],
+                                "model": request["body"]["model"],
+                                "usage": {"prompt_tokens": len(text.split()), "total_tokens": len(text.split())},
+                            },
+                        },
+                        "error": None,
+                    }
+                out.write(json.dumps(line) + "\n")
+                written += 1
+    return written
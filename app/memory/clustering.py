@@ -0,0 +1,99 @@
+"""Group new documents into stories by embedding similarity.
+
+A breaking story shows up as a dozen near-identical headlines across the
+wsj/cnbc/ft feeds and NYT. Candidate pairs are found block by block, keeping
+only document pairs at least STORY_CLUSTER_THRESHOLD similar, so memory is
+linear in the documents plus those pairs. The pairs are then taken most
+similar first and their clusters merged (union-find) when the two clusters'
+centroids are still at least that similar; each cluster is represented by
+the member closest to its centroid.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .vectors import DocKey, normalize_rows
+
+CLUSTER_THRESHOLD = float(os.environ.get("STORY_CLUSTER_THRESHOLD", "0.8"))
+# Rows scored per block in the neighbor search.
+BLOCK_ROWS = 1024
+
+
+@dataclass(frozen=True)
+class StoryCluster:
+    representative: DocKey
+    members: Tuple[DocKey, ...]
+
+    @property
+    def sources(self) -> Tuple[str, ...]:
+        """Distinct sources covering the story, representative's first."""
+        return tuple(dict.fromkeys(source for source, _ in (self.representative,) + self.members))
+
+
+def cluster_documents(vectors: Dict[DocKey, np.ndarray], threshold: float = CLUSTER_THRESHOLD) -> List[StoryCluster]:
+    """Cluster unit document vectors; clusters come back largest first, then in input order."""
+    keys = list(vectors)
+    if not keys:
+        return []
+    points = normalize_rows(np.stack([vectors[key] for key in keys]).astype(np.float32))
+    n = len(keys)
+
+    pairs: List[Tuple[float, int, int]] = []
+    for start in range(0, n, BLOCK_ROWS):
+        # Only columns after each row, so every pair is scored once.
+        sims = points[start : start + BLOCK_ROWS] @ points[start:].T
+        rows, cols = np.nonzero(np.triu(sims >= threshold, k=1))
+        pairs.extend(zip((-sims[rows, cols]).tolist(), (rows + start).tolist(), (cols + start).tolist()))
+    heapq.heapify(pairs)
+
+    parent = list(range(n))
+    sums = points.astype(np.float64)
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    while pairs:
+        _, i, j = heapq.heappop(pairs)
+        root_i, root_j = find(i), find(j)
+        if root_i == root_j:
+            continue
+        # Centroid linkage: the pair is close, but the stories it would join must be too.
+        a, b = sums[root_i], sums[root_j]
+        if a @ b < threshold * np.linalg.norm(a) * np.linalg.norm(b):
+            continue
+        if root_j < root_i:
+            root_i, root_j = root_j, root_i
+        parent[root_j] = root_i
+        sums[root_i] += sums[root_j]
+
+    groups: Dict[int, List[int]] = {}
+    for idx in range(n):
+        groups.setdefault(find(idx), []).append(idx)
+
+    clusters: List[Tuple[int, int, StoryCluster]] = []
+    for root, group in groups.items():
+        closeness = points[group] @ sums[root].astype(np.float32)
+        rep = group[int(np.argmax(closeness))]
+        cluster = StoryCluster(representative=keys[rep], members=tuple(keys[m] for m in group if m != rep))
+        clusters.append((-len(group), group[0], cluster))
+    clusters.sort(key=lambda entry: entry[:2])
+    return [cluster for _, _, cluster in clusters]
+
+
+def story_index(clusters: List[StoryCluster]) -> Dict[DocKey, StoryCluster]:
+    """Map every clustered document to its story."""
+    index: Dict[DocKey, StoryCluster] = {}
+    for cluster in clusters:
+        index[cluster.representative] = cluster
+        for key in cluster.members:
+            index[key] = cluster
+    return index
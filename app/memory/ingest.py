@@ -4,13 +4,14 @@ from __future__ import annotations
 
 import hashlib
 from collections import defaultdict
-from typing import Iterable, List, Sequence
+from datetime import datetime
+from typing import Iterable, List, Optional, Sequence, Tuple
 from openai import OpenAI
 
+from ..metrics import count, stage
 from .models import ContentRecord, EmbeddingRecord
-from .storage import append_jsonl, upsert_embeddings
+from .storage import active_embedding_model, append_jsonl, upsert_embeddings
 
-EMBED_MODEL = "text-embedding-3-large"
 MAX_WORDS = 450
 CHUNK_OVERLAP = 80
 
@@ -30,6 +31,21 @@ def record_to_json(record: ContentRecord) -> dict:
     return payload
 
 
+def record_from_json(payload: dict) -> ContentRecord:
+    published_at = payload.get("published_at")
+    return ContentRecord(
+        source=payload["source"],
+        external_id=payload["external_id"],
+        title=payload["title"],
+        url=payload.get("url"),
+        published_at=datetime.fromisoformat(published_at) if published_at else None,
+        summary=payload["summary"],
+        text=payload["text"],
+        media_type=payload["media_type"],
+        extra=payload.get("extra") or {},
+    )
+
+
 def chunk_text(text: str) -> List[str]:
     words = text.split()
     if not words:
@@ -50,29 +66,47 @@ def chunk_text(text: str) -> List[str]:
     return chunks
 
 
-def build_embedding_records(records: Sequence[ContentRecord]) -> List[EmbeddingRecord]:
+def chunk_records(record: ContentRecord) -> List[EmbeddingRecord]:
+    """Split one record into unembedded chunk records with stable chunk ids."""
     embedding_records: List[EmbeddingRecord] = []
+    chunks = chunk_text(record.text) or [record.summary]
+    for idx, chunk in enumerate(chunks):
+        chunk_id = hashlib.sha1(f"{record.external_id}:{idx}".encode("utf-8")).hexdigest()[:12]
+        embedding_records.append(
+            EmbeddingRecord(
+                source=record.source,
+                external_id=record.external_id,
+                chunk_id=chunk_id,
+                embedding=[],
+                text_excerpt=chunk,
+                token_count=len(chunk.split()),
+                similarity_hint=record.summary,
+            )
+        )
+    return embedding_records
+
 
+def build_embedding_records(records: Sequence[ContentRecord]) -> List[EmbeddingRecord]:
+    embedding_records: List[EmbeddingRecord] = []
     for record in records:
-        chunks = chunk_text(record.text) or [record.summary]
-        for idx, chunk in enumerate(chunks):
-            chunk_id = hashlib.sha1(f"{record.external_id}:{idx}".encode("utf-8")).hexdigest()[:12]
-            embedding_records.append(
-                EmbeddingRecord(
-                    source=record.source,
-                    external_id=record.external_id,
-                    chunk_id=chunk_id,
-                    embedding=[],
-                    text_excerpt=chunk,
-                    token_count=len(chunk.split()),
-                    similarity_hint=record.summary,
-                )
-            )
+        embedding_records.extend(chunk_records(record))
     return embedding_records
 
 
-def fetch_embeddings(records: List[EmbeddingRecord]) -> None:
+def embed_texts(
+    client: OpenAI, texts: Sequence[str], model: str, dimensions: Optional[int] = None
+) -> Tuple[List[List[float]], int]:
+    """Embed `texts` in one call; returns (vectors in order, total tokens)."""
+    kwargs = {"dimensions": dimensions} if dimensions else {}
+    response = client.embeddings.create(model=model, input=list(texts), **kwargs)
+    usage = getattr(response, "usage", None)
+    return [item.embedding for item in response.data], getattr(usage, "total_tokens", 0)
+
+
+def fetch_embeddings(records: List[EmbeddingRecord]) -> str:
+    """Fill `.embedding` on every record with the active model; returns the model used."""
     client = OpenAI()
+    model, dimensions = active_embedding_model()
     # Group chunks by source to avoid huge single calls
     batches = defaultdict(list)
     for rec in records:
@@ -80,16 +114,30 @@ def fetch_embeddings(records: List[EmbeddingRecord]) -> None:
 
     for key, recs in batches.items():
         texts = [rec.text_excerpt for rec in recs]
-        response = client.embeddings.create(model=EMBED_MODEL, input=texts)
-        for rec, embedding in zip(recs, response.data):
-            rec.embedding = embedding.embedding
-
-
-def store_content(records: Iterable[ContentRecord]) -> None:
+        with stage("embed"):
+            vectors, tokens = embed_texts(client, texts, model, dimensions)
+        count("embed", api_calls=1, chunks=len(texts), tokens=tokens)
+        for rec, embedding in zip(recs, vectors):
+            rec.embedding = embedding
+    return model
+
+
+def store_content(
+    records: Iterable[ContentRecord],
+    embedding_records: Optional[List[EmbeddingRecord]] = None,
+) -> List[EmbeddingRecord]:
+    """Persist records and their chunk embeddings; returns the embedded chunks for reuse.
+
+    Pass `embedding_records` when the chunks were already built (e.g. by the
+    backfill pool) to skip chunking here.
+    """
     records = list(records)
     if not records:
-        return
-    append_jsonl(record_to_json(rec) for rec in records)
-    embedding_records = build_embedding_records(records)
-    fetch_embeddings(embedding_records)
-    upsert_embeddings(embedding_records)
\ No newline at end of file
+        return []
+    with stage("store_content", items=len(records)):
+        append_jsonl(record_to_json(rec) for rec in records)
+        if embedding_records is None:
+            embedding_records = build_embedding_records(records)
+        model = fetch_embeddings(embedding_records)
+        upsert_embeddings(embedding_records, model=model)
+    return embedding_records
\ No newline at end of file
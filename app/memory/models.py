@@ -2,9 +2,12 @@
 
 from __future__ import annotations
 
+from array import array
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Sequence, Union
+
+import numpy as np
 
 
 @dataclass(frozen=True)
@@ -22,14 +25,132 @@ class ContentRecord:
     extra: dict = field(default_factory=dict)
 
 
-@dataclass
 class EmbeddingRecord:
-    """Embedding metadata persisted to the local index."""
-
-    source: str
-    external_id: str
-    chunk_id: str
-    text_excerpt: str
-    token_count: int
-    embedding: list[float] = field(default_factory=list)
-    similarity_hint: Optional[str] = None
\ No newline at end of file
+    """Embedding metadata persisted to the local index.
+
+    Slotted, with the vector held as float32: an `array('f')` when built from a
+    list, or a row view into a shared NumPy block (see `EmbeddingBatch`).
+    Assigning a list to `.embedding` converts it.
+    """
+
+    __slots__ = ("source", "external_id", "chunk_id", "text_excerpt", "token_count", "similarity_hint", "_embedding")
+
+    def __init__(
+        self,
+        source: str,
+        external_id: str,
+        chunk_id: str,
+        text_excerpt: str,
+        token_count: int,
+        embedding: Optional[Sequence[float]] = None,
+        similarity_hint: Optional[str] = None,
+    ) -> None:
+        self.source = source
+        self.external_id = external_id
+        self.chunk_id = chunk_id
+        self.text_excerpt = text_excerpt
+        self.token_count = token_count
+        self.similarity_hint = similarity_hint
+        self.embedding = embedding if embedding is not None else array("f")
+
+    @property
+    def embedding(self) -> Union[array, np.ndarray]:
+        return self._embedding
+
+    @embedding.setter
+    def embedding(self, values: Sequence[float]) -> None:
+        if isinstance(values, np.ndarray) and values.dtype == np.float32 and values.ndim == 1:
+            self._embedding = values
+        elif isinstance(values, array) and values.typecode == "f":
+            self._embedding = values
+        else:
+            self._embedding = array("f", values)
+
+    def vector(self) -> np.ndarray:
+        """The embedding as a float32 NumPy vector (no copy)."""
+        if isinstance(self._embedding, np.ndarray):
+            return self._embedding
+        return np.frombuffer(self._embedding, dtype=np.float32)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EmbeddingRecord):
+            return NotImplemented
+        return (
+            self.source == other.source
+            and self.external_id == other.external_id
+            and self.chunk_id == other.chunk_id
+            and self.text_excerpt == other.text_excerpt
+            and self.token_count == other.token_count
+            and self.similarity_hint == other.similarity_hint
+            and np.array_equal(self.vector(), other.vector())
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"EmbeddingRecord(source={self.source!r}, external_id={self.external_id!r}, "
+            f"chunk_id={self.chunk_id!r}, dims={len(self._embedding)})"
+        )
+
+
+@dataclass
+class EmbeddingBatch:
+    """Columnar block of chunks: metadata lists plus one (n, dims) float32 matrix.
+
+    Loading and searching a batch avoids a Python object per chunk; `records()`
+    hands out EmbeddingRecords whose vectors are views into `matrix`.
+    """
+
+    sources: List[str] = field(default_factory=list)
+    external_ids: List[str] = field(default_factory=list)
+    chunk_ids: List[str] = field(default_factory=list)
+    text_excerpts: List[str] = field(default_factory=list)
+    token_counts: List[int] = field(default_factory=list)
+    similarity_hints: List[Optional[str]] = field(default_factory=list)
+    matrix: np.ndarray = field(default_factory=lambda: np.zeros((0, 0), dtype=np.float32))
+
+    def __len__(self) -> int:
+        return len(self.chunk_ids)
+
+    def record(self, idx: int) -> EmbeddingRecord:
+        return EmbeddingRecord(
+            source=self.sources[idx],
+            external_id=self.external_ids[idx],
+            chunk_id=self.chunk_ids[idx],
+            text_excerpt=self.text_excerpts[idx],
+            token_count=self.token_counts[idx],
+            embedding=self.matrix[idx],
+            similarity_hint=self.similarity_hints[idx],
+        )
+
+    def records(self) -> List[EmbeddingRecord]:
+        return [self.record(idx) for idx in range(len(self))]
+
+    def select(self, sources: Sequence[str]) -> "EmbeddingBatch":
+        allowed = set(sources)
+        rows = [idx for idx, source in enumerate(self.sources) if source in allowed]
+        return EmbeddingBatch(
+            sources=[self.sources[i] for i in rows],
+            external_ids=[self.external_ids[i] for i in rows],
+            chunk_ids=[self.chunk_ids[i] for i in rows],
+            text_excerpts=[self.text_excerpts[i] for i in rows],
+            token_counts=[self.token_counts[i] for i in rows],
+            similarity_hints=[self.similarity_hints[i] for i in rows],
+            matrix=self.matrix[rows],
+        )
+
+    @classmethod
+    def from_records(cls, records: Sequence[EmbeddingRecord]) -> "EmbeddingBatch":
+        dims = max((len(rec.embedding) for rec in records), default=0)
+        matrix = np.zeros((len(records), dims), dtype=np.float32)
+        for idx, rec in enumerate(records):
+            if len(rec.embedding) == dims:
+                matrix[idx] = rec.vector()
+        return cls(
+            sources=[rec.source for rec in records],
+            external_ids=[rec.external_id for rec in records],
+            chunk_ids=[rec.chunk_id for rec in records],
+            text_excerpts=[rec.text_excerpt for rec in records],
+            token_counts=[rec.token_count for rec in records],
+            similarity_hints=[rec.similarity_hint for rec in records],
+            matrix=matrix,
+        )
@@ -2,92 +2,188 @@
 
 from __future__ import annotations
 
-import json
-import math
-from typing import Iterable, List, Optional, Sequence, Tuple
+import os
+from typing import List, Optional, Sequence, Tuple, Union
 
+import numpy as np
 from openai import OpenAI
 
-from .models import EmbeddingRecord
-from .storage import embedding_db
+from ..metrics import stage
+from .archive import search_archive
+from .ingest import embed_texts
+from .models import EmbeddingBatch, EmbeddingRecord
+from .shards import search_shards, sync_shards
+from .storage import _active_dimensions, active_embedding_model, decode_embedding, embedding_db, embedding_dims
+from .vectors import cosine_scores
 
 
-def _load_embeddings(sources: Optional[Sequence[str]] = None) -> List[EmbeddingRecord]:
-    allowed = set(sources) if sources else None
-    records: List[EmbeddingRecord] = []
+EMBEDDING_COLUMNS = "source, external_id, chunk_id, embedding, text_excerpt, token_count, similarity_hint"
 
-    with embedding_db() as conn:
-        query = "SELECT source, external_id, chunk_id, embedding, text_excerpt, token_count, similarity_hint FROM embeddings"
-        params: Tuple = ()
-        if allowed:
-            placeholders = ",".join("?" for _ in allowed)
-            query += f" WHERE source IN ({placeholders})"
-            params = tuple(allowed)
-
-        cursor = conn.execute(query, params)
-        for row in cursor.fetchall():
-            embedding_bytes = row[3]
-            embedding = json.loads(bytes(embedding_bytes).decode("utf-8")) if embedding_bytes else []
-            records.append(
-                EmbeddingRecord(
-                    source=row[0],
-                    external_id=row[1],
-                    chunk_id=row[2],
-                    text_excerpt=row[4],
-                    token_count=row[5],
-                    embedding=embedding,
-                    similarity_hint=row[6],
-                )
-            )
-    return records
 
+FETCH_ROWS = 2048
 
-def _cosine_similarity(vec_a: Sequence[float], vec_b: Sequence[float]) -> float:
-    if not vec_a or not vec_b or len(vec_a) != len(vec_b):
-        return 0.0
-    dot = sum(a * b for a, b in zip(vec_a, vec_b))
-    norm_a = math.sqrt(sum(a * a for a in vec_a))
-    norm_b = math.sqrt(sum(b * b for b in vec_b))
-    if norm_a == 0 or norm_b == 0:
-        return 0.0
-    return dot / (norm_a * norm_b)
 
+def _memory_shards() -> bool:
+    """Search the source/month shards (see shards.py) instead of loading the whole table."""
+    # Read on use so a value loaded from .env applies.
+    return os.environ.get("MEMORY_SHARDS", "").lower() in ("1", "true", "yes")
 
-def search_memory(query: str, sources: Optional[Sequence[str]] = None, top_k: int = 10) -> List[dict]:
-    """Return top_k similar chunks for the query across selected sources."""
-    client = OpenAI()
-    query_embedding = (
-        client.embeddings.create(model="text-embedding-3-large", input=query).data[0].embedding
+
+def _row_to_record(row: Sequence) -> EmbeddingRecord:
+    """Decode a row selected with EMBEDDING_COLUMNS."""
+    return EmbeddingRecord(
+        source=row[0],
+        external_id=row[1],
+        chunk_id=row[2],
+        text_excerpt=row[4],
+        token_count=row[5],
+        embedding=decode_embedding(row[3]),
+        similarity_hint=row[6],
     )
 
-    records = _load_embeddings(sources)
-    scored: List[Tuple[float, EmbeddingRecord]] = []
 
-    for rec in records:
-        score = _cosine_similarity(query_embedding, rec.embedding)
-        scored.append((score, rec))
+def load_embedding_batch(sources: Optional[Sequence[str]] = None, since: Optional[float] = None) -> EmbeddingBatch:
+    """Load chunks into one columnar batch with a preallocated float32 matrix.
+
+    Only rows of the active model and vector length are loaded, so query
+    vectors are never scored against another model's space. `since` (epoch
+    seconds) keeps chunks ingested at or after it.
+    """
+    allowed = set(sources) if sources else None
+    clauses: List[str] = ["model = ?", "dimensions = ?"]
+    filters: Tuple = ()
+    if allowed:
+        clauses.append(f"source IN ({','.join('?' for _ in allowed)})")
+        filters += tuple(allowed)
+    if since is not None:
+        clauses.append("ingested_at >= ?")
+        filters += (since,)
+    where = f" WHERE {' AND '.join(clauses)}"
+
+    batch = EmbeddingBatch()
+    with embedding_db() as conn:
+        params = _active_dimensions(conn) + filters
+        total = conn.execute(f"SELECT COUNT(*) FROM embeddings{where}", params).fetchone()[0]
+        cursor = conn.execute(f"SELECT {EMBEDDING_COLUMNS} FROM embeddings{where}", params)
+        matrix: Optional[np.ndarray] = None
+        row_idx = 0
+        while True:
+            rows = cursor.fetchmany(FETCH_ROWS)
+            if not rows:
+                break
+            for row in rows:
+                if matrix is None:
+                    matrix = np.zeros((total, embedding_dims(row[3])), dtype=np.float32)
+                # Rows added since COUNT(*) grow the matrix rather than being dropped.
+                if row_idx >= matrix.shape[0]:
+                    matrix = np.concatenate([matrix, np.zeros_like(matrix[: max(1, row_idx // 4)])])
+                vector = decode_embedding(row[3])
+                if len(vector) == matrix.shape[1]:
+                    matrix[row_idx] = vector
+                batch.sources.append(row[0])
+                batch.external_ids.append(row[1])
+                batch.chunk_ids.append(row[2])
+                batch.text_excerpts.append(row[4])
+                batch.token_counts.append(row[5])
+                batch.similarity_hints.append(row[6])
+                row_idx += 1
+    if matrix is not None:
+        batch.matrix = matrix[:row_idx]
+    return batch
+
+
+def _load_embeddings(sources: Optional[Sequence[str]] = None) -> List[EmbeddingRecord]:
+    """Records whose vectors are views into one shared float32 block."""
+    return load_embedding_batch(sources).records()
+
+
+def embed_query(query: str) -> List[float]:
+    return embed_queries([query])[0]
 
-    scored.sort(key=lambda x: x[0], reverse=True)
+
+def embed_queries(queries: Sequence[str]) -> List[List[float]]:
+    """Embed several queries in one API call, in order."""
+    if not queries:
+        return []
+    client = OpenAI()
+    model, dimensions = active_embedding_model()
+    with stage("embed.query", api_calls=1, items=len(queries)):
+        vectors, _ = embed_texts(client, queries, model, dimensions)
+    return vectors
+
+
+def search_memory(
+    query: str,
+    sources: Optional[Sequence[str]] = None,
+    top_k: int = 10,
+    query_embedding: Optional[Sequence[float]] = None,
+    records: Optional[Union[EmbeddingBatch, Sequence[EmbeddingRecord]]] = None,
+    include_archive: bool = False,
+    since: Optional[float] = None,
+) -> List[dict]:
+    """Return top_k similar chunks for the query across selected sources.
+
+    Pass `query_embedding` to reuse a vector already computed for `query`, and
+    `records` (an EmbeddingBatch from `load_embedding_batch()` or a list of
+    records) to share one load across searches. `include_archive` also scans
+    the cold archive (see archive.py); those results carry "archived": True.
+    `since` (epoch seconds) limits the search to chunks ingested after it;
+    it does not apply to `records`. With MEMORY_SHARDS set and no `records`,
+    the hot store is searched through its shards.
+    """
+    if query_embedding is None:
+        query_embedding = embed_query(query)
 
     results: List[dict] = []
-    for score, rec in scored[:top_k]:
-        results.append(
-            {
-                "source": rec.source,
-                "external_id": rec.external_id,
-                "chunk_id": rec.chunk_id,
-                "score": score,
-                "text_excerpt": rec.text_excerpt,
-                "similarity_hint": rec.similarity_hint,
-                "token_count": rec.token_count,
-            }
-        )
+    if records is None and _memory_shards():
+        sync_shards()
+        results = search_shards(query_embedding, sources=sources, top_k=top_k, since=since)
+        batch = EmbeddingBatch()
+    elif records is None:
+        batch = load_embedding_batch(sources, since=since)
+    else:
+        batch = records if isinstance(records, EmbeddingBatch) else EmbeddingBatch.from_records(records)
+        if sources:
+            batch = batch.select(sources)
+
+    if len(batch) and batch.matrix.shape[1] == len(query_embedding):
+        with stage("search", chunks=len(batch)):
+            scores = cosine_scores(batch.matrix, query_embedding)
+            top = np.argpartition(-scores, top_k - 1)[:top_k] if top_k < len(scores) else np.arange(len(scores))
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+        for idx in top:
+            results.append(
+                {
+                    "source": batch.sources[idx],
+                    "external_id": batch.external_ids[idx],
+                    "chunk_id": batch.chunk_ids[idx],
+                    "score": float(scores[idx]),
+                    "text_excerpt": batch.text_excerpts[idx],
+                    "similarity_hint": batch.similarity_hints[idx],
+                    "token_count": batch.token_counts[idx],
+                }
+            )
+    if include_archive:
+        results = sorted(
+            results + search_archive(query_embedding, sources=sources, top_k=top_k, since=since),
+            key=lambda item: item["score"],
+            reverse=True,
+        )[:top_k]
     return results
 
 
-def search_memory_grouped(query: str, sources: Optional[Sequence[str]] = None, per_source: int = 5) -> dict:
+def search_memory_grouped(
+    query: str,
+    sources: Optional[Sequence[str]] = None,
+    per_source: int = 5,
+    query_embedding: Optional[Sequence[float]] = None,
+    records: Optional[Union[EmbeddingBatch, Sequence[EmbeddingRecord]]] = None,
+) -> dict:
     """Return top matches grouped by source for balanced surfacing in emails."""
-    all_results = search_memory(query, sources=sources, top_k=500)
+    all_results = search_memory(
+        query, sources=sources, top_k=500, query_embedding=query_embedding, records=records
+    )
     grouped: dict[str, List[dict]] = {}
     for item in all_results:
         grouped.setdefault(item["source"], []).append(item)
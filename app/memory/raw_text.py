@@ -1,14 +1,32 @@
-"""Write raw text artifacts to disk.
+"""Packed, content-addressed archive of raw texts (blog posts, transcripts).
 
-Used to keep a plain-text archive (e.g., blog posts, transcripts).
+Texts are stored once per SHA-256 as independent gzip members appended to
+shard files under `data/raw_archive/` (a new shard starts past
+RAW_SHARD_BYTES). `index.sqlite` maps (source, external_id) to a hash and
+each hash to (shard, offset, length), so a read is one seek plus one small
+decompress. Writing a text whose hash is already recorded for that id costs
+an index lookup and nothing else. `export_raw_texts` writes the loose
+`<source>/<external_id>.txt` layout back out; `import_loose_files` packs an
+existing `data/raw/` tree.
 """
 
 from __future__ import annotations
 
+import gzip
+import hashlib
+import os
 import re
+import sqlite3
+import threading
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 RAW_DIR = Path("data") / "raw"
+RAW_ARCHIVE_DIR = Path("data") / "raw_archive"
+RAW_SHARD_BYTES = int(os.environ.get("RAW_SHARD_BYTES", str(64 * 1024 * 1024)))
+
+_write_lock = threading.Lock()
 
 
 def _safe_filename(value: str) -> str:
@@ -20,17 +38,182 @@ def _safe_filename(value: str) -> str:
     return value[:180].strip("._-") or "untitled"
 
 
-def write_raw_text(source: str, external_id: str, text: str) -> Path:
-    """Write raw UTF-8 text to `data/raw/<source>/<external_id>.txt`.
+def export_filename(external_id: str) -> str:
+    """Portable file name for an id; ids that had to be altered get a hash suffix so they can't collide."""
+    safe = _safe_filename(external_id)
+    if safe != external_id:
+        safe = f"{safe[:170]}-{hashlib.sha1(external_id.encode('utf-8')).hexdigest()[:8]}"
+    return safe + ".txt"
+
+
+@contextmanager
+def raw_index() -> Iterator[sqlite3.Connection]:
+    RAW_ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(RAW_ARCHIVE_DIR / "index.sqlite")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS raw_items (
+            source TEXT NOT NULL,
+            external_id TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            PRIMARY KEY (source, external_id)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS raw_blobs (
+            sha256 TEXT PRIMARY KEY,
+            shard TEXT NOT NULL,
+            offset INTEGER NOT NULL,
+            length INTEGER NOT NULL,
+            size INTEGER NOT NULL
+        )
+        """
+    )
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _normalize(text: str) -> bytes:
+    return ((text or "").strip() + "\n").encode("utf-8")
+
 
-    Returns the path written.
+def _current_shard() -> Path:
+    shards = sorted(RAW_ARCHIVE_DIR.glob("shard-*.gz"))
+    if shards and shards[-1].stat().st_size < RAW_SHARD_BYTES:
+        return shards[-1]
+    return RAW_ARCHIVE_DIR / f"shard-{len(shards):05d}.gz"
+
+
+def write_raw_texts(items: Iterable[Tuple[str, str, str]]) -> Dict[str, int]:
+    """Store (source, external_id, text) items; returns counts of written/deduplicated/unchanged.
+
+    Bytes are appended (and flushed) before the index commits, so a crash can
+    only leave unreferenced bytes at a shard's tail.
     """
-    src = _safe_filename(source)
-    filename = _safe_filename(external_id) + ".txt"
+    stats = {"written": 0, "deduplicated": 0, "unchanged": 0}
+    with _write_lock, raw_index() as conn:
+        shard = _current_shard()
+        out = None
+        try:
+            for source, external_id, text in items:
+                data = _normalize(text)
+                digest = hashlib.sha256(data).hexdigest()
+                row = conn.execute(
+                    "SELECT sha256 FROM raw_items WHERE source = ? AND external_id = ?", (source, external_id)
+                ).fetchone()
+                if row and row[0] == digest:
+                    stats["unchanged"] += 1
+                    continue
+                if conn.execute("SELECT 1 FROM raw_blobs WHERE sha256 = ?", (digest,)).fetchone():
+                    stats["deduplicated"] += 1
+                else:
+                    if out is None or out.tell() >= RAW_SHARD_BYTES:
+                        if out is not None:
+                            out.close()
+                            shard = RAW_ARCHIVE_DIR / f"shard-{int(shard.stem.split('-')[1]) + 1:05d}.gz"
+                        out = shard.open("ab")
+                    member = gzip.compress(data, compresslevel=6, mtime=0)
+                    offset = out.tell()
+                    out.write(member)
+                    conn.execute(
+                        "INSERT INTO raw_blobs (sha256, shard, offset, length, size) VALUES (?, ?, ?, ?, ?)",
+                        (digest, shard.name, offset, len(member), len(data)),
+                    )
+                    stats["written"] += 1
+                conn.execute(
+                    """
+                    INSERT INTO raw_items (source, external_id, sha256) VALUES (?, ?, ?)
+                    ON CONFLICT(source, external_id) DO UPDATE SET sha256 = excluded.sha256
+                    """,
+                    (source, external_id, digest),
+                )
+        finally:
+            if out is not None:
+                out.flush()
+                os.fsync(out.fileno())
+                out.close()
+    return stats
+
+
+def write_raw_text(source: str, external_id: str, text: str) -> str:
+    """Archive one text; returns its SHA-256. Prefer write_raw_texts for many."""
+    write_raw_texts([(source, external_id, text)])
+    return hashlib.sha256(_normalize(text)).hexdigest()
+
+
+def _read_blob(shard: str, offset: int, length: int) -> str:
+    with (RAW_ARCHIVE_DIR / shard).open("rb") as f:
+        f.seek(offset)
+        return gzip.decompress(f.read(length)).decode("utf-8")
+
+
+def read_raw_text(source: str, external_id: str) -> Optional[str]:
+    with raw_index() as conn:
+        row = conn.execute(
+            """
+            SELECT b.shard, b.offset, b.length FROM raw_items i JOIN raw_blobs b ON b.sha256 = i.sha256
+            WHERE i.source = ? AND i.external_id = ?
+            """,
+            (source, external_id),
+        ).fetchone()
+    return _read_blob(*row) if row else None
+
+
+def iter_raw_texts(sources: Optional[Sequence[str]] = None) -> Iterator[Tuple[str, str, str]]:
+    """Yield (source, external_id, text) in shard order, so each shard is read sequentially."""
+    where, params = "", ()
+    if sources:
+        where = f" WHERE i.source IN ({','.join('?' for _ in sources)})"
+        params = tuple(sources)
+    with raw_index() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT i.source, i.external_id, b.shard, b.offset, b.length
+            FROM raw_items i JOIN raw_blobs b ON b.sha256 = i.sha256{where}
+            ORDER BY b.shard, b.offset
+            """,
+            params,
+        ).fetchall()
+    for source, external_id, shard, offset, length in rows:
+        yield source, external_id, _read_blob(shard, offset, length)
+
+
+def export_raw_texts(out_dir: Path, sources: Optional[Sequence[str]] = None) -> int:
+    """Write `<out_dir>/<source>/<external_id>.txt` for every archived text; returns files written."""
+    written = 0
+    for source, external_id, text in iter_raw_texts(sources):
+        path = Path(out_dir) / _safe_filename(source) / export_filename(external_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+        written += 1
+    return written
+
+
+def import_loose_files(raw_dir: Path = RAW_DIR) -> Dict[str, int]:
+    """Pack an existing `<source>/<name>.txt` tree; ids are the file stems."""
+    items: List[Tuple[str, str, str]] = []
+    for path in sorted(Path(raw_dir).glob("*/*.txt")):
+        items.append((path.parent.name, path.stem, path.read_text(encoding="utf-8")))
+    return write_raw_texts(items)
 
-    out_dir = RAW_DIR / src
-    out_dir.mkdir(parents=True, exist_ok=True)
 
-    out_path = out_dir / filename
-    out_path.write_text((text or "").strip() + "\n", encoding="utf-8")
-    return out_path
+def archive_stats() -> dict:
+    with raw_index() as conn:
+        items = conn.execute("SELECT COUNT(*) FROM raw_items").fetchone()[0]
+        blobs, stored, size = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(length), 0), COALESCE(SUM(size), 0) FROM raw_blobs"
+        ).fetchone()
+    shards = sorted(RAW_ARCHIVE_DIR.glob("shard-*.gz"))
+    return {
+        "items": items,
+        "unique_texts": blobs,
+        "text_bytes": size,
+        "stored_bytes": stored,
+        "shards": len(shards),
+        "shard_bytes": sum(p.stat().st_size for p in shards),
+    }
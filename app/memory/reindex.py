@@ -0,0 +1,342 @@
+"""Shadow re-index for switching embedding models without downtime.
+
+`start_reindex` creates an `embeddings_shadow` table and records the target
+(model, dimensions) in index_meta. `reindex_step` re-embeds the next block of
+live chunks that the shadow lacks (or holds with stale text) and writes them
+to the shadow. Search keeps reading `embeddings` the whole time. Progress is
+the shadow itself plus a rowid cursor, so a killed run just resumes.
+Cold archive segments (archive.py) are re-embedded too, once the live
+chunks are covered: each goes to a sibling file (`.reindex.npz`), one
+segment per step. `switchover` swaps the tables, repoints the segments at their new
+files and changes the active model in one transaction, once every live
+chunk and segment is covered; standing queries are reset because their
+stored query vectors and rowid marks belong to the old index.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from datetime import datetime, timezone
+from typing import Callable, List, Optional
+
+import numpy as np
+from openai import OpenAI
+
+from ..metrics import count, stage
+from .archive import _ensure_table, _read_segment, _write_segment
+from .ingest import embed_texts
+from .models import EmbeddingRecord
+from .storage import (
+    DATA_DIR,
+    EMBEDDINGS_TABLE,
+    SHADOW_TABLE,
+    _active_model,
+    create_embeddings_table,
+    embedding_db,
+    get_meta,
+    set_meta,
+    upsert_embeddings,
+)
+
+REINDEX_BATCH_CHUNKS = int(os.environ.get("REINDEX_BATCH_CHUNKS", "256"))
+REINDEX_CHUNKS_PER_MIN = float(os.environ.get("REINDEX_CHUNKS_PER_MIN", "3000"))
+
+# Live chunks the shadow is missing or holds with different text.
+_PENDING = f"""
+    FROM {EMBEDDINGS_TABLE} e LEFT JOIN {SHADOW_TABLE} s
+        ON s.source = e.source AND s.external_id = e.external_id AND s.chunk_id = e.chunk_id
+    WHERE s.chunk_id IS NULL OR s.text_excerpt != e.text_excerpt
+"""
+
+
+def start_reindex(model: str, dimensions: Optional[int] = None, restart: bool = False) -> dict:
+    """Create (or resume) the shadow index for `model`; returns the reindex state.
+
+    Resuming with a different target raises ValueError unless `restart`,
+    which drops the existing shadow first.
+    """
+    with embedding_db() as conn:
+        state = get_meta(conn, "reindex")
+        if state and (state["model"], state.get("dimensions")) != (model, dimensions):
+            if not restart:
+                raise ValueError(
+                    f"A re-index to {state['model']} ({state.get('dimensions') or 'default'} dims) is in progress; "
+                    "pass restart to replace it"
+                )
+            state = None
+        if state is None or restart:
+            conn.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+            _drop_reindexed_segments(get_meta(conn, "reindex"))
+            state = {
+                "model": model,
+                "dimensions": dimensions,
+                "started_at": datetime.now(timezone.utc).isoformat(),
+                "cursor": 0,
+                "embedded": 0,
+                "tokens": 0,
+                "seconds": 0.0,
+                # Cold segment id -> its re-embedded file and vector length.
+                "segments": {},
+            }
+            set_meta(conn, "reindex", state)
+        create_embeddings_table(conn, SHADOW_TABLE)
+    return state
+
+
+def abort_reindex() -> None:
+    with embedding_db() as conn:
+        conn.execute(f"DROP TABLE IF EXISTS {SHADOW_TABLE}")
+        _drop_reindexed_segments(get_meta(conn, "reindex"))
+        set_meta(conn, "reindex", None)
+
+
+def _drop_reindexed_segments(state: Optional[dict]) -> None:
+    for done in ((state or {}).get("segments") or {}).values():
+        (DATA_DIR / done["path"]).unlink(missing_ok=True)
+
+
+def _pending_segments(conn, state: dict) -> List[tuple]:
+    """(id, path, rows) of cold segments the re-index has yet to re-embed, oldest first."""
+    _ensure_table(conn)
+    done = state.get("segments") or {}
+    return [
+        row[:3]
+        for row in conn.execute("SELECT id, path, rows, model, dimensions FROM cold_segments ORDER BY id")
+        if str(row[0]) not in done
+        and (row[3] != state["model"] or (state.get("dimensions") is not None and row[4] != state["dimensions"]))
+    ]
+
+
+def reindex_status() -> Optional[dict]:
+    """Coverage and throughput of the running re-index (None if there is none)."""
+    with embedding_db() as conn:
+        state = get_meta(conn, "reindex")
+        if state is None:
+            return None
+        create_embeddings_table(conn, SHADOW_TABLE)
+        total = conn.execute(f"SELECT COUNT(*) FROM {EMBEDDINGS_TABLE}").fetchone()[0]
+        pending = conn.execute(f"SELECT COUNT(*) {_PENDING}").fetchone()[0]
+        _ensure_table(conn)
+        total += conn.execute("SELECT COALESCE(SUM(rows), 0) FROM cold_segments").fetchone()[0]
+        cold_pending = _pending_segments(conn, state)
+        pending += sum(row[2] for row in cold_pending)
+        active = _active_model(conn)
+    rate = state["embedded"] / state["seconds"] if state["seconds"] else None
+    return {
+        **state,
+        "active_model": active[0],
+        "active_dimensions": active[1],
+        "total": total,
+        "covered": total - pending,
+        "pending": pending,
+        "segments_pending": len(cold_pending),
+        "coverage": (total - pending) / total if total else 1.0,
+        "chunks_per_s": rate,
+        "eta_s": pending / rate if rate else None,
+    }
+
+
+def _pending_chunks(conn, cursor: int, limit: int) -> List[tuple]:
+    return conn.execute(
+        f"""
+        SELECT e.rowid, e.source, e.external_id, e.chunk_id, e.text_excerpt, e.token_count, e.similarity_hint
+        {_PENDING} AND e.rowid > ?
+        ORDER BY e.rowid LIMIT ?
+        """,
+        (cursor, limit),
+    ).fetchall()
+
+
+def reindex_step(
+    limit: int = REINDEX_BATCH_CHUNKS,
+    embed: Optional[Callable[[List[str], str, Optional[int]], tuple]] = None,
+) -> int:
+    """Re-embed up to `limit` pending chunks into the shadow; returns how many.
+
+    Walks the live table by rowid; at the end it wraps around once to catch
+    chunks added or re-chunked behind the cursor. 0 means fully covered.
+    `embed(texts, model, dimensions) -> (vectors, tokens)` defaults to the
+    OpenAI client.
+    """
+    if embed is None:
+        client = OpenAI()
+        embed = lambda texts, model, dims: embed_texts(client, texts, model, dims)  # noqa: E731
+
+    with embedding_db() as conn:
+        state = get_meta(conn, "reindex")
+        if state is None:
+            raise RuntimeError("No re-index in progress; start one first")
+        rows = _pending_chunks(conn, state["cursor"], limit)
+        if not rows and state["cursor"]:
+            state["cursor"] = 0
+            rows = _pending_chunks(conn, 0, limit)
+        segments = _pending_segments(conn, state) if not rows else []
+    if segments:
+        return _reindex_segment(state, segments[0], limit, embed)
+    if not rows:
+        return 0
+
+    start = time.perf_counter()
+    with stage("reindex.embed", chunks=len(rows)):
+        vectors, tokens = embed([row[4] for row in rows], state["model"], state.get("dimensions"))
+    records = [
+        EmbeddingRecord(
+            source=row[1],
+            external_id=row[2],
+            chunk_id=row[3],
+            embedding=vector,
+            text_excerpt=row[4],
+            token_count=row[5],
+            similarity_hint=row[6],
+        )
+        for row, vector in zip(rows, vectors)
+    ]
+    upsert_embeddings(records, model=state["model"], table=SHADOW_TABLE)
+    count("reindex.embed", chunks=len(rows), tokens=tokens)
+
+    state.update(
+        cursor=rows[-1][0],
+        embedded=state["embedded"] + len(rows),
+        tokens=state["tokens"] + tokens,
+        seconds=state["seconds"] + time.perf_counter() - start,
+    )
+    with embedding_db() as conn:
+        set_meta(conn, "reindex", state)
+    return len(rows)
+
+
+def _reindex_segment(state: dict, segment: tuple, limit: int, embed: Callable) -> int:
+    """Re-embed one cold segment into a sibling file; returns its row count."""
+    segment_id, path, _ = segment
+    _, meta = _read_segment(DATA_DIR / path)
+    texts = meta["text_excerpt"]
+    start = time.perf_counter()
+    parts: List[np.ndarray] = []
+    tokens = 0
+    with stage("reindex.embed", chunks=len(texts), segments=1):
+        limit = max(1, limit)
+        for offset in range(0, len(texts), limit):
+            batch_vectors, batch_tokens = embed(texts[offset : offset + limit], state["model"], state.get("dimensions"))
+            parts.append(np.asarray(batch_vectors, dtype=np.float32))
+            tokens += batch_tokens
+    matrix = np.concatenate(parts) if parts else np.zeros((0, 0), dtype=np.float32)
+    # Alternate between the two names, so the live file is never overwritten.
+    old_path = DATA_DIR / path
+    if old_path.name.endswith(".reindex.npz"):
+        new_path = old_path.with_name(old_path.name[: -len(".reindex.npz")] + ".npz")
+    else:
+        new_path = old_path.with_suffix(".reindex.npz")
+    _write_segment(new_path, matrix, meta)
+    count("reindex.embed", chunks=len(texts), tokens=tokens, segments=1)
+
+    with embedding_db() as conn:
+        state.setdefault("segments", {})[str(segment_id)] = {
+            "path": str(new_path.relative_to(DATA_DIR)),
+            "dimensions": int(matrix.shape[1]) if len(matrix) else state.get("dimensions"),
+        }
+        state.update(
+            embedded=state["embedded"] + len(texts),
+            tokens=state["tokens"] + tokens,
+            seconds=state["seconds"] + time.perf_counter() - start,
+        )
+        set_meta(conn, "reindex", state)
+    return len(texts)
+
+
+def switchover() -> bool:
+    """Make the shadow the live index if it covers every live chunk; returns whether it did.
+
+    Runs in one IMMEDIATE transaction, so writers wait and readers see
+    either the old index or the new one, never a mix.
+    """
+    with embedding_db() as conn:
+        conn.isolation_level = None
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            state = get_meta(conn, "reindex")
+            if (
+                state is None
+                or conn.execute(f"SELECT COUNT(*) {_PENDING}").fetchone()[0]
+                or _pending_segments(conn, state)
+            ):
+                conn.execute("ROLLBACK")
+                return False
+            done_segments = state.get("segments") or {}
+            retired_segments = [
+                row for row in conn.execute("SELECT id, path FROM cold_segments") if str(row[0]) in done_segments
+            ]
+            for segment_id, _ in retired_segments:
+                done = done_segments[str(segment_id)]
+                conn.execute(
+                    "UPDATE cold_segments SET path = ?, model = ?, dimensions = ? WHERE id = ?",
+                    (done["path"], state["model"], done["dimensions"], segment_id),
+                )
+            # Chunks deleted from the live index since they were re-embedded.
+            conn.execute(
+                f"""
+                DELETE FROM {SHADOW_TABLE} WHERE NOT EXISTS (
+                    SELECT 1 FROM {EMBEDDINGS_TABLE} e
+                    WHERE e.source = {SHADOW_TABLE}.source AND e.external_id = {SHADOW_TABLE}.external_id
+                        AND e.chunk_id = {SHADOW_TABLE}.chunk_id
+                )
+                """
+            )
+            # Keep each chunk's age for retention, not the time it was re-embedded.
+            conn.execute(
+                f"""
+                UPDATE {SHADOW_TABLE} SET ingested_at = (
+                    SELECT e.ingested_at FROM {EMBEDDINGS_TABLE} e
+                    WHERE e.source = {SHADOW_TABLE}.source AND e.external_id = {SHADOW_TABLE}.external_id
+                        AND e.chunk_id = {SHADOW_TABLE}.chunk_id
+                )
+                """
+            )
+            conn.execute(f"ALTER TABLE {EMBEDDINGS_TABLE} RENAME TO {EMBEDDINGS_TABLE}_retired")
+            conn.execute(f"ALTER TABLE {SHADOW_TABLE} RENAME TO {EMBEDDINGS_TABLE}")
+            conn.execute(f"DROP TABLE {EMBEDDINGS_TABLE}_retired")
+            # Index names survive the rename; rebuild the shadow's under the live name (shards.py uses INDEXED BY).
+            conn.execute(f"DROP INDEX IF EXISTS {SHADOW_TABLE}_source_time")
+            create_embeddings_table(conn)
+            conn.execute("DROP TABLE IF EXISTS standing_queries")
+            set_meta(conn, "embedding_model", {"model": state["model"], "dimensions": state.get("dimensions")})
+            set_meta(conn, "reindex", None)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+    for _, path in retired_segments:
+        (DATA_DIR / path).unlink(missing_ok=True)
+    return True
+
+
+def run_reindex(
+    chunks_per_min: float = REINDEX_CHUNKS_PER_MIN,
+    batch: int = REINDEX_BATCH_CHUNKS,
+    max_seconds: Optional[float] = None,
+    switch: bool = True,
+    report: Optional[Callable[[dict], None]] = None,
+    embed: Optional[Callable[[List[str], str, Optional[int]], tuple]] = None,
+) -> bool:
+    """Step until covered (then switch over) or `max_seconds` elapse; returns whether it switched.
+
+    Throttled to `chunks_per_min` by sleeping between batches. `report` gets
+    reindex_status() after every batch.
+    """
+    deadline = time.monotonic() + max_seconds if max_seconds else None
+    while True:
+        started = time.monotonic()
+        done = reindex_step(batch, embed=embed)
+        if report:
+            report(reindex_status())
+        if not done:
+            if not switch:
+                return False
+            if switchover():
+                return True
+            # Chunks ingested since the last step; pick them up and retry.
+            continue
+        if chunks_per_min > 0:
+            time.sleep(max(0.0, done * 60.0 / chunks_per_min - (time.monotonic() - started)))
+        if deadline and time.monotonic() >= deadline:
+            return False
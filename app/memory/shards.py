@@ -0,0 +1,285 @@
+"""Source/month shards of the embedding store for parallel exact search.
+
+`sync_shards` partitions the live `embeddings` table by source and UTC
+month of ingested_at into `data/shards/`. Each shard is three .npy files
+(unit-normalized float32 vectors, rowids, ingested_at) named after a
+fingerprint of its rows (count, max and sum of rowid, sum of ingested_at,
+model), all read from the (source, ingested_at) index. upsert_embeddings
+moves ingested_at whenever a chunk's vector changes, so in-place updates
+change the fingerprint too. Shard files
+are written once and never modified: a partition that changed gets new
+files and `manifest.json` is swapped atomically, so readers can memory-map
+and cache any shard they see in the manifest. In practice only the current
+month's shards are rewritten; older ones change only when retention or a
+re-index removes or replaces rows.
+
+`search_shards` skips shards outside the source and date filters, scores
+the rest in row blocks on a thread pool (NumPy releases the GIL in the
+matmul), keeps a top-k per block and merges them. Chunk metadata for the
+winners is then read from SQLite by rowid.
+"""
+
+from __future__ import annotations
+
+import calendar
+import hashlib
+import heapq
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..metrics import count, stage
+from .storage import DATA_DIR, EMBED_DB_PATH, EMBEDDINGS_TABLE, _active_model, decode_embedding, embedding_db, embedding_dims
+from .vectors import as_unit_vector, normalize_rows
+
+SHARDS_DIR = DATA_DIR / "shards"
+MANIFEST_PATH = SHARDS_DIR / "manifest.json"
+SCAN_WORKERS = int(os.environ.get("SHARD_SCAN_WORKERS", str(os.cpu_count() or 1)))
+# Rows per scan task, so one big shard still spreads across workers.
+SCAN_BLOCK_ROWS = int(os.environ.get("SHARD_SCAN_BLOCK_ROWS", "65536"))
+FETCH_ROWS = 2048
+
+_cache_lock = threading.Lock()
+_mapped: Dict[str, np.ndarray] = {}
+
+
+def _month_bounds(month: str) -> Tuple[float, float]:
+    year, mon = (int(part) for part in month.split("-"))
+    start = calendar.timegm((year, mon, 1, 0, 0, 0))
+    end = calendar.timegm((year + mon // 12, mon % 12 + 1, 1, 0, 0, 0))
+    return float(start), float(end)
+
+
+def load_shard_manifest() -> dict:
+    if not MANIFEST_PATH.exists():
+        return {"model": None, "shards": []}
+    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: dict) -> None:
+    SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix(f".json.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(MANIFEST_PATH)
+
+
+def _save_array(path, array: np.ndarray) -> None:
+    # Per-writer temp name: concurrent syncs building the same shard must not share one.
+    tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with tmp_path.open("wb") as f:
+        np.save(f, array)
+    tmp_path.replace(path)
+
+
+def _build_shard(conn, source: str, month: str, rows: int, name: str) -> dict:
+    start, end = _month_bounds(month)
+    cursor = conn.execute(
+        f"""
+        SELECT rowid, embedding, ingested_at FROM {EMBEDDINGS_TABLE} INDEXED BY {EMBEDDINGS_TABLE}_source_time
+        WHERE source = ? AND ingested_at >= ? AND ingested_at < ? ORDER BY rowid
+        """,
+        (source, start, end),
+    )
+    vectors: Optional[np.ndarray] = None
+    rowids = np.zeros(rows, dtype=np.int64)
+    times = np.zeros(rows, dtype=np.float64)
+    idx = 0
+    while True:
+        batch = cursor.fetchmany(FETCH_ROWS)
+        if not batch:
+            break
+        for rowid, blob, ingested_at in batch:
+            if idx >= rows:
+                break
+            if vectors is None:
+                vectors = np.zeros((rows, embedding_dims(blob)), dtype=np.float32)
+            vector = decode_embedding(blob)
+            if len(vector) == vectors.shape[1]:
+                vectors[idx] = vector
+            rowids[idx], times[idx] = rowid, ingested_at
+            idx += 1
+    vectors = normalize_rows(vectors[:idx]).astype(np.float32) if vectors is not None else np.zeros((0, 0), np.float32)
+    folder = SHARDS_DIR / source
+    folder.mkdir(parents=True, exist_ok=True)
+    for suffix, array in (("vectors", vectors), ("rowids", rowids[:idx]), ("times", times[:idx])):
+        _save_array(folder / f"{name}.{suffix}.npy", array)
+    return {
+        "source": source,
+        "month": month,
+        "name": name,
+        "rows": idx,
+        "dims": int(vectors.shape[1]) if idx else 0,
+        "oldest": float(times[:idx].min()) if idx else None,
+        "newest": float(times[:idx].max()) if idx else None,
+    }
+
+
+def _db_stamp() -> List[int]:
+    stat = EMBED_DB_PATH.stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def sync_shards(rebuild: bool = False) -> dict:
+    """Bring data/shards in line with the live table; returns counts of kept/built/removed shards.
+
+    Returns at once when the database file is untouched since the last sync.
+    """
+    stats = {"kept": 0, "built": 0, "removed": 0}
+    manifest = load_shard_manifest()
+    with stage("shards.sync"), embedding_db() as conn:
+        stamp = _db_stamp()
+        if not rebuild and manifest.get("db_stamp") == stamp:
+            stats["kept"] = len(manifest["shards"])
+            return stats
+        model, _ = _active_model(conn)
+        partitions = conn.execute(
+            f"""
+            SELECT source, strftime('%Y-%m', ingested_at, 'unixepoch') AS month,
+                COUNT(*), MAX(rowid), SUM(rowid), SUM(ingested_at)
+            FROM {EMBEDDINGS_TABLE} INDEXED BY {EMBEDDINGS_TABLE}_source_time
+            GROUP BY source, month
+            """
+        ).fetchall()
+        existing = {(s["source"], s["month"]): s for s in manifest["shards"]} if manifest["model"] == model else {}
+        shards = []
+        for source, month, rows, max_rowid, sum_rowid, sum_time in partitions:
+            if month is None:
+                continue
+            key = f"{model}:{rows}:{max_rowid}:{sum_rowid}:{sum_time!r}"
+            fingerprint = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+            name = f"{month}.{fingerprint}"
+            current = existing.get((source, month))
+            if current and current["name"] == name and not rebuild:
+                shards.append(current)
+                stats["kept"] += 1
+                continue
+            shards.append(_build_shard(conn, source, month, rows, name))
+            stats["built"] += 1
+    _save_manifest(
+        {"model": model, "db_stamp": stamp, "updated_at": datetime.now(timezone.utc).isoformat(), "shards": shards}
+    )
+
+    # Files no longer in the manifest. Readers that mapped them keep working (POSIX unlink semantics).
+    live = {f"{s['source']}/{s['name']}.{suffix}.npy" for s in shards for suffix in ("vectors", "rowids", "times")}
+    for path in SHARDS_DIR.glob("*/*.npy"):
+        if path.relative_to(SHARDS_DIR).as_posix() not in live:
+            path.unlink(missing_ok=True)
+            with _cache_lock:
+                _mapped.pop(str(path), None)
+            stats["removed"] += 1
+    count("shards.sync", **stats)
+    return stats
+
+
+def _mmap(path) -> np.ndarray:
+    key = str(path)
+    with _cache_lock:
+        array = _mapped.get(key)
+        if array is None:
+            array = _mapped[key] = np.load(path, mmap_mode="r")
+        return array
+
+
+def _select(manifest: dict, sources: Optional[Sequence[str]], since: Optional[float], until: Optional[float]) -> List[dict]:
+    selected = []
+    for shard in manifest["shards"]:
+        if not shard["rows"] or (sources and shard["source"] not in sources):
+            continue
+        if since is not None and shard["newest"] < since:
+            continue
+        if until is not None and shard["oldest"] >= until:
+            continue
+        selected.append(shard)
+    return selected
+
+
+def _scan_block(
+    shard: dict, start: int, stop: int, query: np.ndarray, top_k: int, since: Optional[float], until: Optional[float]
+) -> List[Tuple[float, int]]:
+    folder = SHARDS_DIR / shard["source"]
+    vectors = _mmap(folder / f"{shard['name']}.vectors.npy")[start:stop]
+    scores = vectors @ query
+    # Only shards straddling a date bound need the per-row check.
+    if (since is not None and shard["oldest"] < since) or (until is not None and shard["newest"] >= until):
+        times = _mmap(folder / f"{shard['name']}.times.npy")[start:stop]
+        mask = np.ones(len(times), dtype=bool)
+        if since is not None:
+            mask &= times >= since
+        if until is not None:
+            mask &= times < until
+        scores = np.where(mask, scores, -np.inf)
+    k = min(top_k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k] if k < len(scores) else np.arange(len(scores))
+    rowids = _mmap(folder / f"{shard['name']}.rowids.npy")[start:stop]
+    return [(float(scores[i]), int(rowids[i])) for i in top if np.isfinite(scores[i])]
+
+
+def search_shards(
+    query_embedding: Sequence[float],
+    sources: Optional[Sequence[str]] = None,
+    top_k: int = 10,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    workers: int = SCAN_WORKERS,
+) -> List[dict]:
+    """Exact top_k over the shards matching `sources` and [since, until) (epoch seconds).
+
+    Call sync_shards() first if the live table may have changed.
+    """
+    manifest = load_shard_manifest()
+    query = as_unit_vector(query_embedding)
+    shards = [s for s in _select(manifest, sources, since, until) if s["dims"] == len(query)]
+    tasks = [
+        (shard, start, min(start + SCAN_BLOCK_ROWS, shard["rows"]))
+        for shard in shards
+        for start in range(0, shard["rows"], SCAN_BLOCK_ROWS)
+    ]
+    scanned = sum(s["rows"] for s in shards)
+    with stage("search.shards", chunks=scanned, shards=len(shards)):
+        if workers <= 1 or len(tasks) <= 1:
+            partials = [_scan_block(*task, query, top_k, since, until) for task in tasks]
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                partials = list(pool.map(lambda task: _scan_block(*task, query, top_k, since, until), tasks))
+        best = heapq.nlargest(top_k, (hit for partial in partials for hit in partial))
+    count("search.shards", chunks=scanned, shards=len(shards), skipped=len(manifest["shards"]) - len(shards))
+    return _hydrate(best)
+
+
+def _hydrate(hits: List[Tuple[float, int]]) -> List[dict]:
+    """Attach chunk metadata from SQLite to (score, rowid) hits, keeping their order."""
+    if not hits:
+        return []
+    with embedding_db() as conn:
+        rows = conn.execute(
+            f"""
+            SELECT rowid, source, external_id, chunk_id, text_excerpt, similarity_hint, token_count
+            FROM {EMBEDDINGS_TABLE} WHERE rowid IN ({','.join('?' for _ in hits)})
+            """,
+            [rowid for _, rowid in hits],
+        ).fetchall()
+    by_rowid = {row[0]: row for row in rows}
+    results = []
+    for score, rowid in hits:
+        row = by_rowid.get(rowid)
+        if row is None:
+            # Deleted since the last sync.
+            continue
+        results.append(
+            {
+                "source": row[1],
+                "external_id": row[2],
+                "chunk_id": row[3],
+                "score": score,
+                "text_excerpt": row[4],
+                "similarity_hint": row[5],
+                "token_count": row[6],
+            }
+        )
+    return results
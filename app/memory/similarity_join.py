@@ -0,0 +1,176 @@
+"""Top-k existing documents for every new document, as one local batch join.
+
+Instead of one query search per new article, the new-side chunk matrix is
+multiplied against the existing-side chunks block by block, streamed from
+SQLite so memory stays bounded by the block sizes. A document pair scores as
+its best chunk-to-chunk cosine similarity. Blocks of new rows are scored in
+a thread pool; NumPy releases the GIL inside the matrix products.
+"""
+
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .models import EmbeddingRecord
+from .query import _load_embeddings
+from .storage import _active_dimensions, decode_embedding, embedding_db
+from .vectors import DocKey, normalize_rows
+
+EXISTING_BLOCK_ROWS = int(os.environ.get("SIMILARITY_JOIN_BLOCK_ROWS", "4096"))
+NEW_BLOCK_ROWS = 2048
+JOIN_WORKERS = int(os.environ.get("SIMILARITY_JOIN_WORKERS", str(os.cpu_count() or 4)))
+
+
+def _doc_runs(keys: Sequence[DocKey]) -> Tuple[List[DocKey], np.ndarray]:
+    """Distinct consecutive keys and the row offset where each run starts."""
+    docs: List[DocKey] = []
+    starts: List[int] = []
+    for row, key in enumerate(keys):
+        if not docs or docs[-1] != key:
+            docs.append(key)
+            starts.append(row)
+    return docs, np.asarray(starts, dtype=np.int64)
+
+
+def _matrix(embeddings: Sequence[np.ndarray]) -> np.ndarray:
+    return normalize_rows(np.stack(embeddings).astype(np.float32, copy=False))
+
+
+def _existing_blocks(sources: Sequence[str], block_rows: int) -> Iterator[Tuple[List[DocKey], np.ndarray]]:
+    """Yield (chunk keys, unit matrix) blocks ordered by document, never splitting one.
+
+    Only rows of the active model and vector length are read, as in load_embedding_batch.
+    """
+    placeholders = ",".join("?" for _ in sources)
+    sql = (
+        "SELECT source, external_id, embedding FROM embeddings "
+        f"WHERE model = ? AND dimensions = ? AND source IN ({placeholders}) "
+        "ORDER BY source, external_id"
+    )
+    keys: List[DocKey] = []
+    vectors: List[list] = []
+    with embedding_db() as conn:
+        cursor = conn.execute(sql, _active_dimensions(conn) + tuple(sources))
+        while True:
+            rows = cursor.fetchmany(block_rows)
+            for source, external_id, blob in rows:
+                embedding = decode_embedding(blob)
+                if len(embedding):
+                    keys.append((source, external_id))
+                    vectors.append(embedding)
+            if not rows:
+                break
+            # Hold back the trailing document: its chunks may continue in the next fetch.
+            cut = len(keys)
+            while cut > 0 and keys[cut - 1] == keys[-1]:
+                cut -= 1
+            if cut:
+                yield keys[:cut], _matrix(vectors[:cut])
+                keys, vectors = keys[cut:], vectors[cut:]
+    if keys:
+        yield keys, _matrix(vectors)
+
+
+def _merge_top(
+    best_scores: np.ndarray, best_ids: np.ndarray, scores: np.ndarray, ids: np.ndarray, top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    all_scores = np.concatenate([best_scores, scores], axis=1)
+    all_ids = np.concatenate([best_ids, np.broadcast_to(ids, scores.shape)], axis=1)
+    if all_scores.shape[1] > top_k:
+        keep = np.argpartition(-all_scores, top_k - 1, axis=1)[:, :top_k]
+        all_scores = np.take_along_axis(all_scores, keep, axis=1)
+        all_ids = np.take_along_axis(all_ids, keep, axis=1)
+    return all_scores, all_ids
+
+
+def similarity_join(
+    new_records: Sequence[EmbeddingRecord],
+    existing_sources: Sequence[str],
+    top_k: int = 5,
+    block_rows: int = EXISTING_BLOCK_ROWS,
+    workers: int = JOIN_WORKERS,
+) -> Dict[DocKey, List[dict]]:
+    """Map each new document to its `top_k` most similar existing documents.
+
+    `new_records` are chunk embeddings (e.g. what `store_content` returned or
+    `_load_embeddings(new_sources)`); documents from `existing_sources` are
+    never matched against themselves.
+    """
+    existing = set(existing_sources)
+    with embedding_db() as conn:
+        _, dims = _active_dimensions(conn)
+    # The existing side holds only active-model rows; other vectors can't be compared with them.
+    new_rows = sorted(
+        (rec for rec in new_records if len(rec.embedding) == dims and rec.source not in existing),
+        key=lambda rec: (rec.source, rec.external_id),
+    )
+    if not new_rows or not existing_sources:
+        return {}
+    new_docs, new_starts = _doc_runs([(rec.source, rec.external_id) for rec in new_rows])
+    new_matrix = _matrix([rec.vector() for rec in new_rows])
+
+    # Row partitions of the new side, aligned to document boundaries.
+    parts: List[Tuple[int, int, int, int]] = []  # (row_lo, row_hi, doc_lo, doc_hi)
+    doc_lo = 0
+    while doc_lo < len(new_docs):
+        row_lo = int(new_starts[doc_lo])
+        doc_hi = int(np.searchsorted(new_starts, row_lo + NEW_BLOCK_ROWS, side="left"))
+        doc_hi = max(doc_hi, doc_lo + 1)
+        row_hi = int(new_starts[doc_hi]) if doc_hi < len(new_docs) else len(new_rows)
+        parts.append((row_lo, row_hi, doc_lo, doc_hi))
+        doc_lo = doc_hi
+
+    best_scores = np.full((len(new_docs), 0), -np.inf, dtype=np.float32)
+    best_ids = np.zeros((len(new_docs), 0), dtype=np.int64)
+    existing_docs: List[DocKey] = []
+
+    def score_part(part, block, block_starts, id_offset):
+        row_lo, row_hi, doc_lo, doc_hi = part
+        chunk_scores = new_matrix[row_lo:row_hi] @ block.T
+        # Best chunk pair per (new doc, existing doc).
+        per_new_doc = np.maximum.reduceat(chunk_scores, new_starts[doc_lo:doc_hi] - row_lo, axis=0)
+        per_pair = np.maximum.reduceat(per_new_doc, block_starts, axis=1)
+        ids = np.arange(id_offset, id_offset + per_pair.shape[1], dtype=np.int64)
+        return _merge_top(best_scores[doc_lo:doc_hi], best_ids[doc_lo:doc_hi], per_pair, ids, top_k)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(parts)))) as pool:
+        for keys, block in _existing_blocks(existing_sources, block_rows):
+            block_docs, block_starts = _doc_runs(keys)
+            id_offset = len(existing_docs)
+            existing_docs.extend(block_docs)
+            results = list(pool.map(lambda part: score_part(part, block, block_starts, id_offset), parts))
+            width = min(top_k, best_scores.shape[1] + len(block_docs))
+            merged_scores = np.empty((len(new_docs), width), dtype=np.float32)
+            merged_ids = np.empty((len(new_docs), width), dtype=np.int64)
+            for (_, _, doc_lo, doc_hi), (scores, ids) in zip(parts, results):
+                merged_scores[doc_lo:doc_hi], merged_ids[doc_lo:doc_hi] = scores, ids
+            best_scores, best_ids = merged_scores, merged_ids
+
+    matches: Dict[DocKey, List[dict]] = {}
+    for row, key in enumerate(new_docs):
+        order = np.argsort(-best_scores[row])
+        matches[key] = [
+            {
+                "source": existing_docs[best_ids[row, i]][0],
+                "external_id": existing_docs[best_ids[row, i]][1],
+                "score": float(best_scores[row, i]),
+            }
+            for i in order
+        ]
+    return matches
+
+
+def load_new_records(new_sources: Sequence[str], external_ids: Optional[Sequence[str]] = None) -> List[EmbeddingRecord]:
+    """Chunk embeddings for the new side of a join, optionally limited to some documents.
+
+    Loaded through load_embedding_batch, so only active-model rows come back.
+    """
+    records = _load_embeddings(new_sources)
+    if external_ids is not None:
+        wanted = set(external_ids)
+        records = [rec for rec in records if rec.external_id in wanted]
+    return records
@@ -0,0 +1,201 @@
+"""Standing queries: per-source top-k kept up to date incrementally.
+
+Each digest's query is stored with its embedding, its current top matches
+per source, and the highest embeddings rowid it has seen. Later runs score
+only the chunks written since then (by any ingest script) and merge them
+into the stored top-k, so digest cost follows the day's volume rather than
+the size of the index. A full recompute runs when the query or per_source
+changes, when forced, or every STANDING_QUERY_REFRESH_DAYS to pick up
+re-embedded or deleted chunks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from ..metrics import count, stage
+from .models import EmbeddingBatch, EmbeddingRecord
+from .query import EMBEDDING_COLUMNS, _row_to_record
+from .storage import embedding_db
+from .vectors import cosine_scores
+
+REFRESH_DAYS = float(os.environ.get("STANDING_QUERY_REFRESH_DAYS", "7"))
+
+ChunkKey = tuple
+
+
+@dataclass
+class StandingQuery:
+    name: str
+    query: str
+    embedding: List[float]
+    per_source: int
+    top_k: Dict[str, List[dict]]
+    last_rowid: int
+    refreshed_at: float
+
+
+def _ensure_table(conn) -> None:
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS standing_queries (
+            name TEXT PRIMARY KEY,
+            query TEXT NOT NULL,
+            embedding TEXT NOT NULL,
+            per_source INTEGER NOT NULL,
+            top_k TEXT NOT NULL,
+            last_rowid INTEGER NOT NULL,
+            refreshed_at REAL NOT NULL
+        )
+        """
+    )
+
+
+def load_standing_query(name: str) -> Optional[StandingQuery]:
+    with embedding_db() as conn:
+        _ensure_table(conn)
+        row = conn.execute(
+            "SELECT name, query, embedding, per_source, top_k, last_rowid, refreshed_at FROM standing_queries WHERE name = ?",
+            (name,),
+        ).fetchone()
+    if not row:
+        return None
+    return StandingQuery(
+        name=row[0],
+        query=row[1],
+        embedding=json.loads(row[2]),
+        per_source=row[3],
+        top_k=json.loads(row[4]),
+        last_rowid=row[5],
+        refreshed_at=row[6],
+    )
+
+
+def save_standing_query(state: StandingQuery) -> None:
+    with embedding_db() as conn:
+        _ensure_table(conn)
+        conn.execute(
+            """
+            INSERT INTO standing_queries (name, query, embedding, per_source, top_k, last_rowid, refreshed_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                query=excluded.query,
+                embedding=excluded.embedding,
+                per_source=excluded.per_source,
+                top_k=excluded.top_k,
+                last_rowid=excluded.last_rowid,
+                refreshed_at=excluded.refreshed_at
+            """,
+            (
+                state.name,
+                state.query,
+                json.dumps(state.embedding),
+                state.per_source,
+                json.dumps(state.top_k, ensure_ascii=False),
+                state.last_rowid,
+                state.refreshed_at,
+            ),
+        )
+
+
+def max_rowid() -> int:
+    with embedding_db() as conn:
+        return conn.execute("SELECT COALESCE(MAX(rowid), 0) FROM embeddings").fetchone()[0]
+
+
+def chunks_since(rowid: int) -> List[EmbeddingRecord]:
+    """Chunks inserted after `rowid` (upserts of existing chunks keep their rowid)."""
+    with embedding_db() as conn:
+        rows = conn.execute(f"SELECT {EMBEDDING_COLUMNS} FROM embeddings WHERE rowid > ?", (rowid,)).fetchall()
+    return [_row_to_record(row) for row in rows]
+
+
+def needs_full_refresh(state: Optional[StandingQuery], query: str, per_source: int) -> bool:
+    if state is None or state.query != query or state.per_source != per_source:
+        return True
+    return time.time() - state.refreshed_at > REFRESH_DAYS * 86400
+
+
+def _score(
+    records: Union[EmbeddingBatch, Sequence[EmbeddingRecord]], query_vector: Sequence[float], per_source: int
+) -> List[dict]:
+    """Scored results for the best `per_source` chunks of each source."""
+    batch = records if isinstance(records, EmbeddingBatch) else EmbeddingBatch.from_records(records)
+    if not len(batch) or batch.matrix.shape[1] != len(query_vector):
+        return []
+    scores = cosine_scores(batch.matrix, query_vector)
+    sources = np.asarray(batch.sources)
+    results: List[dict] = []
+    for source in np.unique(sources):
+        rows = np.flatnonzero(sources == source)
+        for idx in rows[np.argsort(-scores[rows], kind="stable")[:per_source]]:
+            results.append(
+                {
+                    "source": batch.sources[idx],
+                    "external_id": batch.external_ids[idx],
+                    "chunk_id": batch.chunk_ids[idx],
+                    "score": float(scores[idx]),
+                    "text_excerpt": batch.text_excerpts[idx],
+                    "similarity_hint": batch.similarity_hints[idx],
+                    "token_count": batch.token_counts[idx],
+                }
+            )
+    return results
+
+
+def merge_top_k(
+    top_k: Dict[str, List[dict]], scored: Sequence[dict], per_source: int
+) -> Dict[str, List[dict]]:
+    """Merge scored chunks into per-source top lists; a re-scored chunk replaces its old entry."""
+    merged: Dict[str, Dict[ChunkKey, dict]] = {}
+    for item in [entry for items in top_k.values() for entry in items] + list(scored):
+        key = (item["external_id"], item["chunk_id"])
+        merged.setdefault(item["source"], {})[key] = item
+    return {
+        source: sorted(items.values(), key=lambda item: item["score"], reverse=True)[:per_source]
+        for source, items in merged.items()
+    }
+
+
+def standing_results(
+    name: str,
+    query: str,
+    per_source: int,
+    embed: Callable[[str], List[float]],
+    load_all: Callable[[], Union[EmbeddingBatch, Sequence[EmbeddingRecord]]],
+    full: bool = False,
+) -> tuple[Dict[str, List[dict]], List[float]]:
+    """Return (per-source top matches, query vector) for a standing query.
+
+    `embed` is only called for a new or changed query and `load_all` only for
+    a full recompute, so an incremental run touches just the new chunks.
+    """
+    state = load_standing_query(name)
+    full = full or needs_full_refresh(state, query, per_source)
+    embedding = state.embedding if state is not None and state.query == query else embed(query)
+    high_water = max_rowid()
+
+    with stage("search.standing"):
+        chunks = load_all() if full else chunks_since(state.last_rowid)
+        top_k = merge_top_k({} if full else state.top_k, _score(chunks, embedding, per_source), per_source)
+    count("search.standing", chunks=len(chunks), full_recomputes=int(full))
+    refreshed_at = time.time() if full else state.refreshed_at
+
+    save_standing_query(
+        StandingQuery(
+            name=name,
+            query=query,
+            embedding=list(embedding),
+            per_source=per_source,
+            top_k=top_k,
+            last_rowid=high_water,
+            refreshed_at=refreshed_at,
+        )
+    )
+    return top_k, embedding
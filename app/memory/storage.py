@@ -3,16 +3,39 @@
 from __future__ import annotations
 
 import json
+import os
 import sqlite3
+import time
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterable, Iterator
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
 
+import numpy as np
+
+from ..metrics import stage
 from .models import EmbeddingRecord
 
 DATA_DIR = Path("data")
 EMBED_DB_PATH = DATA_DIR / "content_memory.sqlite"
 CONTENT_JSONL = DATA_DIR / "content_records.jsonl"
+# Embedding blobs are little-endian float32 behind this prefix; older rows hold
+# JSON text (which can never start with "F") and are still read.
+EMBEDDING_MAGIC = b"F32\x00"
+DEFAULT_EMBED_MODEL = "text-embedding-3-large"
+EMBEDDINGS_TABLE = "embeddings"
+SHADOW_TABLE = "embeddings_shadow"
+
+_migrated: set = set()
+
+
+def _seed_model() -> str:
+    """Model for a brand-new store (EMBED_MODEL).
+
+    Read on use so a value loaded from .env applies. The store pins its model
+    in index_meta on the first write; change it with
+    scripts/reindex_embeddings.py, not with this variable.
+    """
+    return os.environ.get("EMBED_MODEL", DEFAULT_EMBED_MODEL)
 
 
 def _ensure_data_dir() -> None:
@@ -44,18 +67,36 @@ def _ensure_data_dir() -> None:
 _ensure_data_dir()
 
 
+def encode_embedding(values: Sequence[float]) -> bytes:
+    return EMBEDDING_MAGIC + np.asarray(values, dtype="<f4").tobytes()
+
+
+def decode_embedding(blob: bytes) -> np.ndarray:
+    """Float32 vector from a stored blob, binary or legacy JSON."""
+    if not blob:
+        return np.zeros(0, dtype=np.float32)
+    if blob[:4] == EMBEDDING_MAGIC:
+        return np.frombuffer(blob, dtype="<f4", offset=len(EMBEDDING_MAGIC))
+    return np.asarray(json.loads(bytes(blob).decode("utf-8")), dtype=np.float32)
+
+
+def embedding_dims(blob: bytes) -> int:
+    """Vector length of a stored blob without decoding binary ones."""
+    if blob and blob[:4] == EMBEDDING_MAGIC:
+        return (len(blob) - len(EMBEDDING_MAGIC)) // 4
+    return len(decode_embedding(blob))
+
+
 def append_jsonl(records: Iterable[dict]) -> None:
     with CONTENT_JSONL.open("a", encoding="utf-8") as f:
         for record in records:
             f.write(json.dumps(record, ensure_ascii=False) + "\n")
 
 
-@contextmanager
-def embedding_db() -> Iterator[sqlite3.Connection]:
-    conn = sqlite3.connect(EMBED_DB_PATH)
+def create_embeddings_table(conn: sqlite3.Connection, table: str = EMBEDDINGS_TABLE) -> None:
     conn.execute(
-        """
-        CREATE TABLE IF NOT EXISTS embeddings (
+        f"""
+        CREATE TABLE IF NOT EXISTS {table} (
             source TEXT NOT NULL,
             external_id TEXT NOT NULL,
             chunk_id TEXT NOT NULL,
@@ -63,10 +104,73 @@ def embedding_db() -> Iterator[sqlite3.Connection]:
             text_excerpt TEXT NOT NULL,
             token_count INTEGER,
             similarity_hint TEXT,
+            model TEXT,
+            dimensions INTEGER,
+            ingested_at REAL,
             PRIMARY KEY (source, external_id, chunk_id)
         )
         """
     )
+    # Lets retention and shard fingerprints scan (source, ingested_at, rowid) without touching vector pages.
+    # Stores from before ingested_at existed get it once _migrate adds the column.
+    if any(row[1] == "ingested_at" for row in conn.execute(f"PRAGMA table_info({table})")):
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_source_time ON {table} (source, ingested_at)")
+
+
+def _migrate(conn: sqlite3.Connection) -> None:
+    """Bring stores created by older versions up to the current schema.
+
+    Old rows are tagged with EMBED_MODEL and their vector length, and get the
+    migration time as ingested_at (retention ages them from then). A store
+    with rows but no recorded model is pinned to the model its rows carry.
+    """
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({EMBEDDINGS_TABLE})")}
+    if "model" not in columns:
+        conn.execute(f"ALTER TABLE {EMBEDDINGS_TABLE} ADD COLUMN model TEXT")
+        conn.execute(f"ALTER TABLE {EMBEDDINGS_TABLE} ADD COLUMN dimensions INTEGER")
+        conn.execute(
+            f"""
+            UPDATE {EMBEDDINGS_TABLE} SET model = ?, dimensions = CASE
+                WHEN substr(embedding, 1, 4) = ? THEN (length(embedding) - 4) / 4
+                ELSE json_array_length(CAST(embedding AS TEXT)) END
+            WHERE model IS NULL
+            """,
+            (_seed_model(), EMBEDDING_MAGIC),
+        )
+    if "ingested_at" not in columns:
+        conn.execute(f"ALTER TABLE {EMBEDDINGS_TABLE} ADD COLUMN ingested_at REAL")
+        conn.execute(f"UPDATE {EMBEDDINGS_TABLE} SET ingested_at = ? WHERE ingested_at IS NULL", (time.time(),))
+    # Builds the (source, ingested_at) index now that the column exists.
+    create_embeddings_table(conn)
+    conn.execute("CREATE TABLE IF NOT EXISTS index_meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+    if get_meta(conn, "embedding_model") is None:
+        row = conn.execute(
+            f"SELECT model FROM {EMBEDDINGS_TABLE} WHERE model IS NOT NULL GROUP BY model ORDER BY COUNT(*) DESC LIMIT 1"
+        ).fetchone()
+        if row:
+            set_meta(conn, "embedding_model", {"model": row[0], "dimensions": None})
+    # Documents whose chunks moved to the cold archive (see archive.py).
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS archived_content (
+            source TEXT NOT NULL,
+            external_id TEXT NOT NULL,
+            segment_id INTEGER NOT NULL,
+            PRIMARY KEY (source, external_id)
+        )
+        """
+    )
+
+
+@contextmanager
+def embedding_db() -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(EMBED_DB_PATH)
+    create_embeddings_table(conn)
+    key = str(EMBED_DB_PATH.resolve())
+    if key not in _migrated:
+        _migrate(conn)
+        conn.commit()
+        _migrated.add(key)
     try:
         yield conn
         conn.commit()
@@ -74,35 +178,110 @@ def embedding_db() -> Iterator[sqlite3.Connection]:
         conn.close()
 
 
-def upsert_embeddings(records: Iterable[EmbeddingRecord]) -> None:
+def get_meta(conn: sqlite3.Connection, key: str) -> Optional[dict]:
+    row = conn.execute("SELECT value FROM index_meta WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def set_meta(conn: sqlite3.Connection, key: str, value: Optional[dict]) -> None:
+    if value is None:
+        conn.execute("DELETE FROM index_meta WHERE key = ?", (key,))
+        return
+    conn.execute(
+        "INSERT INTO index_meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+        (key, json.dumps(value)),
+    )
+
+
+def _active_model(conn: sqlite3.Connection) -> Tuple[str, Optional[int]]:
+    meta = get_meta(conn, "embedding_model")
+    if meta is None:
+        return _seed_model(), None
+    return meta["model"], meta.get("dimensions")
+
+
+def _active_dimensions(conn: sqlite3.Connection) -> Tuple[str, Optional[int]]:
+    """(active model, vector length of its live rows); the length is None for an empty store.
+
+    Without requested dimensions, the length the model's rows mostly have.
+    """
+    model, dimensions = _active_model(conn)
+    if dimensions is None:
+        row = conn.execute(
+            f"""
+            SELECT dimensions FROM {EMBEDDINGS_TABLE} WHERE model = ?
+            GROUP BY dimensions ORDER BY COUNT(*) DESC LIMIT 1
+            """,
+            (model,),
+        ).fetchone()
+        dimensions = row[0] if row else None
+    return model, dimensions
+
+
+def active_embedding_model() -> Tuple[str, Optional[int]]:
+    """(model, requested dimensions or None for the model default) that search and ingest must use."""
     with embedding_db() as conn:
+        return _active_model(conn)
+
+
+def upsert_embeddings(
+    records: Iterable[EmbeddingRecord],
+    model: Optional[str] = None,
+    table: str = EMBEDDINGS_TABLE,
+) -> None:
+    """Write chunk vectors produced by `model` (default: the active model).
+
+    Writing another model's vectors into the live table raises ValueError,
+    so a run that started before a switchover can't mix vector spaces.
+    """
+    now = time.time()
+    rows = [
+        (
+            rec.source,
+            rec.external_id,
+            rec.chunk_id,
+            encode_embedding(rec.embedding),
+            rec.text_excerpt,
+            rec.token_count,
+            rec.similarity_hint,
+            len(rec.embedding),
+            now,
+        )
+        for rec in records
+    ]
+    with stage("sqlite.upsert", rows=len(rows), bytes=sum(len(row[3]) for row in rows)), embedding_db() as conn:
+        active, _ = _active_model(conn)
+        model = model or active
+        if table == EMBEDDINGS_TABLE and model != active:
+            raise ValueError(f"Refusing to write {model} vectors into an index built with {active}")
+        if table == EMBEDDINGS_TABLE and rows and get_meta(conn, "embedding_model") is None:
+            # First write to a new store: pin its model so EMBED_MODEL no longer applies.
+            set_meta(conn, "embedding_model", {"model": model, "dimensions": None})
         conn.executemany(
-            """
-            INSERT INTO embeddings (source, external_id, chunk_id, embedding, text_excerpt, token_count, similarity_hint)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
+            f"""
+            INSERT INTO {table} (
+                source, external_id, chunk_id, embedding, text_excerpt, token_count, similarity_hint,
+                model, dimensions, ingested_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             ON CONFLICT(source, external_id, chunk_id) DO UPDATE SET
                 embedding=excluded.embedding,
                 text_excerpt=excluded.text_excerpt,
                 token_count=excluded.token_count,
-                similarity_hint=excluded.similarity_hint
+                similarity_hint=excluded.similarity_hint,
+                model=excluded.model,
+                dimensions=excluded.dimensions,
+                -- A new vector counts as a fresh ingest; shard fingerprints (shards.py) rely on it.
+                ingested_at=CASE WHEN embedding = excluded.embedding THEN ingested_at ELSE excluded.ingested_at END
             """,
-            [
-                (
-                    rec.source,
-                    rec.external_id,
-                    rec.chunk_id,
-                    memoryview(bytearray(json.dumps(rec.embedding), "utf-8")),
-                    rec.text_excerpt,
-                    rec.token_count,
-                    rec.similarity_hint,
-                )
-                for rec in records
-            ],
+            [row[:7] + (model,) + row[7:] for row in rows],
         )
 
 
 def known_content_keys() -> set[tuple[str, str]]:
-    """Return all known (source, external_id) pairs from the embeddings DB."""
+    """Return all known (source, external_id) pairs, hot or archived."""
     with embedding_db() as conn:
-        rows = conn.execute("SELECT DISTINCT source, external_id FROM embeddings").fetchall()
+        rows = conn.execute(
+            "SELECT DISTINCT source, external_id FROM embeddings UNION SELECT source, external_id FROM archived_content"
+        ).fetchall()
     return {(r[0], r[1]) for r in rows}
\ No newline at end of file
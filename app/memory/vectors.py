@@ -0,0 +1,50 @@
+"""NumPy helpers for working with embedding vectors in bulk."""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Dict, Iterable, Sequence, Tuple
+
+import numpy as np
+
+from .models import EmbeddingRecord
+
+DocKey = Tuple[str, str]
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to unit length (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def as_unit_vector(vector: Sequence[float]) -> np.ndarray:
+    return normalize_rows(np.asarray(vector, dtype=np.float32)[None, :])[0]
+
+
+def cosine_scores(matrix: np.ndarray, query_vector: Sequence[float], block_rows: int = 8192) -> np.ndarray:
+    """Cosine similarity of every row with the query; zero rows score 0.
+
+    Works in row blocks so temporaries stay small for large matrices.
+    """
+    query = as_unit_vector(query_vector)
+    scores = np.empty(matrix.shape[0], dtype=np.float32)
+    for start in range(0, matrix.shape[0], block_rows):
+        block = matrix[start : start + block_rows]
+        norms = np.sqrt(np.einsum("ij,ij->i", block, block))
+        norms[norms == 0] = 1.0
+        scores[start : start + block_rows] = (block @ query) / norms
+    return scores
+
+
+def document_vectors(records: Iterable[EmbeddingRecord]) -> Dict[DocKey, np.ndarray]:
+    """Unit-length centroid of each document's chunk vectors, keyed by (source, external_id)."""
+    chunks: "OrderedDict[DocKey, list]" = OrderedDict()
+    for rec in records:
+        if len(rec.embedding):
+            chunks.setdefault((rec.source, rec.external_id), []).append(rec.vector())
+    return {
+        key: as_unit_vector(np.mean(np.stack(vectors), axis=0))
+        for key, vectors in chunks.items()
+    }
@@ -0,0 +1,83 @@
+"""Lightweight per-stage timers and counters with a JSON run report.
+
+Stages are named with dots (`fetch.rss`, `embed`, `llm.ideas`) and recorded
+process-wide, so code running in worker threads reports into the same run:
+
+    with stage("embed"):
+        ...
+    count("embed", api_calls=1, tokens=usage.total_tokens)
+
+`write_report()` saves everything recorded since `start_run()` as
+`data/runs/<timestamp>_<name>.json`; scripts/run_report.py summarizes them.
+Stage seconds are summed across threads, so concurrent stages can exceed the
+run's wall time.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+RUNS_DIR = Path("data") / "runs"
+
+_lock = threading.Lock()
+_stages: Dict[str, Dict[str, float]] = {}
+_run = {"name": None, "started_at": None, "t0": None}
+
+
+def start_run(name: str) -> None:
+    """Reset recorded stages and mark the start of a run."""
+    with _lock:
+        _stages.clear()
+        _run.update(name=name, started_at=datetime.now(timezone.utc).isoformat(), t0=time.perf_counter())
+
+
+def count(name: str, **counters: float) -> None:
+    """Add to a stage's counters (items, chunks, api_calls, tokens, bytes, ...)."""
+    with _lock:
+        entry = _stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+        for key, value in counters.items():
+            entry[key] = entry.get(key, 0) + (value or 0)
+
+
+@contextmanager
+def stage(name: str, **counters: float) -> Iterator[None]:
+    """Time the block under `name`; extra counters are added on exit."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        count(name, seconds=time.perf_counter() - start, calls=1, **counters)
+
+
+def snapshot() -> Dict[str, Dict[str, float]]:
+    with _lock:
+        return {name: dict(values) for name, values in sorted(_stages.items())}
+
+
+def write_report(meta: Optional[dict] = None) -> Optional[Path]:
+    """Write the current run's report; returns its path (None if no run was started)."""
+    if _run["t0"] is None:
+        return None
+    report = {
+        "run": _run["name"],
+        "started_at": _run["started_at"],
+        "wall_seconds": round(time.perf_counter() - _run["t0"], 4),
+        "pid": os.getpid(),
+        "meta": meta or {},
+        "stages": {
+            name: {key: round(value, 4) if isinstance(value, float) else value for key, value in values.items()}
+            for name, values in snapshot().items()
+        },
+    }
+    RUNS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = RUNS_DIR / f"{stamp}_{_run['name']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
@@ -0,0 +1,120 @@
+"""Opt-in cProfile + tracemalloc capture per pipeline stage (`--profile`).
+
+Scripts call `enable_profiling(name)` when the flag is given and wrap their
+stages in `profile_stage("ingest")`. While profiling is off, `profile_stage`
+returns a shared no-op context manager, so the hooks cost nothing.
+
+When on, each stage gets under `data/profiles/<timestamp>_<name>/`:
+  <stage>.prof        cProfile stats merged across calls and threads
+                      (`snakeviz <stage>.prof`, `python -m pstats <stage>.prof`)
+  <stage>.alloc.txt   top allocation sites live at the end of the call that
+                      reached the stage's highest peak
+and `summary.json` holds calls, seconds and tracemalloc peak per stage.
+tracemalloc's peak is process-wide and is reset only when no other stage is
+running, so stages that overlap in threads share one peak.
+"""
+
+from __future__ import annotations
+
+import cProfile
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROFILES_DIR = Path("data") / "profiles"
+TOP_ALLOCATIONS = 25
+
+_NOOP = nullcontext()
+_lock = threading.Lock()
+_thread_state = threading.local()
+_active = {"stages": 0}
+_run: Dict[str, Optional[Path]] = {"dir": None}
+_profiles: Dict[str, List[cProfile.Profile]] = {}
+_summary: Dict[str, dict] = {}
+
+
+def enable_profiling(name: str) -> Path:
+    """Start capturing; returns the output directory."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out_dir = PROFILES_DIR / f"{stamp}_{name}"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    _run["dir"] = out_dir
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    return out_dir
+
+
+def profile_stage(name: str):
+    """Context manager profiling `name`; a no-op unless profiling is enabled."""
+    if _run["dir"] is None:
+        return _NOOP
+    return _profiled(name)
+
+
+def _write_allocations(name: str, snapshot: tracemalloc.Snapshot, peak: int) -> None:
+    lines = [f"stage {name}: tracemalloc peak {peak / 1e6:.1f} MB; top {TOP_ALLOCATIONS} sites live at stage end"]
+    for stat in snapshot.statistics("lineno")[:TOP_ALLOCATIONS]:
+        lines.append(f"{stat.size / 1024:>10.1f} KiB  {stat.count:>8} blocks  {stat.traceback}")
+    (_run["dir"] / f"{name}.alloc.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@contextmanager
+def _profiled(name: str):
+    # One profiler per thread at a time: nested stages are covered by the outer one.
+    if getattr(_thread_state, "active", False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    try:
+        profiler.enable()
+    except ValueError:  # another profiler owns this thread
+        yield
+        return
+    _thread_state.active = True
+    with _lock:
+        # Resetting while another thread's stage runs would wipe its peak.
+        if _active["stages"] == 0:
+            tracemalloc.reset_peak()
+        _active["stages"] += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        _thread_state.active = False
+        seconds = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        with _lock:
+            _active["stages"] -= 1
+            _profiles.setdefault(name, []).append(profiler)
+            entry = _summary.setdefault(name, {"calls": 0, "seconds": 0.0, "peak_bytes": 0})
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            new_peak = peak > entry["peak_bytes"]
+            entry["peak_bytes"] = max(entry["peak_bytes"], peak)
+        if new_peak:
+            _write_allocations(name, tracemalloc.take_snapshot(), peak)
+
+
+def finish_profiling() -> Optional[Path]:
+    """Write merged stats and the summary; returns the directory (None if profiling was off)."""
+    out_dir = _run["dir"]
+    if out_dir is None:
+        return None
+    with _lock:
+        for name, profiles in _profiles.items():
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            stats.dump_stats(str(out_dir / f"{name}.prof"))
+        summary = {name: {**entry, "seconds": round(entry["seconds"], 4)} for name, entry in _summary.items()}
+    (out_dir / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    tracemalloc.stop()
+    _run["dir"] = None
+    return out_dir
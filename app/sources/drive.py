@@ -1,7 +1,13 @@
 import io
 import os
-from typing import Dict, Iterable, List, Optional
-
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import google_auth_httplib2
+import httplib2
+from google.auth.credentials import AnonymousCredentials
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
@@ -11,6 +17,10 @@ DRIVE_SCOPES = [
     "https://www.googleapis.com/auth/drive.file",
 ]
 
+_folder_cache: Dict[str, Dict[str, str]] = {}
+_folder_cache_lock = threading.Lock()
+_thread_local = threading.local()
+
 def get_file_metadata(file_id: str) -> dict:
     service = _drive_service()
     return service.files().get(
@@ -19,8 +29,20 @@ def get_file_metadata(file_id: str) -> dict:
         supportsAllDrives=True,
     ).execute()
 
-def _drive_service():
-    creds = Credentials(
+def _api_endpoint() -> Optional[str]:
+    """DRIVE_API_ENDPOINT points at a local stand-in (e.g. scripts/fake_drive_server.py) to run offline.
+
+    Read when the service is built rather than at import, so a value loaded
+    from .env by load_dotenv() is honoured.
+    """
+    return os.environ.get("DRIVE_API_ENDPOINT") or None
+
+
+@lru_cache(maxsize=1)
+def _credentials():
+    if _api_endpoint():
+        return AnonymousCredentials()
+    return Credentials(
         token=None,
         refresh_token=os.environ["GOOGLE_REFRESH_TOKEN"],
         token_uri="https://oauth2.googleapis.com/token",
@@ -28,9 +50,42 @@ def _drive_service():
         client_secret=os.environ["GOOGLE_CLIENT_SECRET"],
         scopes=DRIVE_SCOPES,
     )
-    return build("drive", "v3", credentials=creds)
+
+
+@lru_cache(maxsize=1)
+def _drive_service():
+    """Build the Drive client once per process.
+
+    The service object is only a request factory; the httplib2 transport it
+    wraps is not thread-safe, so worker threads execute requests through
+    `_thread_http()` instead of the service's own connection.
+    """
+    endpoint = _api_endpoint()
+    client_options = {"api_endpoint": endpoint} if endpoint else None
+    return build(
+        "drive",
+        "v3",
+        credentials=_credentials(),
+        client_options=client_options,
+        cache_discovery=False,
+    )
+
+
+def _thread_http() -> google_auth_httplib2.AuthorizedHttp:
+    http = getattr(_thread_local, "http", None)
+    if http is None:
+        http = google_auth_httplib2.AuthorizedHttp(_credentials(), http=httplib2.Http(timeout=60))
+        _thread_local.http = http
+    return http
+
 
 def list_child_folders(parent_folder_id: str) -> Dict[str, str]:
+    """Return {folder name: folder id} for `parent_folder_id`, cached per process."""
+    with _folder_cache_lock:
+        cached = _folder_cache.get(parent_folder_id)
+    if cached is not None:
+        return dict(cached)
+
     service = _drive_service()
     q = (
         f"'{parent_folder_id}' in parents and "
@@ -58,12 +113,17 @@ def list_child_folders(parent_folder_id: str) -> Dict[str, str]:
         if not page_token:
             break
 
+    with _folder_cache_lock:
+        _folder_cache[parent_folder_id] = dict(out)
     return out
 
 
-def list_txt_files(folder_id: str) -> List[dict]:
+def list_txt_files(folder_id: str, modified_since: Optional[str] = None) -> List[dict]:
+    """List text/plain files in a folder, optionally only those with modifiedTime >= `modified_since`."""
     service = _drive_service()
     q = f"'{folder_id}' in parents and mimeType='text/plain' and trashed=false"
+    if modified_since:
+        q += f" and modifiedTime >= '{modified_since}'"
 
     files: List[dict] = []
     page_token: Optional[str] = None
@@ -71,7 +131,7 @@ def list_txt_files(folder_id: str) -> List[dict]:
     while True:
         resp = service.files().list(
             q=q,
-            fields="nextPageToken, files(id, name, modifiedTime, createdTime, size)",
+            fields="nextPageToken, files(id, name, modifiedTime, createdTime, size, md5Checksum)",
             pageToken=page_token,
             pageSize=200,
             supportsAllDrives=True,
@@ -119,9 +179,10 @@ def list_files(folder_id: str, mime_types: Optional[Iterable[str]] = None) -> Li
 
 
 def download_file(file_id: str, destination_path: str) -> None:
-    """Download any Drive file to the given local path."""
+    """Download any Drive file to the given local path. Safe to call from worker threads."""
     service = _drive_service()
     request = service.files().get_media(fileId=file_id)
+    request.http = _thread_http()
     with open(destination_path, "wb") as fh:
         downloader = MediaIoBaseDownload(fh, request)
         done = False
@@ -130,7 +191,7 @@ def download_file(file_id: str, destination_path: str) -> None:
 
 
 def upload_text_file(folder_id: str, filename: str, content: str) -> dict:
-    """Upload a UTF-8 text file into the specified Drive folder."""
+    """Upload a UTF-8 text file into the specified Drive folder. Safe to call from worker threads."""
     service = _drive_service()
     media_body = MediaIoBaseUpload(io.BytesIO(content.encode("utf-8")), mimetype="text/plain")
     file_metadata = {
@@ -141,15 +202,29 @@ def upload_text_file(folder_id: str, filename: str, content: str) -> dict:
         body=file_metadata,
         media_body=media_body,
         fields="id,name,modifiedTime",
-    ).execute()
+    ).execute(http=_thread_http())
 
 def download_text(file_id: str) -> str:
-    """Download a text/plain file content."""
+    """Download a text/plain file content. Safe to call from worker threads."""
     service = _drive_service()
-    data = service.files().get_media(fileId=file_id).execute()  # bytes
+    data = service.files().get_media(fileId=file_id).execute(http=_thread_http())  # bytes
     return data.decode("utf-8", errors="replace")
 
 
+def download_texts(file_ids: Sequence[str], max_workers: Optional[int] = None) -> List[str]:
+    """Download several text files concurrently, returned in `file_ids` order.
+
+    `max_workers` defaults to DRIVE_DOWNLOAD_WORKERS (8).
+    """
+    if not file_ids:
+        return []
+    if max_workers is None:
+        max_workers = int(os.environ.get("DRIVE_DOWNLOAD_WORKERS", "8"))
+    workers = max(1, min(max_workers, len(file_ids)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(download_text, file_ids))
+
+
 def load_transcripts_from_root(root_folder_id: str, transcripts_folder_name: str) -> List[dict]:
     """Find transcripts folder by name under root, then download all .txt transcripts."""
     folders = list_child_folders(root_folder_id)
@@ -162,12 +237,14 @@ def load_transcripts_from_root(root_folder_id: str, transcripts_folder_name: str
     transcripts_id = folders[transcripts_folder_name]
     txt_files = list_txt_files(transcripts_id)
 
+    texts = download_texts([f["id"] for f in txt_files])
+
     out: List[dict] = []
-    for f in txt_files:
+    for f, text in zip(txt_files, texts):
         out.append({
             "id": f["id"],
             "name": f["name"],
             "modifiedTime": f.get("modifiedTime"),
-            "text": download_text(f["id"]),
+            "text": text,
         })
     return out
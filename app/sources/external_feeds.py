@@ -2,8 +2,17 @@
 
 Edit this list to add/remove sources. Each entry should be a tuple of
 (label, feed_url). Labels are used as the `source` field in ContentRecord.
+Set `EXTERNAL_FEEDS_PATH` to a JSON file of [label, feed_url] pairs to
+replace the list (e.g. for replay/load tests); `external_feeds()` applies it.
+
+`FEED_POLL_HOURS` optionally declares how often a feed is worth polling;
+feeds without an entry get an interval learned from their yield (see
+app/sources/registry.py).
 """
 
+import json
+import os
+
 EXTERNAL_FEEDS = [
     ("hackernews", "https://hnrss.org/frontpage"),
     ("techmeme", "https://www.techmeme.com/feed.xml"),
@@ -37,3 +46,29 @@ EXTERNAL_FEEDS = [
     # Add industry/vertical feeds here, e.g.:
     # ("smb_lending_news", "https://example.com/smb-lending.rss"),
 ]
+
+# Minimum hours between polls. Fast-moving aggregators can be polled hourly;
+# low-volume blogs are left to the adaptive scheduler.
+FEED_POLL_HOURS = {
+    "hackernews": 1,
+    "techmeme": 1,
+    "cnbc_top_news": 1,
+    "cnbc_business": 1,
+    "cnbc_markets": 1,
+    "wsj_us_business": 2,
+    "wsj_markets_main": 2,
+    "ft_home": 2,
+    "ft_markets": 2,
+}
+
+
+def external_feeds() -> list[tuple[str, str]]:
+    """The feeds to scan: `EXTERNAL_FEEDS`, or the `EXTERNAL_FEEDS_PATH` file if set.
+
+    Read on use so a value loaded from .env applies.
+    """
+    path = os.environ.get("EXTERNAL_FEEDS_PATH")
+    if not path:
+        return list(EXTERNAL_FEEDS)
+    with open(path, "r", encoding="utf-8") as f:
+        return [(label, url) for label, url in json.load(f)]
@@ -0,0 +1,162 @@
+"""Shared HTML-to-text extraction for feed and WordPress bodies.
+
+The markup is walked once, in batches of about 32K characters: skipped
+subtrees (script/style/nav...) and comments are dropped on the way, then
+each batch gets one regex pass apiece to turn block-level tags into
+paragraph breaks (kept as blank lines for the chunker), inline tags into
+spaces and entities such as `&amp;` and `&#8217;` into text. Python-level
+work is per batch rather than per tag, and only one batch plus the output
+is held at a time.
+"""
+
+from __future__ import annotations
+
+import html
+import re
+from typing import Dict, Iterator, List
+
+# Tags whose whole subtree carries no readable content.
+SKIP_TAGS = frozenset({"script", "style", "nav", "noscript", "template", "svg", "iframe", "head"})
+
+# Tags that start/end a paragraph of text.
+BLOCK_TAGS = frozenset(
+    {
+        "address", "article", "aside", "blockquote", "br", "dd", "details", "div", "dl", "dt",
+        "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6",
+        "header", "hr", "li", "main", "ol", "p", "pre", "section", "table", "td", "th", "tr", "ul",
+    }
+)
+
+def _alternation(words) -> str:
+    """Regex alternation for `words` nested by shared prefix, so each "<" tries a few branches, not all."""
+    groups: Dict[str, List[str]] = {}
+    for word in words:
+        groups.setdefault(word[0], []).append(word[1:])
+    branches = []
+    for first, rests in sorted(groups.items()):
+        inner = _alternation([rest for rest in rests if rest])
+        if not inner:
+            branches.append(re.escape(first))
+        else:
+            branches.append(re.escape(first) + (f"(?:{inner})?" if "" in rests else f"(?:{inner})"))
+    return "|".join(branches)
+
+
+def _names(tags) -> str:
+    # lower, UPPER and Capitalized spellings: a case-sensitive pattern runs
+    # several times faster than re.I.
+    return _alternation({spelling for tag in tags for spelling in (tag, tag.upper(), tag.capitalize())})
+
+
+# Skipped subtrees and comments, matched against a lowercased copy of the
+# markup. This is the only per-match Python loop, and these tags are rare.
+_SKIP_RE = re.compile(rf"<({'|'.join(SKIP_TAGS)})(?=[\s/>])[^>]*>|<!--.*?-->", re.S)
+_SKIP_RE_I = re.compile(_SKIP_RE.pattern, re.S | re.I)
+_SKIP_END_RE = {tag: re.compile(rf"</{tag}\s*>", re.I) for tag in SKIP_TAGS}
+_BLOCK_RE = re.compile(rf"</?(?:{_names(BLOCK_TAGS)})(?=[\s/>])[^>]*>")
+# Any other element tag, doctype or processing instruction. A bare "<" in text is left alone.
+_INLINE_RE = re.compile(r"<(?:/?[A-Za-z][A-Za-z0-9:-]*|[!?])[^>]*>")
+# Same grammar as `html.unescape`; split out so the handful of references
+# WordPress emits are decoded by dict lookup.
+_ENTITY_RE = re.compile(r"(&(?:#[0-9]+;?|#[xX][0-9a-fA-F]+;?|[^\t\n\f <&#;]{1,32};?))")
+_ENTITIES: Dict[str, str] = {}
+
+# Paragraph marker in the stripped text; NULs are dropped from the input first.
+_BREAK = "\x00"
+# Markup handled per batch. Batches are cut just before a "<", which no tag,
+# comment or entity can straddle.
+_BATCH_CHARS = 32 * 1024
+
+
+def _decode_entities(text: str) -> str:
+    pieces = _ENTITY_RE.split(text)
+    refs = pieces[1::2]
+    if len(_ENTITIES) > 4096:
+        _ENTITIES.clear()
+    known = _ENTITIES.get
+    pieces[1::2] = [known(ref) or _ENTITIES.setdefault(ref, html.unescape(ref)) for ref in refs]
+    return "".join(pieces)
+
+
+def _fragments(markup: str) -> List[str]:
+    """Text of a batch split at block tags, with inline tags as spaces and entities decoded."""
+    if "<" in markup:
+        # Spaces keep words apart across tags ("<td>a</td><td>b</td>").
+        markup = _INLINE_RE.sub(" ", _BLOCK_RE.sub(_BREAK, markup))
+    if "&" in markup:
+        markup = _decode_entities(markup)
+    return markup.split(_BREAK)
+
+
+def _batches(markup: str) -> Iterator[str]:
+    """Yield the markup outside skipped subtrees and comments, about _BATCH_CHARS at a time."""
+    lowered = markup.lower()
+    if len(lowered) == len(markup):
+        matches = _SKIP_RE.finditer(lowered)
+    else:
+        # A few non-ASCII characters change length when lowercased; positions must line up.
+        lowered = markup
+        matches = _SKIP_RE_I.finditer(markup)
+
+    parts: List[str] = []
+    buffered = 0
+    pos = 0
+    for match in matches:
+        start = match.start()
+        if start < pos:
+            # Inside a skipped subtree; no match can run past its end tag.
+            continue
+        parts.append(markup[pos:start])
+        parts.append(" ")
+        buffered += start - pos
+        pos = match.end()
+        name = match.group(1)
+        if name and not match.group(0).endswith("/>"):
+            end = _SKIP_END_RE[name.lower()].search(lowered, pos)
+            pos = end.end() if end else len(markup)
+        if buffered >= _BATCH_CHARS:
+            yield "".join(parts)
+            parts.clear()
+            buffered = 0
+    del lowered
+
+    # The tail (often the whole document) is cut at tag starts.
+    while pos < len(markup):
+        cut = markup.find("<", pos + max(_BATCH_CHARS - buffered, 1))
+        cut = len(markup) if cut < 0 else cut
+        parts.append(markup[pos:cut])
+        yield "".join(parts)
+        parts.clear()
+        buffered = 0
+        pos = cut
+    if parts:
+        yield "".join(parts)
+
+
+def html_to_text(markup: str) -> str:
+    """Return readable text for `markup`, paragraphs separated by blank lines."""
+    if not markup:
+        return ""
+    if _BREAK in markup:
+        markup = markup.replace(_BREAK, "")
+
+    paragraphs: List[str] = []
+    # Fragments of the paragraph still open at the end of the last batch.
+    open_paragraph: List[str] = []
+    for batch in _batches(markup):
+        fragments = _fragments(batch)
+        open_paragraph.append(fragments[0])
+        if len(fragments) == 1:
+            continue
+        fragments[0] = "".join(open_paragraph)
+        open_paragraph = [fragments.pop()]
+        paragraphs.extend(" ".join(text.split()) for text in fragments if text and not text.isspace())
+    text = " ".join("".join(open_paragraph).split())
+    if text:
+        paragraphs.append(text)
+    return "\n\n".join(paragraphs)
+
+
+def html_to_line(markup: str) -> str:
+    """Single-line variant for titles and other short fields."""
+    return " ".join(html_to_text(markup).split())
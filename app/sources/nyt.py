@@ -3,14 +3,176 @@
 This module intentionally does NOT attempt to scrape full paywalled article
 text. It uses only the NYT APIs and returns reliable metadata: headline,
 abstract/snippet, and link.
+
+All requests go through one pooled `httpx.Client` and a token bucket sized
+to NYT's per-minute quota (5 requests/minute by default). 429s and 5xx
+responses are retried with jittered exponential backoff, and successful
+responses are cached on disk for `NYT_CACHE_TTL` seconds so re-runs inside
+that window make no API calls. Article Search reads the hit count from the
+first page and fetches the remaining pages that exist concurrently.
 """
 
 from __future__ import annotations
 
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
 import httpx
 
-TIMES_WIRE_URL = "https://api.nytimes.com/svc/news/v3/content/all/{section}.json"
-ARTICLE_SEARCH_URL = "https://api.nytimes.com/svc/search/v2/articlesearch.json"
+from ..metrics import count, stage
+
+TIMES_WIRE_PATH = "/svc/news/v3/content/all/{section}.json"
+ARTICLE_SEARCH_PATH = "/svc/search/v2/articlesearch.json"
+ARTICLE_SEARCH_PAGE_SIZE = 10  # NYT paginates 10 per page
+
+CACHE_DIR = Path("data") / "cache" / "nyt"
+MAX_RETRIES = 5
+BACKOFF_BASE_S = 2.0
+BACKOFF_MAX_S = 60.0
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+# Settings are read on use, not at import, so values loaded from .env by the
+# scripts' load_dotenv() take effect.
+def _api_base() -> str:
+    # NYT_API_BASE points the client at a stand-in server (see benchmarks/replay.py).
+    return os.environ.get("NYT_API_BASE", "https://api.nytimes.com").rstrip("/")
+
+
+def _cache_ttl_s() -> int:
+    return int(os.environ.get("NYT_CACHE_TTL", "3600"))
+
+
+def _requests_per_minute() -> int:
+    return int(os.environ.get("NYT_REQUESTS_PER_MINUTE", "5"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `capacity` tokens refilled over `period_s`."""
+
+    def __init__(self, capacity: int, period_s: float = 60.0) -> None:
+        self.capacity = max(1, capacity)
+        self.rate = self.capacity / period_s
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait_s = (1 - self._tokens) / self.rate
+            time.sleep(wait_s)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reports we are over quota."""
+        with self._lock:
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+
+
+_rate_limiter: Optional[TokenBucket] = None
+_client: Optional[httpx.Client] = None
+_client_lock = threading.Lock()
+
+
+def _limiter() -> TokenBucket:
+    global _rate_limiter
+    with _client_lock:
+        if _rate_limiter is None:
+            _rate_limiter = TokenBucket(_requests_per_minute())
+        return _rate_limiter
+
+
+def _http_client() -> httpx.Client:
+    global _client
+    with _client_lock:
+        if _client is None:
+            connections = _requests_per_minute()
+            _client = httpx.Client(
+                timeout=15,
+                limits=httpx.Limits(max_connections=connections, max_keepalive_connections=connections),
+            )
+        return _client
+
+
+def _cache_path(url: str, params: dict) -> Path:
+    # The API key is deliberately left out of the cache key.
+    key_params = {k: v for k, v in params.items() if k != "api-key"}
+    digest = hashlib.sha1(json.dumps([url, key_params], sort_keys=True).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _read_cache(path: Path) -> Optional[dict]:
+    ttl_s = _cache_ttl_s()
+    if ttl_s <= 0 or not path.exists():
+        return None
+    if time.time() - path.stat().st_mtime > ttl_s:
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _write_cache(path: Path, data: dict) -> None:
+    if _cache_ttl_s() <= 0:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+    tmp_path.write_text(json.dumps(data), encoding="utf-8")
+    tmp_path.replace(path)
+
+
+def _backoff_seconds(attempt: int, resp: Optional[httpx.Response]) -> float:
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after and retry_after.isdigit():
+        # Capped so a bogus or very long Retry-After can't stall the scan.
+        return min(float(retry_after), BACKOFF_MAX_S)
+    # Full jitter: spreads concurrent callers so they don't retry in lockstep.
+    return random.uniform(0, min(BACKOFF_MAX_S, BACKOFF_BASE_S * (2**attempt)))
+
+
+def _get_json(url: str, params: dict) -> dict:
+    cache_path = _cache_path(url, params)
+    cached = _read_cache(cache_path)
+    if cached is not None:
+        return cached
+
+    client = _http_client()
+    limiter = _limiter()
+    for attempt in range(MAX_RETRIES + 1):
+        limiter.acquire()
+        resp: Optional[httpx.Response] = None
+        try:
+            with stage("http.nyt"):
+                resp = client.get(url, params=params)
+        except httpx.TransportError:
+            if attempt == MAX_RETRIES:
+                raise
+        else:
+            count("http.nyt", bytes=len(resp.content))
+            if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                resp.raise_for_status()
+                data = resp.json()
+                _write_cache(cache_path, data)
+                return data
+            if resp.status_code == 429:
+                limiter.drain()
+        time.sleep(_backoff_seconds(attempt, resp))
+    raise RuntimeError(f"NYT request failed after {MAX_RETRIES} retries: {url}")
 
 
 def fetch_times_wire(api_key: str, section: str = "business", limit: int = 20) -> list[dict]:
@@ -18,11 +180,8 @@ def fetch_times_wire(api_key: str, section: str = "business", limit: int = 20) -
         "api-key": api_key,
         "limit": limit,
     }
-    url = TIMES_WIRE_URL.format(section=section)
-    with httpx.Client(timeout=15) as client:
-        resp = client.get(url, params=params)
-        resp.raise_for_status()
-        data = resp.json()
+    url = _api_base() + TIMES_WIRE_PATH.format(section=section)
+    data = _get_json(url, params)
     out: list[dict] = []
     for item in data.get("results", [])[:limit]:
         abstract = item.get("abstract") or ""
@@ -52,40 +211,46 @@ def fetch_article_search(
         "api-key": api_key,
         "q": query,
         "sort": "newest",
-        "page": 0,
     }
     if section_filter:
         params["fq"] = f'section_name:("{section_filter}")'
 
+    url = _api_base() + ARTICLE_SEARCH_PATH
+    pages = max(1, -(-limit // ARTICLE_SEARCH_PAGE_SIZE))
+
+    # Page 0 reports the total hits, so only pages that exist are requested;
+    # those go out together, paced by the shared token bucket.
+    first = _get_json(url, {**params, "page": 0})
+    hits = ((first.get("response") or {}).get("meta") or {}).get("hits")
+    if hits is not None:
+        pages = min(pages, max(1, -(-int(hits) // ARTICLE_SEARCH_PAGE_SIZE)))
+    responses = [first]
+    if pages > 1:
+        with ThreadPoolExecutor(max_workers=min(pages - 1, _requests_per_minute())) as pool:
+            responses += pool.map(lambda page: _get_json(url, {**params, "page": page}), range(1, pages))
+
     out: list[dict] = []
-    with httpx.Client(timeout=15) as client:
-        while len(out) < limit:
-            params["page"] = len(out) // 10  # NYT paginates 10 per page
-            resp = client.get(ARTICLE_SEARCH_URL, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            docs = (data.get("response") or {}).get("docs") or []
-            if not docs:
-                break
-            for doc in docs:
-                summary = doc.get("abstract") or (doc.get("snippet") or "")
-                text = doc.get("lead_paragraph") or summary
-                out.append(
-                    {
-                        "title": (doc.get("headline") or {}).get("main", ""),
-                        "url": doc.get("web_url"),
-                        "published": doc.get("pub_date"),
-                        "summary": summary,
-                        "text": text,
-                        "section": doc.get("section_name"),
-                        "subsection": doc.get("subsection_name"),
-                        "source_type": "article_search",
-                        "paywalled": True,
-                    }
-                )
-                if len(out) >= limit:
-                    break
-            # Stop if fewer than 10 returned (end of results)
-            if len(docs) < 10:
-                break
+    for data in responses:
+        docs = (data.get("response") or {}).get("docs") or []
+        for doc in docs:
+            summary = doc.get("abstract") or (doc.get("snippet") or "")
+            text = doc.get("lead_paragraph") or summary
+            out.append(
+                {
+                    "title": (doc.get("headline") or {}).get("main", ""),
+                    "url": doc.get("web_url"),
+                    "published": doc.get("pub_date"),
+                    "summary": summary,
+                    "text": text,
+                    "section": doc.get("section_name"),
+                    "subsection": doc.get("subsection_name"),
+                    "source_type": "article_search",
+                    "paywalled": True,
+                }
+            )
+            if len(out) >= limit:
+                return out
+        # Stop if fewer than 10 returned (end of results)
+        if len(docs) < ARTICLE_SEARCH_PAGE_SIZE:
+            break
     return out
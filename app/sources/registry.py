@@ -0,0 +1,167 @@
+"""Per-feed poll scheduling built on `external_feeds()`.
+
+Each feed has a poll interval: declared in `FEED_POLL_HOURS` or, if not
+declared, learned from its yield (new items per fetch). Feeds that come back
+with nothing new back off toward `MAX_INTERVAL_H`; feeds that keep yielding
+tighten back toward their floor. State lives in `data/feed_schedule.json`.
+
+Items found by the hourly poller are not ingested directly: they wait in
+`data/poll_queue.jsonl` until the next daily scan claims them, so they
+still count as that digest's new items.
+"""
+
+from __future__ import annotations
+
+import json
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .external_feeds import FEED_POLL_HOURS, external_feeds
+
+SCHEDULE_PATH = Path("data") / "feed_schedule.json"
+POLL_QUEUE_PATH = Path("data") / "poll_queue.jsonl"
+# The queue as claimed by a daily scan; kept until its items are stored, so a
+# failed run hands them to the next one.
+CLAIMED_QUEUE_PATH = POLL_QUEUE_PATH.with_suffix(".claimed.jsonl")
+
+DEFAULT_INTERVAL_H = 6.0
+MIN_INTERVAL_H = 1.0
+MAX_INTERVAL_H = 72.0
+BACKOFF_FACTOR = 1.5
+SPEEDUP_FACTOR = 0.75
+YIELD_EMA_ALPHA = 0.3
+
+
+@dataclass(frozen=True)
+class FeedSource:
+    label: str
+    url: str
+    declared_interval_h: Optional[float] = None
+
+    @property
+    def floor_h(self) -> float:
+        return self.declared_interval_h or MIN_INTERVAL_H
+
+
+def feed_sources() -> List[FeedSource]:
+    return [FeedSource(label, url, FEED_POLL_HOURS.get(label)) for label, url in external_feeds()]
+
+
+def load_schedule() -> Dict[str, dict]:
+    if not SCHEDULE_PATH.exists():
+        return {}
+    with SCHEDULE_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_schedule(schedule: Dict[str, dict]) -> None:
+    SCHEDULE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = SCHEDULE_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(schedule, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(SCHEDULE_PATH)
+
+
+def _state(schedule: Dict[str, dict], source: FeedSource) -> dict:
+    return schedule.get(source.label) or {
+        "interval_h": source.declared_interval_h or DEFAULT_INTERVAL_H,
+        "last_fetch": None,
+        "fetches": 0,
+        "new_items": 0,
+        "yield_ema": None,
+    }
+
+
+def due_sources(sources: Iterable[FeedSource], now: Optional[float] = None) -> List[FeedSource]:
+    """Return the sources whose next poll time has passed (never-fetched ones are always due)."""
+    now = time.time() if now is None else now
+    schedule = load_schedule()
+    due: List[FeedSource] = []
+    for source in sources:
+        state = _state(schedule, source)
+        if state["last_fetch"] is None or now - state["last_fetch"] >= state["interval_h"] * 3600:
+            due.append(source)
+    return due
+
+
+def record_fetches(yields: Dict[str, int], now: Optional[float] = None) -> None:
+    """Record new-item counts for fetched feeds (label -> new items) and adapt their intervals."""
+    now = time.time() if now is None else now
+    by_label = {source.label: source for source in feed_sources()}
+    schedule = load_schedule()
+    for label, new_items in yields.items():
+        source = by_label.get(label)
+        if source is None:
+            continue
+        state = _state(schedule, source)
+        prev_ema = state["yield_ema"]
+        state["yield_ema"] = new_items if prev_ema is None else (
+            YIELD_EMA_ALPHA * new_items + (1 - YIELD_EMA_ALPHA) * prev_ema
+        )
+        if new_items == 0:
+            interval = state["interval_h"] * BACKOFF_FACTOR
+        else:
+            interval = state["interval_h"] * SPEEDUP_FACTOR
+        state["interval_h"] = round(min(MAX_INTERVAL_H, max(source.floor_h, interval)), 2)
+        state["last_fetch"] = now
+        state["fetches"] += 1
+        state["new_items"] += new_items
+        schedule[label] = state
+    save_schedule(schedule)
+
+
+def _read_queue(path: Path) -> List[dict]:
+    if not path.exists():
+        return []
+    with path.open("r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def queue_polled(label: str, items: List[dict], now: Optional[float] = None) -> None:
+    """Queue one poll of `label` (its new items as JSON records) for the next daily scan."""
+    entry = {"label": label, "polled_at": time.time() if now is None else now, "items": items}
+    POLL_QUEUE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with POLL_QUEUE_PATH.open("a", encoding="utf-8") as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def queued_keys() -> Set[Tuple[str, str]]:
+    """(source, external_id) of every queued item, claimed or not."""
+    return {
+        (item["source"], item["external_id"])
+        for path in (CLAIMED_QUEUE_PATH, POLL_QUEUE_PATH)
+        for entry in _read_queue(path)
+        for item in entry["items"]
+    }
+
+
+def claim_polled() -> Tuple[List[dict], Set[str]]:
+    """Take the queue for a daily scan: (queued items, labels of the feeds polled).
+
+    Call `release_polled()` once the items are stored.
+    """
+    entries = _read_queue(CLAIMED_QUEUE_PATH)
+    if POLL_QUEUE_PATH.exists():
+        # Move the queue aside first so polls appended meanwhile start a new one.
+        taken = POLL_QUEUE_PATH.with_suffix(".taking")
+        POLL_QUEUE_PATH.replace(taken)
+        # After anything left by a run that failed before storing.
+        entries += _read_queue(taken)
+        tmp_path = CLAIMED_QUEUE_PATH.with_suffix(".tmp")
+        tmp_path.write_text("".join(json.dumps(e, ensure_ascii=False) + "\n" for e in entries), encoding="utf-8")
+        tmp_path.replace(CLAIMED_QUEUE_PATH)
+        taken.unlink()
+    items: List[dict] = []
+    seen: Set[Tuple[str, str]] = set()
+    for entry in entries:
+        for item in entry["items"]:
+            key = (item["source"], item["external_id"])
+            if key not in seen:
+                seen.add(key)
+                items.append(item)
+    return items, {entry["label"] for entry in entries}
+
+
+def release_polled() -> None:
+    CLAIMED_QUEUE_PATH.unlink(missing_ok=True)
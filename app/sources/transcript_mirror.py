@@ -0,0 +1,110 @@
+"""Local mirror of the Drive transcripts folder.
+
+Transcripts are kept under `data/transcripts/<file id>.txt` with a
+`manifest.json` recording each file's name, modifiedTime and md5Checksum,
+plus a cursor (the newest modifiedTime seen). A sync lists only files with
+`modifiedTime >= cursor` and downloads those whose checksum changed, so
+unchanged transcripts cost no downloads at all. `full=True` lists the whole
+folder instead, which also drops mirror entries deleted from Drive.
+"""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .drive import download_texts, list_child_folders, list_txt_files
+
+MIRROR_DIR = Path("data") / "transcripts"
+MANIFEST_PATH = MIRROR_DIR / "manifest.json"
+
+
+def _load_manifest() -> dict:
+    if not MANIFEST_PATH.exists():
+        return {"folders": {}, "cursor": None, "files": {}}
+    with MANIFEST_PATH.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _save_manifest(manifest: dict) -> None:
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    tmp_path = MANIFEST_PATH.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+    tmp_path.replace(MANIFEST_PATH)
+
+
+def _folder_id(manifest: dict, root_folder_id: str, folder_name: str) -> str:
+    key = f"{root_folder_id}/{folder_name}"
+    cached = manifest["folders"].get(key)
+    if cached:
+        return cached
+    folders = list_child_folders(root_folder_id)
+    if folder_name not in folders:
+        raise RuntimeError(
+            f"Transcripts folder '{folder_name}' not found under root {root_folder_id}. "
+            f"Found folders: {list(folders.keys())}"
+        )
+    manifest["folders"][key] = folders[folder_name]
+    return folders[folder_name]
+
+
+def _is_unchanged(entry: Optional[dict], remote: dict) -> bool:
+    if not entry or not (MIRROR_DIR / entry["path"]).exists():
+        return False
+    if remote.get("md5Checksum") and entry.get("md5Checksum"):
+        return remote["md5Checksum"] == entry["md5Checksum"]
+    return remote.get("modifiedTime") == entry.get("modifiedTime")
+
+
+def sync_transcripts(root_folder_id: str, folder_name: str, full: bool = False) -> dict:
+    """Bring the local mirror up to date. Returns counts of listed/downloaded/removed files."""
+    manifest = _load_manifest()
+    folder_id = _folder_id(manifest, root_folder_id, folder_name)
+    files: Dict[str, dict] = manifest["files"]
+
+    remote = list_txt_files(folder_id, modified_since=None if full else manifest.get("cursor"))
+    changed = [f for f in remote if not _is_unchanged(files.get(f["id"]), f)]
+
+    removed = 0
+    if full:
+        remote_ids = {f["id"] for f in remote}
+        for file_id in [fid for fid in files if fid not in remote_ids]:
+            (MIRROR_DIR / files.pop(file_id)["path"]).unlink(missing_ok=True)
+            removed += 1
+
+    MIRROR_DIR.mkdir(parents=True, exist_ok=True)
+    texts = download_texts([f["id"] for f in changed])
+    for f, text in zip(changed, texts):
+        rel_path = f"{f['id']}.txt"
+        (MIRROR_DIR / rel_path).write_text(text, encoding="utf-8")
+        files[f["id"]] = {
+            "name": f["name"],
+            "modifiedTime": f.get("modifiedTime"),
+            "md5Checksum": f.get("md5Checksum"),
+            "path": rel_path,
+        }
+
+    modified_times = [f["modifiedTime"] for f in remote if f.get("modifiedTime")]
+    if modified_times:
+        manifest["cursor"] = max([manifest.get("cursor") or "", *modified_times])
+    _save_manifest(manifest)
+    return {"listed": len(remote), "downloaded": len(changed), "removed": removed}
+
+
+def load_mirrored_transcripts() -> List[dict]:
+    """Return mirrored transcripts shaped like `load_transcripts_from_root` output."""
+    manifest = _load_manifest()
+    out: List[dict] = []
+    for file_id, entry in manifest["files"].items():
+        path = MIRROR_DIR / entry["path"]
+        if not path.exists():
+            continue
+        out.append({
+            "id": file_id,
+            "name": entry["name"],
+            "modifiedTime": entry.get("modifiedTime"),
+            "text": path.read_text(encoding="utf-8"),
+        })
+    out.sort(key=lambda x: x.get("modifiedTime") or "", reverse=True)
+    return out
@@ -1,13 +1,8 @@
-import re
 import requests
 from typing import List, Optional
 
-
-def _strip_html(html: str) -> str:
-    # Simple HTML tag stripper (good enough for excerpts/content)
-    text = re.sub(r"<[^>]+>", " ", html or "")
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+from ..metrics import count, stage
+from .html_text import html_to_line, html_to_text
 
 
 def fetch_wp_posts(
@@ -15,7 +10,9 @@ def fetch_wp_posts(
     per_page: int = 20,
     page: int = 1,
     timeout_s: int = 20,
+    extract: bool = True,
 ) -> List[dict]:
+    """Fetch one page of posts; `extract=False` returns the raw API items (HTML unconverted)."""
     url = f"{base_url.rstrip('/')}/wp-json/wp/v2/posts"
     params = {
         "per_page": per_page,
@@ -32,39 +29,47 @@ def fetch_wp_posts(
         "Accept-Language": "en-US,en;q=0.9",
     }
 
-    resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+    with stage("http.wordpress"):
+        resp = requests.get(url, params=params, headers=headers, timeout=timeout_s)
+    count("http.wordpress", bytes=len(resp.content))
     resp.raise_for_status()
     posts = resp.json()
     ...
 
 
-    resp = requests.get(url, params=params, timeout=timeout_s)
+    with stage("http.wordpress"):
+        resp = requests.get(url, params=params, timeout=timeout_s)
+    count("http.wordpress", bytes=len(resp.content))
     resp.raise_for_status()
     posts = resp.json()
 
-    out: List[dict] = []
-    for p in posts:
-        title_html = (p.get("title") or {}).get("rendered", "")
-        excerpt_html = (p.get("excerpt") or {}).get("rendered", "")
-        content_html = (p.get("content") or {}).get("rendered", "")
+    if not extract:
+        return posts
+    return [extract_post(p) for p in posts]
 
-        out.append({
-            "id": p.get("id"),
-            "date": p.get("date"),
-            "slug": p.get("slug"),
-            "title": _strip_html(title_html),
-            "link": p.get("link"),
-            "excerpt_text": _strip_html(excerpt_html),
-            "content_text": _strip_html(content_html),
-        })
 
-    return out
+def extract_post(p: dict) -> dict:
+    """Flatten a raw `wp/v2/posts` item into plain-text fields."""
+    title_html = (p.get("title") or {}).get("rendered", "")
+    excerpt_html = (p.get("excerpt") or {}).get("rendered", "")
+    content_html = (p.get("content") or {}).get("rendered", "")
+
+    return {
+        "id": p.get("id"),
+        "date": p.get("date"),
+        "slug": p.get("slug"),
+        "title": html_to_line(title_html),
+        "link": p.get("link"),
+        "excerpt_text": html_to_text(excerpt_html),
+        "content_text": html_to_text(content_html),
+    }
 
 
 def fetch_wp_posts_all(
     base_url: str,
     max_posts: int = 200,
     per_page: int = 50,
+    extract: bool = True,
 ) -> List[dict]:
     """
     Paginate until we hit max_posts or run out.
@@ -73,7 +78,7 @@ def fetch_wp_posts_all(
     page = 1
 
     while len(out) < max_posts:
-        batch = fetch_wp_posts(base_url=base_url, per_page=per_page, page=page)
+        batch = fetch_wp_posts(base_url=base_url, per_page=per_page, page=page, extract=extract)
         if not batch:
             break
         out.extend(batch)
@@ -0,0 +1,136 @@
+"""Audio-only extraction and size-aware segmentation via a local ffmpeg.
+
+The transcription API only needs the audio track, and rejects uploads over
+25 MB. `prepare_audio` re-encodes a video's audio as compressed mono AAC,
+then, if the result is still too large, splits it at silence boundaries so
+every segment fits under the limit. Segments are returned in order so their
+transcripts can be stitched back together.
+"""
+
+from __future__ import annotations
+
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+MAX_UPLOAD_BYTES = 25 * 1024 * 1024
+AUDIO_BITRATE = "32k"
+AUDIO_SAMPLE_RATE = 16000
+SILENCE_NOISE_DB = -35
+SILENCE_MIN_S = 0.4
+# Leave headroom for container overhead and bitrate variance when sizing segments.
+SEGMENT_SIZE_MARGIN = 0.9
+
+_SILENCE_START_RE = re.compile(r"silence_start:\s*(-?[0-9.]+)")
+_SILENCE_END_RE = re.compile(r"silence_end:\s*([0-9.]+)")
+
+
+def ffmpeg_available() -> bool:
+    return bool(shutil.which("ffmpeg") and shutil.which("ffprobe"))
+
+
+def _run(cmd: Sequence[str]) -> subprocess.CompletedProcess:
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{cmd[0]} failed ({result.returncode}): {result.stderr.strip()[-500:]}")
+    return result
+
+
+def probe_duration(path: Path) -> float:
+    result = _run(
+        ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "default=nw=1:nk=1", str(path)]
+    )
+    return float(result.stdout.strip() or 0.0)
+
+
+def extract_audio(src: Path, dst: Path) -> Path:
+    """Write the mono, low-bitrate audio track of `src` to `dst` (.m4a)."""
+    _run(
+        [
+            "ffmpeg", "-y", "-v", "error", "-i", str(src),
+            "-vn", "-ac", "1", "-ar", str(AUDIO_SAMPLE_RATE),
+            "-c:a", "aac", "-b:a", AUDIO_BITRATE,
+            str(dst),
+        ]
+    )
+    return dst
+
+
+def detect_silences(path: Path) -> List[Tuple[float, float]]:
+    """Return (start, end) seconds of silent stretches found by ffmpeg's silencedetect."""
+    result = _run(
+        [
+            "ffmpeg", "-v", "info", "-i", str(path),
+            "-af", f"silencedetect=noise={SILENCE_NOISE_DB}dB:d={SILENCE_MIN_S}",
+            "-f", "null", "-",
+        ]
+    )
+    silences: List[Tuple[float, float]] = []
+    start = None
+    for line in result.stderr.splitlines():
+        start_match = _SILENCE_START_RE.search(line)
+        if start_match:
+            start = max(0.0, float(start_match.group(1)))
+            continue
+        end_match = _SILENCE_END_RE.search(line)
+        if end_match and start is not None:
+            silences.append((start, float(end_match.group(1))))
+            start = None
+    return silences
+
+
+def plan_segments(duration: float, silences: Sequence[Tuple[float, float]], max_segment_s: float) -> List[Tuple[float, float]]:
+    """Split [0, duration] into spans no longer than `max_segment_s`.
+
+    Each cut goes at the middle of the latest silence that keeps the span under
+    the limit; if a span has no silence, it is cut hard at the limit.
+    """
+    if duration <= max_segment_s:
+        return [(0.0, duration)]
+    midpoints = sorted((start + end) / 2 for start, end in silences)
+
+    spans: List[Tuple[float, float]] = []
+    start = 0.0
+    while duration - start > max_segment_s:
+        limit = start + max_segment_s
+        candidates = [m for m in midpoints if start < m <= limit]
+        # Avoid slivers: a cut in the first quarter of the window is not worth it.
+        cut = candidates[-1] if candidates and candidates[-1] - start >= max_segment_s / 4 else limit
+        spans.append((start, cut))
+        start = cut
+    spans.append((start, duration))
+    return spans
+
+
+def split_audio(path: Path, spans: Sequence[Tuple[float, float]], out_dir: Path) -> List[Path]:
+    segments: List[Path] = []
+    for idx, (start, end) in enumerate(spans):
+        out_path = out_dir / f"{path.stem}.part{idx:03d}{path.suffix}"
+        _run(
+            [
+                "ffmpeg", "-y", "-v", "error", "-i", str(path),
+                "-ss", f"{start:.3f}", "-to", f"{end:.3f}", "-c", "copy",
+                str(out_path),
+            ]
+        )
+        segments.append(out_path)
+    return segments
+
+
+def prepare_audio(video_path: Path, out_dir: Path, max_bytes: int = MAX_UPLOAD_BYTES) -> List[Path]:
+    """Extract compressed audio from `video_path` and split it to fit `max_bytes` per upload."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    audio_path = extract_audio(video_path, out_dir / f"{video_path.stem}.m4a")
+    size = audio_path.stat().st_size
+    if size <= max_bytes:
+        return [audio_path]
+
+    duration = probe_duration(audio_path)
+    bytes_per_s = size / duration if duration else size
+    max_segment_s = max(1.0, max_bytes * SEGMENT_SIZE_MARGIN / bytes_per_s)
+    spans = plan_segments(duration, detect_silences(audio_path), max_segment_s)
+    segments = split_audio(audio_path, spans, out_dir)
+    audio_path.unlink(missing_ok=True)
+    return segments
@@ -0,0 +1,115 @@
+"""Persistent SQLite job queue for the transcription pipeline.
+
+Each Drive video is one row whose `state` is the last stage it completed:
+pending -> downloaded -> transcribed -> done. Local artifacts live under
+`data/transcribe_work/<video id>/`, so an interrupted run resumes each job
+at the stage it reached instead of re-downloading or re-transcribing.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+JOBS_DB_PATH = Path("data") / "transcribe_jobs.sqlite"
+WORK_DIR = Path("data") / "transcribe_work"
+
+PENDING = "pending"
+DOWNLOADED = "downloaded"
+TRANSCRIBED = "transcribed"
+DONE = "done"
+
+JOB_FIELDS = ("video_id", "name", "state", "local_path", "transcript_path", "error", "attempts", "updated_at")
+
+
+@contextmanager
+def jobs_db() -> Iterator[sqlite3.Connection]:
+    JOBS_DB_PATH.parent.mkdir(parents=True, exist_ok=True)
+    # One short-lived connection per call keeps this safe to use from stage workers.
+    conn = sqlite3.connect(JOBS_DB_PATH, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            video_id TEXT PRIMARY KEY,
+            name TEXT NOT NULL,
+            state TEXT NOT NULL,
+            local_path TEXT,
+            transcript_path TEXT,
+            error TEXT,
+            attempts INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def job_dir(video_id: str) -> Path:
+    path = WORK_DIR / video_id
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def enqueue_jobs(videos: Iterable[dict]) -> int:
+    """Add Drive videos as pending jobs; unfinished jobs keep their progress.
+
+    Callers pass only videos that need a transcript, so a finished job among
+    them has lost its transcript from Drive since (or the run is --force)
+    and is queued again. Returns the number of jobs inserted or reset.
+    """
+    now = time.time()
+    changed = 0
+    with jobs_db() as conn:
+        for video in videos:
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO jobs (video_id, name, state, updated_at) VALUES (?, ?, ?, ?)",
+                (video["id"], video["name"], PENDING, now),
+            )
+            if not cur.rowcount:
+                cur = conn.execute(
+                    "UPDATE jobs SET state=?, error=NULL, updated_at=? WHERE video_id=? AND state=?",
+                    (PENDING, now, video["id"], DONE),
+                )
+            changed += cur.rowcount
+    return changed
+
+
+def open_jobs(video_ids: Optional[Sequence[str]] = None) -> List[dict]:
+    """Return unfinished jobs (optionally restricted to `video_ids`), oldest first."""
+    query = f"SELECT {', '.join(JOB_FIELDS)} FROM jobs WHERE state != ?"
+    params: list = [DONE]
+    if video_ids is not None:
+        if not video_ids:
+            return []
+        query += f" AND video_id IN ({','.join('?' for _ in video_ids)})"
+        params.extend(video_ids)
+    query += " ORDER BY updated_at"
+    with jobs_db() as conn:
+        rows = conn.execute(query, params).fetchall()
+    return [dict(zip(JOB_FIELDS, row)) for row in rows]
+
+
+def update_job(video_id: str, **fields) -> None:
+    unknown = set(fields) - set(JOB_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown job fields: {sorted(unknown)}")
+    fields["updated_at"] = time.time()
+    assignments = ", ".join(f"{name}=?" for name in fields)
+    with jobs_db() as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE video_id=?", (*fields.values(), video_id))
+
+
+def record_failure(video_id: str, error: str) -> None:
+    with jobs_db() as conn:
+        conn.execute(
+            "UPDATE jobs SET error=?, attempts=attempts+1, updated_at=? WHERE video_id=?",
+            (error[:500], time.time(), video_id),
+        )
@@ -0,0 +1,148 @@
+"""Minimal threaded stage pipeline with bounded queues and per-stage metrics.
+
+Stages run in order, each with its own worker threads. A stage function
+takes an item and returns `(item, nbytes)` to pass it on, or `(None, nbytes)`
+to drop it. Items can also enter at any stage (resumed jobs), and an
+exception in a stage function drops that item without stopping the run.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..profiling import profile_stage
+
+StageFn = Callable[[Any], Tuple[Optional[Any], int]]
+
+_DONE = object()
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: StageFn
+    workers: int = 1
+    on_error: Optional[Callable[[Any, BaseException], None]] = None
+
+
+@dataclass
+class StageMetrics:
+    name: str
+    workers: int
+    items: int = 0
+    failures: int = 0
+    bytes: int = 0
+    busy_s: float = 0.0
+    first_start: Optional[float] = None
+    last_end: Optional[float] = None
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, started: float, ended: float, nbytes: int, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self.items += 1
+            else:
+                self.failures += 1
+            self.bytes += nbytes
+            self.busy_s += ended - started
+            self.first_start = started if self.first_start is None else min(self.first_start, started)
+            self.last_end = ended if self.last_end is None else max(self.last_end, ended)
+
+    @property
+    def wall_s(self) -> float:
+        if self.first_start is None or self.last_end is None:
+            return 0.0
+        return self.last_end - self.first_start
+
+    def summary(self) -> str:
+        wall = self.wall_s
+        rate = self.items / wall if wall else 0.0
+        mb_s = self.bytes / (1024 * 1024) / wall if wall else 0.0
+        return (
+            f"{self.name:<11} workers={self.workers} ok={self.items} failed={self.failures} "
+            f"wall={wall:.1f}s busy={self.busy_s:.1f}s {rate:.2f} items/s {mb_s:.2f} MB/s"
+        )
+
+
+class _Channel:
+    """Bounded queue that closes once every producer has finished."""
+
+    def __init__(self, maxsize: int, producers: int, consumers: int) -> None:
+        self.queue: "queue.Queue[Any]" = queue.Queue(maxsize=maxsize)
+        self._producers = producers
+        self._consumers = consumers
+        self._lock = threading.Lock()
+
+    def producer_done(self) -> None:
+        with self._lock:
+            self._producers -= 1
+            closing = self._producers == 0
+        if closing:
+            for _ in range(self._consumers):
+                self.queue.put(_DONE)
+
+
+def run_pipeline(
+    stages: Sequence[Stage],
+    entries: Dict[str, List[Any]],
+    queue_size: int = 4,
+) -> List[StageMetrics]:
+    """Run items through `stages`; `entries` maps stage name -> items starting there."""
+    metrics = [StageMetrics(stage.name, stage.workers) for stage in stages]
+    # Producers of channel i: workers of stage i-1 plus one feeder thread for entries.
+    channels = [
+        _Channel(queue_size, (stages[i - 1].workers if i else 0) + 1, stage.workers)
+        for i, stage in enumerate(stages)
+    ]
+
+    def feed(idx: int, items: List[Any]) -> None:
+        for item in items:
+            channels[idx].queue.put(item)
+        channels[idx].producer_done()
+
+    def work(idx: int) -> None:
+        stage, inbox = stages[idx], channels[idx].queue
+        outbox = channels[idx + 1] if idx + 1 < len(stages) else None
+        try:
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    break
+                started = time.perf_counter()
+                try:
+                    with profile_stage(stage.name):
+                        result, nbytes = stage.fn(item)
+                except Exception as exc:  # keep the pipeline alive; the job stays resumable
+                    metrics[idx].record(started, time.perf_counter(), 0, ok=False)
+                    if stage.on_error:
+                        try:
+                            stage.on_error(item, exc)
+                        except Exception as handler_exc:
+                            print(f"[{stage.name}] error handler failed: {handler_exc!r}")
+                    continue
+                metrics[idx].record(started, time.perf_counter(), nbytes, ok=result is not None)
+                if result is not None and outbox is not None:
+                    outbox.queue.put(result)
+        finally:
+            # Always release the next stage, or its workers wait forever.
+            if outbox is not None:
+                outbox.producer_done()
+
+    threads = [
+        threading.Thread(target=feed, args=(i, list(entries.get(stage.name, []))), daemon=True)
+        for i, stage in enumerate(stages)
+    ]
+    for i, stage in enumerate(stages):
+        threads.extend(
+            threading.Thread(target=work, args=(i,), name=f"{stage.name}-{n}", daemon=True)
+            for n in range(stage.workers)
+        )
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return metrics
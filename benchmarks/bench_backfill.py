@@ -0,0 +1,101 @@
+"""Measure how backfill record building scales with worker processes.
+
+Runs app.memory.backfill.prepare_records (HTML extraction, summary,
+chunking, chunk-id hashing) over synthetic raw WordPress posts for each
+worker count and prints throughput, speedup over one inline worker and
+parallel efficiency. Nothing is embedded or written to the memory store.
+
+Usage:
+    python benchmarks/bench_backfill.py --posts 4000 [--workers 2 4 8] [--chunksize 16]
+
+The baseline is the inline path (workers=1, no pool), so the speedup
+includes pool start-up and pickling overhead.
+Speedup should stay close to the worker count up to the number of physical
+cores; past that it flattens. Results go to benchmarks/results/ like
+bench_memory.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from app.memory.backfill import BACKFILL_CHUNKSIZE, prepare_records
+from benchmarks.bench_memory import RESULTS_DIR, _commit
+from benchmarks.corpus import synthetic_wp_posts
+from scripts.ingest_content import wordpress_record_from_api
+
+
+def _default_workers() -> list:
+    cores = os.cpu_count() or 1
+    counts, n = [], 2
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores] if cores > 1 else [2]
+
+
+def run(posts: list, workers: int, chunksize: int) -> dict:
+    start = time.perf_counter()
+    records = chunks = 0
+    for _, record_chunks in prepare_records(posts, wordpress_record_from_api, workers=workers, chunksize=chunksize):
+        records += 1
+        chunks += len(record_chunks)
+    seconds = time.perf_counter() - start
+    return {"seconds": round(seconds, 4), "records": records, "chunks": chunks, "posts_per_s": round(len(posts) / seconds, 1)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill process-pool scaling benchmark")
+    parser.add_argument("--posts", type=int, default=4000)
+    parser.add_argument("--workers", type=int, nargs="+", default=_default_workers())
+    parser.add_argument("--chunksize", type=int, default=BACKFILL_CHUNKSIZE)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=str(RESULTS_DIR), help="Directory for the JSON results")
+    args = parser.parse_args()
+
+    posts = synthetic_wp_posts(args.posts, args.seed)
+    print(f"{len(posts)} posts, chunksize {args.chunksize}, {os.cpu_count()} CPU(s)")
+    baseline = run(posts, 1, args.chunksize)
+    print(f"{'workers':>8} {'seconds':>9} {'posts/s':>9} {'speedup':>8} {'efficiency':>11}")
+    print(f"{'inline':>8} {baseline['seconds']:>9.2f} {baseline['posts_per_s']:>9.0f} {1.0:>8.2f} {1.0:>11.0%}")
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "posts": len(posts),
+        "chunksize": args.chunksize,
+        "inline": baseline,
+        "workers": {},
+    }
+    for workers in args.workers:
+        result = run(posts, workers, args.chunksize)
+        if (result["records"], result["chunks"]) != (baseline["records"], baseline["chunks"]):
+            raise SystemExit(f"{workers} workers produced different output than the inline run")
+        speedup = baseline["seconds"] / result["seconds"]
+        result.update(speedup=round(speedup, 2), efficiency=round(speedup / workers, 3))
+        report["workers"][str(workers)] = result
+        print(f"{workers:>8} {result['seconds']:>9.2f} {result['posts_per_s']:>9.0f} {speedup:>8.2f} {speedup / workers:>11.0%}")
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = out_dir / f"{stamp}_{report['commit']}_backfill.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
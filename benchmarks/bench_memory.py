@@ -0,0 +1,155 @@
+"""Time the memory layer on a synthetic corpus, fully offline.
+
+For each size (in chunks) a fresh data/ directory is built in a temp dir
+from benchmarks/corpus.py and these steps are timed: chunk_text,
+build_embedding_records, append_jsonl, upsert_embeddings, known_content_keys,
+_load_embeddings, search_memory scoring and _load_content_index. Embeddings
+are seeded random vectors, so no API calls are made.
+
+Results go to benchmarks/results/<timestamp>_<commit>.json; compare two with
+benchmarks/compare.py.
+
+Usage:
+    python benchmarks/bench_memory.py --sizes 1000 10000 100000 [--dim 3072] [--skip search_memory]
+
+At the real 3072 dimensions each float32 blob is ~12 KB, so 1M chunks need
+~12 GB of disk and as much RAM to load; pass a smaller --dim to scale down.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+STEPS = (
+    "chunk_text",
+    "build_embedding_records",
+    "append_jsonl",
+    "upsert_embeddings",
+    "known_content_keys",
+    "_load_embeddings",
+    "search_memory",
+    "_load_content_index",
+)
+
+
+def _commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _timed(results: dict, name: str, items: int, fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    seconds = time.perf_counter() - start
+    results[name] = {"seconds": round(seconds, 4), "items": items, "us_per_item": round(seconds / max(items, 1) * 1e6, 3)}
+    print(f"  {name:<24} {seconds:>9.3f}s  {results[name]['us_per_item']:>10.2f} µs/item")
+    return value
+
+
+def run_size(chunks: int, dim: int, seed: int, skip: set) -> dict:
+    # The memory modules resolve data/ against the working directory.
+    from app.memory.ingest import build_embedding_records, chunk_text, record_to_json
+    from app.memory.query import _load_embeddings, search_memory
+    from app.memory.storage import EMBED_DB_PATH, append_jsonl, known_content_keys, upsert_embeddings
+    from benchmarks.corpus import fill_embeddings, query_vector, synthetic_records
+    from scripts.draft_daily_email import _load_content_index
+
+    results: dict = {}
+    docs = []
+    produced = 0
+    chunk_seconds = 0.0
+    for record in synthetic_records(seed):
+        start = time.perf_counter()
+        produced += len(chunk_text(record.text)) or 1
+        chunk_seconds += time.perf_counter() - start
+        docs.append(record)
+        if produced >= chunks:
+            break
+    results["chunk_text"] = {
+        "seconds": round(chunk_seconds, 4),
+        "items": len(docs),
+        "us_per_item": round(chunk_seconds / len(docs) * 1e6, 3),
+    }
+    print(f"  {'chunk_text':<24} {chunk_seconds:>9.3f}s  {results['chunk_text']['us_per_item']:>10.2f} µs/item")
+
+    embedded = _timed(results, "build_embedding_records", len(docs), build_embedding_records, docs)[:chunks]
+    fill_embeddings(embedded, dim, seed)
+    _timed(results, "append_jsonl", len(docs), append_jsonl, (record_to_json(rec) for rec in docs))
+    _timed(results, "upsert_embeddings", len(embedded), upsert_embeddings, embedded)
+    del embedded
+    _timed(results, "known_content_keys", chunks, known_content_keys)
+    loaded = _timed(results, "_load_embeddings", chunks, _load_embeddings)
+    if "search_memory" not in skip:
+        _timed(
+            results, "search_memory", len(loaded), search_memory, "benchmark", top_k=10,
+            query_embedding=query_vector(dim), records=loaded,
+        )
+    del loaded
+    _timed(results, "_load_content_index", len(docs), _load_content_index)
+
+    return {
+        "chunks": chunks,
+        "documents": len(docs),
+        "db_bytes": EMBED_DB_PATH.stat().st_size,
+        "steps": results,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline benchmarks for the memory layer")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000], help="Corpus sizes in chunks")
+    parser.add_argument("--dim", type=int, default=3072, help="Embedding dimensions (3072 = text-embedding-3-large)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--skip", nargs="*", default=[], choices=STEPS, help="Steps to leave out (only search_memory is optional)")
+    parser.add_argument("--out", default=str(RESULTS_DIR), help="Directory for the JSON results")
+    args = parser.parse_args()
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "dim": args.dim,
+        "seed": args.seed,
+        "sizes": {},
+    }
+    home = os.getcwd()
+    for size in args.sizes:
+        print(f"{size} chunks (dim {args.dim})")
+        with tempfile.TemporaryDirectory(prefix="bench-memory-") as workdir:
+            os.chdir(workdir)
+            Path("data").mkdir()
+            try:
+                report["sizes"][str(size)] = run_size(size, args.dim, args.seed, set(args.skip))
+            finally:
+                os.chdir(home)
+    report["max_rss_mb"] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = out_dir / f"{stamp}_{report['commit']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
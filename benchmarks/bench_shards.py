@@ -0,0 +1,169 @@
+"""Measure sharded parallel search against the single-matrix scan.
+
+Builds a synthetic store in a temp dir (random unit vectors spread over
+the corpus sources and --months of ingest dates), syncs it into
+source/month shards and times:
+
+    monolithic   load_embedding_batch + scoring, as search_memory does today
+    shards       search_shards with each worker count (shards already mapped)
+    filtered     one source over the last month, showing skipped shards
+
+The shard results are checked against the monolithic top-k. Nothing is
+embedded over the network.
+
+Usage:
+    python benchmarks/bench_shards.py --chunks 200000 [--dim 256] [--workers 1 2 4 8] [--queries 20]
+
+At 1M chunks and 3072 dims the shards take ~12 GB; the scan is memory
+bandwidth bound, so speedup tracks cores only while the shards fit in the
+page cache. Results go to benchmarks/results/ like bench_memory.py.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.bench_memory import RESULTS_DIR, _commit
+
+MONTH_SECONDS = 30 * 86400
+
+
+def _default_workers() -> list:
+    cores = os.cpu_count() or 1
+    counts, n = [1], 2
+    while n < cores:
+        counts.append(n)
+        n *= 2
+    return counts + [cores] if cores > 1 else counts
+
+
+def build_store(chunks: int, dim: int, months: int, seed: int) -> float:
+    """Fill data/ with `chunks` rows spread evenly over `months`; returns the newest ingested_at."""
+    from app.memory.models import EmbeddingRecord
+    from app.memory.storage import embedding_db, upsert_embeddings
+    from benchmarks.corpus import SOURCES, fill_embeddings
+
+    for offset in range(0, chunks, 20000):
+        block = [
+            EmbeddingRecord(
+                source=SOURCES[idx % len(SOURCES)],
+                external_id=f"doc-{idx // 4:08d}",
+                chunk_id=f"c{idx % 4}",
+                embedding=[],
+                text_excerpt=f"chunk {idx}",
+                token_count=10,
+                similarity_hint=None,
+            )
+            for idx in range(offset, min(offset + 20000, chunks))
+        ]
+        fill_embeddings(block, dim, seed + offset)
+        upsert_embeddings(block)
+    newest = time.time()
+    with embedding_db() as conn:
+        conn.execute(
+            "UPDATE embeddings SET ingested_at = ? + rowid * ?",
+            (newest - months * MONTH_SECONDS, months * MONTH_SECONDS / chunks),
+        )
+    return newest
+
+
+def _timed(fn, repeat: int) -> tuple:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        value = fn()
+    return (time.perf_counter() - start) / repeat, value
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Sharded parallel search benchmark")
+    parser.add_argument("--chunks", type=int, default=200000)
+    parser.add_argument("--dim", type=int, default=256)
+    parser.add_argument("--months", type=int, default=12)
+    parser.add_argument("--workers", type=int, nargs="+", default=_default_workers())
+    parser.add_argument("--queries", type=int, default=20, help="Searches per measurement")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--out", default=str(RESULTS_DIR), help="Directory for the JSON results")
+    args = parser.parse_args()
+
+    report = {
+        "commit": _commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "chunks": args.chunks,
+        "dim": args.dim,
+        "months": args.months,
+        "workers": {},
+    }
+    home = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="bench-shards-") as workdir:
+        os.chdir(workdir)
+        Path("data").mkdir()
+        try:
+            from app.memory.query import search_memory
+            from app.memory.shards import load_shard_manifest, search_shards, sync_shards
+            from benchmarks.corpus import query_vector
+
+            print(f"{args.chunks} chunks (dim {args.dim}, {args.months} months), {os.cpu_count()} CPU(s)")
+            newest = build_store(args.chunks, args.dim, args.months, args.seed)
+            start = time.perf_counter()
+            sync_shards()
+            report["sync_seconds"] = round(time.perf_counter() - start, 3)
+            report["shards"] = len(load_shard_manifest()["shards"])
+            start = time.perf_counter()
+            report["resync_seconds"] = round((sync_shards(), time.perf_counter() - start)[1], 4)
+            print(f"  sync {report['sync_seconds']:.2f}s ({report['shards']} shards), no-op resync {report['resync_seconds']:.3f}s")
+
+            query = query_vector(args.dim)
+            mono_seconds, expected = _timed(
+                lambda: search_memory("bench", top_k=args.top_k, query_embedding=query), max(1, args.queries // 10)
+            )
+            report["monolithic_seconds"] = round(mono_seconds, 4)
+            print(f"  {'monolithic':>10} {mono_seconds * 1000:>9.1f} ms/query  (load + scan)")
+
+            # Warm the mappings so every worker count sees the same page cache.
+            search_shards(query, top_k=args.top_k, workers=1)
+            baseline = None
+            for workers in args.workers:
+                seconds, hits = _timed(lambda: search_shards(query, top_k=args.top_k, workers=workers), args.queries)
+                if [h["chunk_id"] + h["external_id"] for h in hits] != [h["chunk_id"] + h["external_id"] for h in expected]:
+                    raise SystemExit(f"{workers} workers returned a different top-{args.top_k} than the monolithic scan")
+                baseline = baseline or seconds
+                report["workers"][str(workers)] = {
+                    "ms_per_query": round(seconds * 1000, 3),
+                    "speedup": round(baseline / seconds, 2),
+                    "chunks_per_s": round(args.chunks / seconds),
+                }
+                print(f"  {workers:>10} {seconds * 1000:>9.1f} ms/query  {baseline / seconds:>5.2f}x  {args.chunks / seconds / 1e6:>6.1f}M chunks/s")
+
+            seconds, _ = _timed(
+                lambda: search_shards(query, sources=["nyt"], top_k=args.top_k, since=newest - MONTH_SECONDS), args.queries
+            )
+            report["filtered_ms_per_query"] = round(seconds * 1000, 3)
+            print(f"  {'filtered':>10} {seconds * 1000:>9.1f} ms/query  (nyt, last month)")
+        finally:
+            os.chdir(home)
+
+    out_dir = Path(args.out)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    path = out_dir / f"{stamp}_{report['commit']}_shards.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Compare two benchmark result files step by step.
+
+Usage:
+    python benchmarks/compare.py benchmarks/results/<before>.json benchmarks/results/<after>.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare two benchmark JSON results")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    args = parser.parse_args()
+
+    before = json.loads(Path(args.before).read_text(encoding="utf-8"))
+    after = json.loads(Path(args.after).read_text(encoding="utf-8"))
+    print(f"{before.get('commit')} -> {after.get('commit')} (dim {before.get('dim')} -> {after.get('dim')})")
+    for size, after_size in after.get("sizes", {}).items():
+        before_size = before.get("sizes", {}).get(size)
+        if not before_size:
+            continue
+        print(f"\n{size} chunks")
+        print(f"  {'step':<24} {'before s':>9} {'after s':>9} {'speedup':>8}")
+        for step, result in after_size["steps"].items():
+            old = before_size["steps"].get(step)
+            if not old:
+                continue
+            speedup = old["seconds"] / result["seconds"] if result["seconds"] else float("inf")
+            print(f"  {step:<24} {old['seconds']:>9.3f} {result['seconds']:>9.3f} {speedup:>7.2f}x")
+        if "db_bytes" in before_size and "db_bytes" in after_size:
+            print(f"  {'db size MB':<24} {before_size['db_bytes'] / 1e6:>9.1f} {after_size['db_bytes'] / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""Seeded synthetic corpus for offline benchmarks of the memory layer.
+
+Documents look like the real mix (short feed items, mid-length NYT/blog
+posts, long TikTok transcripts) and embeddings are random unit vectors from
+a seeded generator, so nothing touches the network and every run with the
+same seed produces the same corpus.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List, Sequence
+
+import numpy as np
+
+from app.memory.models import ContentRecord, EmbeddingRecord
+
+SOURCES = ("wordpress", "tiktok", "nyt", "wsj_markets", "cnbc_top", "ft_companies", "rss")
+WORDS = (
+    "small business lending capital cash flow revenue based financing merchant term loan credit line "
+    "underwriting broker funding approval rates working equipment invoice factoring sba bank fintech "
+    "startup payroll inventory growth margin customer market economy inflation fed policy"
+).split()
+# Approximate word counts per source: feeds are summaries, posts and transcripts run long.
+LENGTHS = {"wordpress": (600, 2400), "tiktok": (150, 900), "nyt": (40, 120)}
+DEFAULT_LENGTH = (30, 90)
+
+
+def synthetic_records(seed: int = 7) -> Iterator[ContentRecord]:
+    """Endless stream of ContentRecords; stop when you have enough."""
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    idx = 0
+    while True:
+        source = rng.choice(SOURCES)
+        low, high = LENGTHS.get(source, DEFAULT_LENGTH)
+        words = [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+        text = " ".join(words)
+        yield ContentRecord(
+            source=source,
+            external_id=f"{source}-{idx:08d}",
+            title=" ".join(words[:10]).title(),
+            url=f"https://example.com/{source}/{idx}",
+            published_at=start + timedelta(minutes=17 * idx),
+            summary=" ".join(words[:40]),
+            text=text,
+            media_type="video" if source == "tiktok" else "article",
+            extra={},
+        )
+        idx += 1
+
+
+def fill_embeddings(records: Sequence[EmbeddingRecord], dim: int, seed: int = 7, batch: int = 4096) -> None:
+    """Stand-in for fetch_embeddings: deterministic random unit vectors."""
+    rng = np.random.default_rng(seed)
+    for offset in range(0, len(records), batch):
+        block = records[offset : offset + batch]
+        vectors = rng.standard_normal((len(block), dim), dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for rec, vector in zip(block, vectors.tolist()):
+            rec.embedding = vector
+
+
+def query_vector(dim: int, seed: int = 11) -> List[float]:
+    vector = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def synthetic_wp_posts(count: int, seed: int = 7) -> List[dict]:
+    """Raw `wp/v2/posts` items with realistic markup, for the backfill benchmark."""
+    rng = random.Random(seed)
+    start = datetime(2019, 1, 1, tzinfo=timezone.utc)
+    posts = []
+    for idx in range(count):
+        paragraphs = []
+        for _ in range(rng.randint(8, 30)):
+            words = [rng.choice(WORDS) for _ in range(rng.randint(30, 90))]
+            words[rng.randrange(len(words))] = f"<strong>{rng.choice(WORDS)}</strong>"
+            words[rng.randrange(len(words))] = f'<a href="https://example.com/{idx}">{rng.choice(WORDS)}</a>'
+            paragraphs.append(f"<p>{' '.join(words)} &amp; more&#8230;</p>")
+            if rng.random() < 0.2:
+                paragraphs.append("<ul>" + "".join(f"<li>{rng.choice(WORDS)}</li>" for _ in range(4)) + "</ul>")
+        title = " ".join(rng.choice(WORDS) for _ in range(8)).title()
+        posts.append(
+            {
+                "id": idx,
+                "date": (start + timedelta(hours=13 * idx)).strftime("%Y-%m-%dT%H:%M:%S"),
+                "slug": f"post-{idx:07d}",
+                "link": f"https://example.com/post-{idx:07d}/",
+                "title": {"rendered": title.replace(" ", " &#8211; ", 1)},
+                "excerpt": {"rendered": f"<p>{' '.join(rng.choice(WORDS) for _ in range(40))}</p>"},
+                "content": {"rendered": "\n".join(paragraphs) + "<script>track();</script>"},
+            }
+        )
+    return posts
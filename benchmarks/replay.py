@@ -0,0 +1,145 @@
+"""Drive the full daily_scan against local stand-ins and measure it.
+
+Starts benchmarks/replay_server.py in-process, writes a feed list pointing
+at it, and runs scripts/daily_scan.py as a subprocess in a scratch working
+directory (so data/ starts empty) with every external endpoint redirected:
+EXTERNAL_FEEDS_PATH, BLOG_WP_BASE_URL, NYT_API_BASE and OPENAI_BASE_URL.
+Nothing is emailed.
+
+Each run reports wall time, items ingested and throughput, the pipeline's
+own stage timings (data/runs/ report from app/metrics.py) and server-side
+latency percentiles and 429 counts per endpoint. Results go to
+benchmarks/results/<timestamp>_replay.json.
+
+Usage:
+    python benchmarks/replay.py --feeds 200 --items 500 --runs 2 --fresh-each-run \\
+        --openai-latency-ms 40 --openai-429-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(REPO_ROOT))
+
+from benchmarks.replay_server import ReplayConfig, add_arguments, serve
+
+RESULTS_DIR = REPO_ROOT / "benchmarks" / "results"
+
+
+def _scan_env(base_url: str, feeds_path: Path) -> dict:
+    env = dict(os.environ)
+    env.update(
+        {
+            "EXTERNAL_FEEDS_PATH": str(feeds_path),
+            "BLOG_RSS_URL": "",
+            "BLOG_WP_BASE_URL": base_url,
+            "NYT_API_KEY": "replay",
+            "NYT_API_BASE": base_url,
+            "NYT_CACHE_TTL": "0",
+            "NYT_REQUESTS_PER_MINUTE": "600",
+            "OPENAI_BASE_URL": f"{base_url}/v1",
+            "OPENAI_API_KEY": "replay",
+            "LLM_CACHE_TTL": "0",
+            "EMAIL_TO": "replay@localhost",
+        }
+    )
+    return env
+
+
+def _latest_report(workdir: Path) -> dict:
+    reports = sorted((workdir / "data" / "runs").glob("*.json"))
+    return json.loads(reports[-1].read_text(encoding="utf-8")) if reports else {}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Replay daily_scan against local stand-in services")
+    add_arguments(parser)
+    parser.add_argument("--runs", type=int, default=1, help="Consecutive daily_scan runs on the same data/")
+    parser.add_argument("--fresh-each-run", action="store_true", help="Publish a new set of items before each run")
+    parser.add_argument("--query", default="small business lending")
+    parser.add_argument("--workdir", help="Keep data/ and logs here instead of a temp dir")
+    args = parser.parse_args()
+
+    cfg = ReplayConfig(args)
+    server = serve(cfg)
+    base_url = f"http://127.0.0.1:{server.server_port}"
+
+    workdir = Path(args.workdir or tempfile.mkdtemp(prefix="replay-")).resolve()
+    workdir.mkdir(parents=True, exist_ok=True)
+    feeds_path = workdir / "feeds.json"
+    feeds_path.write_text(
+        json.dumps([[f"replay_{i:03d}", f"{base_url}/feeds/{i}.xml"] for i in range(args.feeds)]), encoding="utf-8"
+    )
+    env = _scan_env(base_url, feeds_path)
+    print(f"Replay: {args.feeds} feeds x {args.items} items, {args.wp_posts} WP posts, workdir {workdir}")
+
+    runs = []
+    for run in range(args.runs):
+        if args.fresh_each_run:
+            cfg.epoch = args.epoch + run
+        server.stats.reset()
+        log_path = workdir / f"run{run}.log"
+        start = time.perf_counter()
+        with log_path.open("w", encoding="utf-8") as log:
+            proc = subprocess.run(
+                [sys.executable, str(REPO_ROOT / "scripts" / "daily_scan.py"), "--query", args.query, "--max-posts", str(args.wp_posts)],
+                cwd=workdir,
+                env=env,
+                stdout=log,
+                stderr=subprocess.STDOUT,
+            )
+        wall = time.perf_counter() - start
+        report = _latest_report(workdir)
+        ingest = report.get("stages", {}).get("ingest", {})
+        new_items = ingest.get("new", 0)
+        result = {
+            "run": run,
+            "epoch": cfg.epoch,
+            "exit_code": proc.returncode,
+            "wall_seconds": round(wall, 3),
+            "fetched": ingest.get("fetched", 0),
+            "new_items": new_items,
+            "items_per_second": round(new_items / wall, 2) if wall else None,
+            "stages": report.get("stages", {}),
+            "server": server.stats.summary(),
+            "log": str(log_path),
+        }
+        runs.append(result)
+
+        status = "ok" if proc.returncode == 0 else f"FAILED ({proc.returncode}, see {log_path})"
+        print(f"\nRun {run} (epoch {cfg.epoch}): {status}, {wall:.1f}s wall, {new_items:.0f} new item(s), {result['items_per_second']} items/s")
+        for name, values in sorted(result["stages"].items(), key=lambda kv: -kv[1].get("seconds", 0)):
+            if values.get("seconds", 0) >= 0.01:
+                print(f"  {name:<18} {values['seconds']:>8.2f}s  calls {values.get('calls', 0):.0f}")
+        print(f"  {'endpoint':<20} {'reqs':>6} {'429':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for route, values in sorted(result["server"].items()):
+            print(
+                f"  {route:<20} {values['requests']:>6} {values['throttled_429']:>5} {values['p50_ms']:>8.1f} "
+                f"{values['p95_ms']:>8.1f} {values['p99_ms']:>8.1f} {values['max_ms']:>8.1f}"
+            )
+
+    server.shutdown()
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    out = RESULTS_DIR / f"{stamp}_replay.json"
+    out.write_text(
+        json.dumps({"created_at": stamp, "config": {k: v for k, v in vars(args).items()}, "runs": runs}, indent=2),
+        encoding="utf-8",
+    )
+    print(f"\nWrote {out}")
+    if any(r["exit_code"] for r in runs):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
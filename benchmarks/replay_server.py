@@ -0,0 +1,325 @@
+"""Local stand-ins for every external service daily_scan talks to.
+
+One threaded HTTP server answers:
+  GET  /feeds/<n>.xml                        synthetic RSS (or a recorded file from --fixtures)
+  GET  /wp-json/wp/v2/posts                  paginated WordPress posts
+  GET  /svc/news/v3/content/all/<s>.json     NYT Times Wire
+  GET  /svc/search/v2/articlesearch.json     NYT Article Search
+  POST /v1/embeddings                        OpenAI-compatible, deterministic unit vectors
+  POST /v1/chat/completions                  OpenAI-compatible, canned ideas
+  GET  /_stats                               per-route counts, injected 429s, latency percentiles
+
+Content is deterministic per (--seed, --epoch), so a second run against the
+same epoch finds nothing new and a bumped epoch publishes fresh items.
+
+Usage:
+    python benchmarks/replay_server.py --feeds 200 --items 500 --openai-latency-ms 40 --openai-429-rate 0.02
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+from xml.sax.saxutils import escape
+
+import numpy as np
+
+WORDS = (
+    "small business lending capital cash flow revenue financing merchant loan credit underwriting broker "
+    "funding approval rates equipment invoice factoring sba bank fintech payroll inventory growth margin "
+    "market economy inflation fed policy tariffs earnings startup retail consumer"
+).split()
+
+
+class ReplayConfig:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.feeds = args.feeds
+        self.items = args.items
+        self.wp_posts = args.wp_posts
+        self.nyt_items = args.nyt_items
+        self.dim = args.dim
+        self.seed = args.seed
+        self.epoch = args.epoch
+        self.feed_latency_s = args.feed_latency_ms / 1000
+        self.openai_latency_s = args.openai_latency_ms / 1000
+        self.openai_429_rate = args.openai_429_rate
+        self.fixtures = Path(args.fixtures) if args.fixtures else None
+
+
+class Stats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.throttled: Dict[str, int] = defaultdict(int)
+        self.bytes_out: Dict[str, int] = defaultdict(int)
+
+    def record(self, route: str, seconds: float, nbytes: int, throttled: bool) -> None:
+        with self._lock:
+            self.latencies[route].append(seconds)
+            self.bytes_out[route] += nbytes
+            if throttled:
+                self.throttled[route] += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latencies.clear()
+            self.throttled.clear()
+            self.bytes_out.clear()
+
+    def summary(self) -> dict:
+        with self._lock:
+            out = {}
+            for route, values in self.latencies.items():
+                arr = np.asarray(values) * 1000
+                out[route] = {
+                    "requests": len(values),
+                    "throttled_429": self.throttled.get(route, 0),
+                    "bytes": self.bytes_out.get(route, 0),
+                    "p50_ms": round(float(np.percentile(arr, 50)), 2),
+                    "p95_ms": round(float(np.percentile(arr, 95)), 2),
+                    "p99_ms": round(float(np.percentile(arr, 99)), 2),
+                    "max_ms": round(float(arr.max()), 2),
+                }
+            return out
+
+
+def _rng(*parts) -> random.Random:
+    return random.Random(hashlib.sha1(":".join(map(str, parts)).encode("utf-8")).digest())
+
+
+def _words(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(low, high)))
+
+
+def feed_xml(cfg: ReplayConfig, feed: int) -> bytes:
+    if cfg.fixtures:
+        recorded = sorted(cfg.fixtures.glob("*.xml"))
+        if recorded:
+            return recorded[feed % len(recorded)].read_bytes()
+    items = []
+    for idx in range(cfg.items):
+        rng = _rng(cfg.seed, cfg.epoch, "feed", feed, idx)
+        title = _words(rng, 6, 12).title()
+        link = f"https://replay.local/e{cfg.epoch}/feed{feed}/item{idx}"
+        body = "".join(f"<p>{_words(rng, 20, 60)}</p>" for _ in range(rng.randint(1, 3)))
+        items.append(
+            f"<item><title>{escape(title)}</title><link>{link}</link><guid>{link}</guid>"
+            f"<pubDate>Mon, 06 Jan 2025 {idx % 24:02d}:00:00 GMT</pubDate>"
+            f"<description>{escape(body)}</description></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        f"<title>Replay feed {feed}</title><link>https://replay.local/feed{feed}</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def wp_posts(cfg: ReplayConfig, page: int, per_page: int) -> list:
+    posts = []
+    for idx in range((page - 1) * per_page, min(page * per_page, cfg.wp_posts)):
+        rng = _rng(cfg.seed, cfg.epoch, "wp", idx)
+        content = "".join(f"<p>{_words(rng, 40, 120)}</p>" for _ in range(rng.randint(4, 20)))
+        posts.append(
+            {
+                "id": idx + 1,
+                "date": "2025-01-06T08:00:00",
+                "slug": f"e{cfg.epoch}-post-{idx}",
+                "link": f"https://replay.local/blog/e{cfg.epoch}-post-{idx}",
+                "title": {"rendered": _words(rng, 5, 10).title()},
+                "excerpt": {"rendered": f"<p>{_words(rng, 20, 40)}</p>"},
+                "content": {"rendered": content},
+            }
+        )
+    return posts
+
+
+def nyt_item(cfg: ReplayConfig, kind: str, idx: int) -> dict:
+    rng = _rng(cfg.seed, cfg.epoch, "nyt", kind, idx)
+    return {
+        "title": _words(rng, 6, 12).title(),
+        "abstract": _words(rng, 20, 40),
+        "url": f"https://replay.local/nyt/e{cfg.epoch}/{kind}/{idx}",
+        "published_date": "2025-01-06T08:00:00-05:00",
+        "section": "Business",
+        "subsection": "",
+    }
+
+
+def embedding(text: str, dim: int) -> List[float]:
+    seed = int.from_bytes(hashlib.sha1(text.encode("utf-8")).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim, dtype=np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def make_handler(cfg: ReplayConfig, stats: Stats):
+    throttle_rng = random.Random(cfg.seed)
+    throttle_lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, route: str, start: float, body: bytes, content_type: str, status: int = 200, headers: Optional[dict] = None) -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+            stats.record(route, time.perf_counter() - start, len(body), status == 429)
+
+        def _json(self, route: str, start: float, payload, status: int = 200, headers: Optional[dict] = None) -> None:
+            self._send(route, start, json.dumps(payload).encode("utf-8"), "application/json", status, headers)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            start = time.perf_counter()
+            parsed = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            path = parsed.path
+
+            if path == "/_stats":
+                self._json("stats", start, stats.summary())
+            elif path.startswith("/feeds/") and path.endswith(".xml"):
+                time.sleep(cfg.feed_latency_s)
+                feed = int(path[len("/feeds/") : -len(".xml")])
+                self._send("feed", start, feed_xml(cfg, feed), "application/rss+xml")
+            elif path.rstrip("/").endswith("/wp-json/wp/v2/posts"):
+                time.sleep(cfg.feed_latency_s)
+                page, per_page = int(params.get("page", 1)), int(params.get("per_page", 10))
+                self._json("wordpress", start, wp_posts(cfg, page, per_page))
+            elif path.startswith("/svc/news/v3/content/all/"):
+                limit = int(params.get("limit", 20))
+                results = [nyt_item(cfg, "wire", idx) for idx in range(min(limit, cfg.nyt_items))]
+                self._json("nyt.times_wire", start, {"status": "OK", "results": results})
+            elif path == "/svc/search/v2/articlesearch.json":
+                page = int(params.get("page", 0))
+                query = params.get("q", "")
+                docs = []
+                for idx in range(page * 10, min((page + 1) * 10, cfg.nyt_items)):
+                    item = nyt_item(cfg, f"search-{query}", idx)
+                    docs.append(
+                        {
+                            "headline": {"main": item["title"]},
+                            "web_url": item["url"],
+                            "pub_date": item["published_date"],
+                            "abstract": item["abstract"],
+                            "lead_paragraph": item["abstract"],
+                            "section_name": "Business",
+                        }
+                    )
+                self._json("nyt.article_search", start, {"status": "OK", "response": {"docs": docs}})
+            else:
+                self._json("unknown", start, {"error": "not found"}, 404)
+
+        def do_POST(self) -> None:  # noqa: N802 - http.server API
+            start = time.perf_counter()
+            length = int(self.headers.get("Content-Length") or 0)
+            request = json.loads(self.rfile.read(length) or b"{}")
+            path = urlparse(self.path).path.rstrip("/")
+            route = "openai.embeddings" if path.endswith("/embeddings") else "openai.chat"
+            if not path.endswith(("/embeddings", "/chat/completions")):
+                self._json("unknown", start, {"error": "not found"}, 404)
+                return
+
+            time.sleep(cfg.openai_latency_s)
+            with throttle_lock:
+                throttled = throttle_rng.random() < cfg.openai_429_rate
+            if throttled:
+                error = {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}}
+                self._json(route, start, error, 429, {"Retry-After": "0.2"})
+                return
+
+            if route == "openai.embeddings":
+                inputs = request.get("input")
+                inputs = [inputs] if isinstance(inputs, str) else list(inputs or [])
+                data = [
+                    {"object": "embedding", "index": idx, "embedding": embedding(text, cfg.dim)}
+                    for idx, text in enumerate(inputs)
+                ]
+                tokens = sum(len(text.split()) for text in inputs)
+                self._json(
+                    route,
+                    start,
+                    {
+                        "object": "list",
+                        "data": data,
+                        "model": request.get("model"),
+                        "usage": {"prompt_tokens": tokens, "total_tokens": tokens},
+                    },
+                )
+                return
+
+            prompt_tokens = sum(len(str(m.get("content", "")).split()) for m in request.get("messages", []))
+            ideas = "- Tweet: replay idea one\n- Tweet: replay idea two\n- Blog: replay angle\n- TikTok: replay hook"
+            self._json(
+                route,
+                start,
+                {
+                    "id": "chatcmpl-replay",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": request.get("model"),
+                    "choices": [
+                        {"index": 0, "message": {"role": "assistant", "content": ideas}, "finish_reason": "stop"}
+                    ],
+                    "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 20, "total_tokens": prompt_tokens + 20},
+                },
+            )
+
+        def log_message(self, fmt: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--feeds", type=int, default=20, help="Number of synthetic feeds")
+    parser.add_argument("--items", type=int, default=50, help="Items per feed")
+    parser.add_argument("--wp-posts", type=int, default=120)
+    parser.add_argument("--nyt-items", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=256, help="Embedding dimensions returned")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--epoch", type=int, default=0, help="Bump to publish a fresh set of items")
+    parser.add_argument("--feed-latency-ms", type=float, default=0.0)
+    parser.add_argument("--openai-latency-ms", type=float, default=0.0)
+    parser.add_argument("--openai-429-rate", type=float, default=0.0, help="Fraction of OpenAI calls answered with 429")
+    parser.add_argument("--fixtures", help="Serve recorded feed XML from this dir (e.g. data/fixtures/feeds)")
+
+
+def serve(cfg: ReplayConfig, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Start the server on a background thread; port 0 picks a free one."""
+    stats = Stats()
+    server = ThreadingHTTPServer((host, port), make_handler(cfg, stats))
+    server.daemon_threads = True
+    server.stats = stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve feeds, WordPress, NYT and OpenAI stand-ins")
+    add_arguments(parser)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    server = serve(ReplayConfig(args), args.host, args.port)
+    print(f"Replay server at http://{args.host}:{server.server_port}/ ({args.feeds} feeds x {args.items} items)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
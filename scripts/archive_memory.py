@@ -0,0 +1,103 @@
+"""Apply per-source retention: move old feed chunks to the cold archive.
+
+    python scripts/archive_memory.py [--policy retention.json] [--dry-run] [--no-vacuum]
+    python scripts/archive_memory.py --stats
+    python scripts/archive_memory.py --search "merchant cash advance" [--source hackernews] [--top-k 10]
+
+The policy file maps source names or glob patterns to days, e.g.
+{"hackernews": 14, "techmeme": 30, "cnbc_*": 30, "*": 90}. wordpress and
+tiktok are never archived. --search embeds the query and scans the archive
+only (plus the hot index with --hot).
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure repo root is importable when running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.archive import apply_retention, list_segments, load_retention_policy, retention_days, search_archive
+from app.memory.query import embed_query, search_memory
+from app.memory.storage import EMBED_DB_PATH, embedding_db
+
+
+def _dry_run(policy: dict) -> None:
+    now = time.time()
+    with embedding_db() as conn:
+        rows = conn.execute(
+            "SELECT source, COUNT(*), MIN(ingested_at) FROM embeddings GROUP BY source ORDER BY source"
+        ).fetchall()
+        for source, total, oldest in rows:
+            days = retention_days(source, policy)
+            if days is None:
+                print(f"{source:<20} {total:>8} chunks  kept hot")
+                continue
+            due = conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE source = ? AND ingested_at < ?", (source, now - days * 86400)
+            ).fetchone()[0]
+            print(f"{source:<20} {total:>8} chunks  {days:g} days  {due:>8} due")
+
+
+def _stats() -> None:
+    segments = list_segments()
+    by_source: dict = {}
+    for seg in segments:
+        entry = by_source.setdefault(seg["source"], [0, 0, 0])
+        entry[0] += 1
+        entry[1] += seg["rows"]
+        path = EMBED_DB_PATH.parent / seg["path"]
+        entry[2] += path.stat().st_size if path.exists() else 0
+    for source, (count, rows, size) in sorted(by_source.items()):
+        print(f"{source:<20} {count:>4} segment(s) {rows:>9} chunks {size / 1e6:>8.1f} MB")
+    print(f"Hot store: {EMBED_DB_PATH.stat().st_size / 1e6:.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Hot/cold retention for the memory store")
+    parser.add_argument("--policy", help="JSON retention policy (default RETENTION_POLICY_PATH)")
+    parser.add_argument("--dry-run", action="store_true", help="Show what would move without moving it")
+    parser.add_argument("--no-vacuum", action="store_true", help="Skip compacting the hot store afterwards")
+    parser.add_argument("--stats", action="store_true", help="Show archive segments and sizes")
+    parser.add_argument("--search", help="Search the archive for this query")
+    parser.add_argument("--source", action="append", help="Restrict --search to a source (repeatable)")
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--hot", action="store_true", help="With --search, include the hot index too")
+    args = parser.parse_args()
+    load_dotenv()
+
+    if args.stats:
+        _stats()
+        return
+    if args.search:
+        vector = embed_query(args.search)
+        if args.hot:
+            results = search_memory(args.search, args.source, args.top_k, query_embedding=vector, include_archive=True)
+        else:
+            results = search_archive(vector, sources=args.source, top_k=args.top_k)
+        for item in results:
+            tier = "cold" if item.get("archived") else "hot"
+            print(f"{item['score']:.3f} [{tier}] {item['source']}/{item['external_id']}: {item['text_excerpt'][:100]}")
+        return
+
+    policy = load_retention_policy(args.policy)
+    if args.dry_run:
+        _dry_run(policy)
+        return
+    before = EMBED_DB_PATH.stat().st_size if EMBED_DB_PATH.exists() else 0
+    moved = apply_retention(policy, vacuum=not args.no_vacuum)
+    for source, rows in sorted(moved.items()):
+        print(f"{source:<20} {rows:>8} chunk(s) archived")
+    if not moved:
+        print("Nothing past retention.")
+    after = EMBED_DB_PATH.stat().st_size if EMBED_DB_PATH.exists() else 0
+    print(f"Hot store: {before / 1e6:.1f} MB -> {after / 1e6:.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
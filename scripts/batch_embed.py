@@ -0,0 +1,105 @@
+"""Manage batch-embedding jobs written by `ingest_content.py --batch-export`.
+
+    python scripts/batch_embed.py list
+    python scripts/batch_embed.py submit <job>          # upload + create batches
+    python scripts/batch_embed.py download <job>        # poll, fetch finished outputs
+    python scripts/batch_embed.py import <job> [results.jsonl ...]
+    python scripts/batch_embed.py failed <job> retry.jsonl
+    python scripts/batch_embed.py fake-results <job> results.jsonl [--dim 3072] [--fail-rate 0.1]
+
+`import` without files uses the outputs `download` saved in the job dir.
+Imports skip custom_ids already upserted, so they can be re-run or resumed.
+`fake-results` answers a job locally with deterministic vectors, so the whole
+export -> import path runs without network access.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure repo root is importable when running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.batch_embed import (
+    BATCH_DIR,
+    download_batch_results,
+    failed_requests,
+    import_batch_results,
+    list_jobs,
+    load_manifest,
+    submit_batch_job,
+    write_fake_results,
+)
+
+
+def _job_dir(job: str) -> Path:
+    path = Path(job)
+    if not (path / "manifest.json").exists():
+        path = BATCH_DIR / job
+    if not (path / "manifest.json").exists():
+        raise SystemExit(f"No batch job {job!r} (looked in {BATCH_DIR})")
+    return path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Batch-embedding jobs for bulk backfills")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="Show jobs and their status")
+    for name in ("submit", "download"):
+        sub.add_parser(name).add_argument("job")
+    imp = sub.add_parser("import", help="Upsert vectors from results files")
+    imp.add_argument("job")
+    imp.add_argument("results", nargs="*")
+    failed = sub.add_parser("failed", help="Write requests not imported yet, for resubmission")
+    failed.add_argument("job")
+    failed.add_argument("out")
+    fake = sub.add_parser("fake-results", help="Write a local results file for a job")
+    fake.add_argument("job")
+    fake.add_argument("out")
+    fake.add_argument("--dim", type=int, default=3072)
+    fake.add_argument("--fail-rate", type=float, default=0.0)
+    fake.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    load_dotenv()
+
+    if args.command == "list":
+        for job_dir in list_jobs():
+            m = load_manifest(job_dir)
+            print(f"{m['job_id']:<28} {m['status']:<10} {m['imported']:>8}/{m['requests']:<8} {m['model']}")
+        return
+
+    job_dir = _job_dir(args.job)
+    if args.command == "submit":
+        manifest = submit_batch_job(job_dir)
+        for name, info in manifest["batches"].items():
+            print(f"{name}: {info['batch_id']} ({info['status']})")
+    elif args.command == "download":
+        paths = download_batch_results(job_dir)
+        manifest = load_manifest(job_dir)
+        for name, info in manifest["batches"].items():
+            print(f"{name}: {info['status']} -> {info.get('output_file') or '-'}")
+        print(f"{len(paths)} of {len(manifest['request_files'])} result file(s) on disk.")
+    elif args.command == "import":
+        results = [Path(p) for p in args.results] or sorted(job_dir.glob("results-*.jsonl"))
+        if not results:
+            raise SystemExit("No results files given and none downloaded yet.")
+        for path in results:
+            stats = import_batch_results(job_dir, path)
+            print(f"{path.name}: {stats['imported']} imported, {stats['skipped']} already done, "
+                  f"{stats['failed']} failed, {stats['unknown']} unknown id(s)")
+        manifest = load_manifest(job_dir)
+        print(f"Job {manifest['job_id']}: {manifest['status']} ({manifest['imported']}/{manifest['requests']})")
+    elif args.command == "failed":
+        written = failed_requests(job_dir, Path(args.out))
+        print(f"Wrote {written} pending request(s) to {args.out}")
+    elif args.command == "fake-results":
+        written = write_fake_results(job_dir, Path(args.out), dim=args.dim, fail_rate=args.fail_rate, seed=args.seed)
+        print(f"Wrote {written} result line(s) to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Benchmark the shared HTML extractor against the old two-pass regex stripper.
+
+Generates WordPress-style post bodies (paragraphs, headings, lists, inline
+markup, entities, embedded scripts/styles) and reports throughput and
+tracemalloc peak for both implementations.
+
+Usage:
+    python scripts/bench_html_text.py [--sizes-kb 50 500 2000] [--repeat 15]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.sources.html_text import html_to_text
+
+WORDS = (
+    "small business lending capital cash flow revenue based financing merchant "
+    "term loan credit line underwriting broker funding approval rates working"
+).split()
+
+
+def _regex_strip(html: str) -> str:
+    text = re.sub(r"<[^>]+>", " ", html or "")
+    text = re.sub(r"\s+", " ", text).strip()
+    return text
+
+
+def _sentence(rng: random.Random) -> str:
+    words = [rng.choice(WORDS) for _ in range(rng.randint(8, 20))]
+    idx = rng.randrange(len(words))
+    words[idx] = f"<strong>{words[idx]}</strong>"
+    return " ".join(words).capitalize() + " &amp; it&#8217;s done."
+
+
+def make_wordpress_body(size_kb: int, seed: int = 7) -> str:
+    rng = random.Random(seed)
+    parts = ['<div class="entry-content">']
+    total = 0
+    while total < size_kb * 1024:
+        kind = rng.random()
+        if kind < 0.1:
+            block = f"<h2>{_sentence(rng)}</h2>"
+        elif kind < 0.2:
+            items = "".join(f"<li>{_sentence(rng)}</li>" for _ in range(4))
+            block = f"<ul>\n{items}\n</ul>"
+        elif kind < 0.23:
+            block = "<script>window.dataLayer=window.dataLayer||[];dataLayer.push({'a':1});</script>"
+        elif kind < 0.25:
+            block = "<style>.wp-block{margin:0 auto;color:#333}</style>"
+        else:
+            block = "<p>" + " ".join(_sentence(rng) for _ in range(4)) + "</p>"
+        parts.append(block)
+        total += len(block)
+    parts.append("</div>")
+    return "\n".join(parts)
+
+
+def _measure(impls, html: str, repeat: int) -> dict:
+    """Best time and tracemalloc peak per implementation; runs alternate so machine noise hits both alike."""
+    best = {name: float("inf") for name, _ in impls}
+    for _ in range(repeat):
+        for name, fn in impls:
+            start = time.perf_counter()
+            fn(html)
+            best[name] = min(best[name], time.perf_counter() - start)
+
+    results = {}
+    for name, fn in impls:
+        tracemalloc.start()
+        fn(html)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = (best[name], peak)
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark HTML-to-text extraction")
+    parser.add_argument("--sizes-kb", type=int, nargs="+", default=[50, 500, 2000])
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    print(f"{'size':>8}  {'impl':<10} {'MB/s':>8} {'peak KB':>10}")
+    for size_kb in args.sizes_kb:
+        html = make_wordpress_body(size_kb)
+        mb = len(html) / (1024 * 1024)
+        results = _measure((("regex", _regex_strip), ("extractor", html_to_text)), html, args.repeat)
+        for name, (seconds, peak) in results.items():
+            print(f"{size_kb:>6}KB  {name:<10} {mb / seconds:>8.1f} {peak / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
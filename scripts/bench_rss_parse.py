@@ -0,0 +1,116 @@
+"""Benchmark the streaming feed parser against feedparser on recorded feeds.
+
+Record fixtures once (network required), then benchmark offline:
+    python scripts/bench_rss_parse.py --record
+    python scripts/bench_rss_parse.py [--limit 50] [--repeat 5]
+
+Fixtures are the raw responses of EXTERNAL_FEEDS, saved under
+data/fixtures/feeds/<label>.xml. Both parsers go through the same
+de-duplication/summary extraction as fetch_rss_posts.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import feedparser
+
+from app.sources.external_feeds import external_feeds
+from app.sources.rss import REQUEST_HEADERS, _collect_entries
+from app.sources.rss_stream import STREAM_CHUNK_BYTES, FeedStreamError, parse_feed_stream
+
+FIXTURE_DIR = Path("data") / "fixtures" / "feeds"
+
+
+def record() -> None:
+    import httpx
+
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    with httpx.Client(timeout=30, follow_redirects=True, headers=REQUEST_HEADERS) as client:
+        for label, url in external_feeds():
+            try:
+                resp = client.get(url)
+                resp.raise_for_status()
+            except httpx.HTTPError as exc:
+                print(f"⚠️  {label}: {exc}")
+                continue
+            (FIXTURE_DIR / f"{label}.xml").write_bytes(resp.content)
+            print(f"✅ {label}: {len(resp.content) / 1024:.0f} KB")
+
+
+def _chunks(path: Path):
+    with path.open("rb") as fh:
+        while True:
+            chunk = fh.read(STREAM_CHUNK_BYTES)
+            if not chunk:
+                return
+            yield chunk
+
+
+def _feedparser(path: Path, limit: int) -> list:
+    return _collect_entries(feedparser.parse(path.read_bytes()).entries or [], limit)
+
+
+def _streaming(path: Path, limit: int) -> list:
+    try:
+        return _collect_entries(parse_feed_stream(_chunks(path)), limit)
+    except FeedStreamError:
+        return _feedparser(path, limit)
+
+
+def _measure(fn, path: Path, limit: int, repeat: int) -> tuple[float, int, int]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = fn(path, limit)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn(path, limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, len(items)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark streaming feed parsing vs feedparser")
+    parser.add_argument("--record", action="store_true", help="Download fixtures for EXTERNAL_FEEDS")
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.record:
+        record()
+        return
+
+    fixtures = sorted(FIXTURE_DIR.glob("*.xml"))
+    if not fixtures:
+        raise SystemExit(f"No fixtures in {FIXTURE_DIR}; run with --record first.")
+
+    print(f"{'feed':<20} {'KB':>6} {'feedparser ms':>14} {'stream ms':>10} {'fp peak KB':>11} {'stream peak KB':>15} {'items':>6}")
+    totals = [0.0, 0.0, 0, 0]
+    for path in fixtures:
+        fp_s, fp_peak, fp_items = _measure(_feedparser, path, args.limit, args.repeat)
+        st_s, st_peak, st_items = _measure(_streaming, path, args.limit, args.repeat)
+        flag = "" if fp_items == st_items else f" (fp {fp_items})"
+        print(
+            f"{path.stem:<20} {path.stat().st_size / 1024:>6.0f} {fp_s * 1000:>14.1f} {st_s * 1000:>10.1f} "
+            f"{fp_peak / 1024:>11.0f} {st_peak / 1024:>15.0f} {st_items:>6}{flag}"
+        )
+        totals[0] += fp_s
+        totals[1] += st_s
+        totals[2] = max(totals[2], fp_peak)
+        totals[3] = max(totals[3], st_peak)
+    print(
+        f"{'total / max':<20} {'':>6} {totals[0] * 1000:>14.1f} {totals[1] * 1000:>10.1f} "
+        f"{totals[2] / 1024:>11.0f} {totals[3] / 1024:>15.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ updates embeddings, and optionally drafts the daily email.
 
 Usage:
     python scripts/daily_scan.py --query "small business lending" --max-posts 120 --send
+    python scripts/daily_scan.py --digests digests.json --send
 
 Without --send it will just ingest and print the email body.
 """
@@ -12,27 +13,49 @@ Without --send it will just ingest and print the email body.
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable, Optional, Sequence, TypeVar
 
 from dotenv import load_dotenv
 
 # Ensure repo root imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
-from app.memory.ingest import store_content
-from app.memory.models import ContentRecord
+from app.metrics import count, stage, start_run, write_report
+from app.profiling import enable_profiling, finish_profiling, profile_stage
+from app.memory.clustering import cluster_documents, story_index
+from app.memory.ingest import record_from_json, store_content
+from app.memory.models import ContentRecord, EmbeddingBatch, EmbeddingRecord
+from app.memory.query import embed_queries, load_embedding_batch
+from app.memory.standing import load_standing_query, standing_results
+from app.memory.vectors import as_unit_vector, document_vectors
 from app.memory.storage import known_content_keys
-from app.memory.raw_text import write_raw_text
+from app.memory.raw_text import write_raw_texts
 from app.sources.wordpress import fetch_wp_posts_all
 from app.sources.rss import fetch_rss_posts
-from app.sources.external_feeds import EXTERNAL_FEEDS
+from app.sources.registry import claim_polled, due_sources, feed_sources, record_fetches, release_polled
 from app.sources.nyt import fetch_times_wire, fetch_article_search
-from app.email.gmail_sender import send_email
+from app.email.digest_config import DigestSpec, load_digest_config, single_digest
+from app.email.gmail_sender import send_emails
 from scripts.ingest_content import _summarize, _parse_iso8601  # reuse helpers
-from scripts.draft_daily_email import build_email_body
-from app.llm.idea_digest import build_content_ideas
+from scripts.draft_daily_email import _load_content_index, build_email_body
+from app.llm.cache import cache_stats
+from app.llm.idea_digest import build_content_ideas, format_item_line
+from app.llm.item_selection import select_items
+
+# Idea items of each digest whose email has not been sent yet. A re-run after a
+# failed send has nothing new to ingest and reuses them, so its ideas prompt is
+# identical and served from the LLM cache.
+UNSENT_IDEA_ITEMS_DIR = Path("data") / "cache" / "unsent_idea_items"
+# Digests are built in parallel; the LLM call dominates each one.
+DIGEST_WORKERS = int(os.environ.get("DIGEST_WORKERS", "4"))
+
+T = TypeVar("T")
 
 
 def build_rss_records(feed_url: str, limit: int, source_label: str = "rss") -> list[ContentRecord]:
@@ -59,7 +82,10 @@ def build_rss_records(feed_url: str, limit: int, source_label: str = "rss") -> l
     return records
 
 
-def build_nyt_records(api_key: str, query: str, wire_limit: int = 15, search_limit: int = 20) -> list[ContentRecord]:
+def build_nyt_records(
+    api_key: str, queries: Sequence[str], wire_limit: int = 15, search_limit: int = 20
+) -> list[ContentRecord]:
+    """Times Wire once plus an Article Search per distinct query, de-duplicated by URL."""
     records: list[ContentRecord] = []
     seen: set[str] = set()
 
@@ -94,9 +120,10 @@ def build_nyt_records(api_key: str, query: str, wire_limit: int = 15, search_lim
     for item in times_wire_items:
         _add(item, "times_wire")
 
-    article_search_items = fetch_article_search(api_key, query=query, section_filter="Business", limit=search_limit)
-    for item in article_search_items:
-        _add(item, "article_search")
+    for query in dict.fromkeys(queries):
+        article_search_items = fetch_article_search(api_key, query=query, section_filter="Business", limit=search_limit)
+        for item in article_search_items:
+            _add(item, "article_search")
     return records
 
 
@@ -127,78 +154,358 @@ def build_wordpress_records(base_url: str, max_posts: int) -> list[ContentRecord
     return records
 
 
-def daily_scan(query: str, max_posts: int, send: bool) -> None:
-    load_dotenv()
-
+def _unsent_items_path(digest: DigestSpec) -> Path:
+    return UNSENT_IDEA_ITEMS_DIR / f"{digest.slug}.json"
+
+
+def _confirm_sent(digests: Sequence[DigestSpec]) -> None:
+    for digest in digests:
+        _unsent_items_path(digest).unlink(missing_ok=True)
+
+
+def _idea_items(
+    new_records: list[ContentRecord],
+    embedded: list[EmbeddingRecord],
+    query_vector: list[float],
+    digest: DigestSpec,
+    doc_vectors: Optional[dict] = None,
+    stories: Optional[dict] = None,
+) -> tuple[list[dict], bool]:
+    """Items for the digest's idea prompt and whether they are relevance-ranked.
+
+    This run's new records are collapsed to one item per story (when `stories`
+    maps document keys to clusters), ranked against the query with the chunk
+    vectors just computed at ingest, and trimmed to the prompt token budget.
+    They are saved until the digest is sent; a run with no new records reuses
+    the unsent ones, or gets none.
+    """
+    unsent_path = _unsent_items_path(digest)
+    if not new_records:
+        if unsent_path.exists():
+            saved = json.loads(unsent_path.read_text(encoding="utf-8"))
+            return saved["items"], saved["ranked"]
+        return [], False
+    items = [
+        {
+            "source": r.source,
+            "external_id": r.external_id,
+            "title": r.title,
+            "summary": r.summary,
+            "text": r.text[:280],
+            "url": r.url,
+        }
+        for r in new_records
+    ]
+    if stories:
+        items = _collapse_stories(items, stories)
+    ranked = bool(embedded)
+    if ranked:
+        vectors = doc_vectors if doc_vectors is not None else document_vectors(embedded)
+        items = select_items(items, vectors, as_unit_vector(query_vector), format_item_line)
+    unsent_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = unsent_path.with_suffix(".json.tmp")
+    tmp_path.write_text(json.dumps({"items": items, "ranked": ranked}), encoding="utf-8")
+    tmp_path.replace(unsent_path)
+    return items, ranked
+
+
+def _collapse_stories(items: list[dict], stories: dict) -> list[dict]:
+    """Keep each story's representative, noting the other sources that ran it."""
+    collapsed = []
+    for item in items:
+        key = (item["source"], item["external_id"])
+        story = stories.get(key)
+        if story is None:
+            collapsed.append(item)
+        elif story.representative == key:
+            collapsed.append({**item, "also_in": [src for src in story.sources if src != item["source"]]})
+    return collapsed
+
+
+def _print_idea_cache_stats() -> None:
+    stats = cache_stats()
+    if stats["hit_rate"] is not None:
+        print(f"Idea cache: {stats['hits']} hit(s), {stats['misses']} miss(es), hit rate {stats['hit_rate']:.0%}")
+
+
+def ingest_sources(
+    queries: Sequence[str],
+    max_posts: int,
+    due_only: bool = False,
+) -> tuple[list[ContentRecord], list[EmbeddingRecord]]:
+    """Fetch every source once and embed what's new; returns (new_records, embedded).
+
+    Items queued by scripts/poll_sources.py since the last run count as new.
+    """
     rss_url = os.environ.get("BLOG_RSS_URL")
     base_url = os.environ.get("BLOG_WP_BASE_URL")
     nyt_api_key = os.environ.get("NYT_API_KEY")
 
+    queued_items, polled = claim_polled()
+    queued = [record_from_json(item) for item in queued_items]
     records: list[ContentRecord] = []
 
+    def _fetch(stage_name: str, build, *args, **kwargs) -> None:
+        with stage(stage_name):
+            fetched = build(*args, **kwargs)
+        count(stage_name, items=len(fetched))
+        records.extend(fetched)
+
     if rss_url:
-        records.extend(build_rss_records(rss_url, limit=50, source_label="rss"))
+        _fetch("fetch.rss", build_rss_records, rss_url, limit=50, source_label="rss")
     # External public feeds
-    for label, feed_url in EXTERNAL_FEEDS:
-        records.extend(build_rss_records(feed_url, limit=50, source_label=label))
+    feeds = due_sources(feed_sources()) if due_only else feed_sources()
+    for feed in feeds:
+        _fetch("fetch.rss", build_rss_records, feed.url, limit=50, source_label=feed.label)
     if base_url:
-        records.extend(build_wordpress_records(base_url, max_posts=max_posts))
+        _fetch("fetch.wordpress", build_wordpress_records, base_url, max_posts=max_posts)
     if nyt_api_key:
-        records.extend(build_nyt_records(nyt_api_key, query=query))
+        _fetch("fetch.nyt", build_nyt_records, nyt_api_key, queries=queries)
+    # The poller keeps the schedule of the feeds it fetched; this run's refetch of
+    # them mostly finds its queued items again and would read as an empty fetch.
+    scheduled = [feed for feed in feeds if feed.label not in polled]
 
-    if not records:
+    if not records and not queued:
         print("No content fetched.")
-        ideas = build_content_ideas([], query)
-        body = build_email_body(query=query, per_source=3)
-        body = body + "\n\n---\nContent ideas (GPT)\n" + ideas
-        if send:
-            to_addr = os.environ.get("EMAIL_TO")
-            if not to_addr:
-                raise RuntimeError("EMAIL_TO must be set to send email")
-            subject = f"Content Radar — {query}"
-            send_email(to_addr, subject, body)
-            print(f"Sent digest to {to_addr}")
-        else:
-            print(body)
-        return
-
-    known = known_content_keys()
-    new_records = [r for r in records if (r.source, r.external_id) not in known]
+        record_fetches({feed.label: 0 for feed in scheduled})
+        return [], []
+
+    stored = known_content_keys()
+    # A queued item is already stored if the run that claimed it died before releasing the queue.
+    queued = [r for r in queued if (r.source, r.external_id) not in stored]
+    known = stored | {(r.source, r.external_id) for r in queued}
+    new_records = queued + [r for r in records if (r.source, r.external_id) not in known]
+    count("ingest", fetched=len(records), queued=len(queued), new=len(new_records))
+    record_fetches(
+        {feed.label: sum(1 for r in new_records[len(queued):] if r.source == feed.label) for feed in scheduled}
+    )
+
+    if not new_records:
+        print("No new content to ingest (all items already indexed).")
+        release_polled()
+        return [], []
+
+    # Archive raw text for blog posts (WordPress).
+    write_raw_texts(
+        ("wordpress", rec.external_id, rec.text) for rec in new_records if rec.source == "wordpress" and rec.text
+    )
+
+    print(f"Ingesting {len(new_records)} new record(s) from RSS/WordPress/NYT...")
+    embedded = store_content(new_records)
+    release_polled()
+    return new_records, embedded
+
+
+def _load_once(loader: Callable[[], T]) -> Callable[[], T]:
+    """Wrap `loader` so concurrent callers share a single call."""
+    lock = threading.Lock()
+    loaded: list = []
+
+    def load() -> T:
+        with lock:
+            if not loaded:
+                loaded.append(loader())
+        return loaded[0]
+
+    return load
+
+
+def build_digest(
+    digest: DigestSpec,
+    new_records: list[ContentRecord],
+    embedded: list[EmbeddingRecord],
+    index: dict,
+    embed: Callable[[str], list[float]],
+    load_memory: Callable[[], EmbeddingBatch],
+    doc_vectors: Optional[dict] = None,
+    stories: Optional[dict] = None,
+    refresh_ideas: bool = False,
+    full_recompute: bool = False,
+) -> str:
+    """Search results plus LLM ideas for one digest; safe to run in a worker thread.
+
+    Search results come from the digest's standing query, which scores only
+    chunks added since its last run unless a full recompute is due.
+    """
+    with profile_stage("digest"):
+        return _build_digest(
+            digest, new_records, embedded, index, embed, load_memory, doc_vectors, stories, refresh_ideas, full_recompute
+        )
 
-    if new_records:
-        # Persist raw .txt artifacts for blog posts (WordPress).
-        for rec in new_records:
-            if rec.source == "wordpress" and rec.text:
-                write_raw_text("wordpress", rec.external_id, rec.text)
 
-        print(f"Ingesting {len(new_records)} new record(s) from RSS/WordPress/NYT...")
-        store_content(new_records)
-    else:
-        print("No new content to ingest (all items already indexed).")
+def _build_digest(
+    digest: DigestSpec,
+    new_records: list[ContentRecord],
+    embedded: list[EmbeddingRecord],
+    index: dict,
+    embed: Callable[[str], list[float]],
+    load_memory: Callable[[], EmbeddingBatch],
+    doc_vectors: Optional[dict],
+    stories: Optional[dict],
+    refresh_ideas: bool,
+    full_recompute: bool,
+) -> str:
+    results, query_vector = standing_results(
+        digest.slug,
+        digest.query,
+        digest.per_source,
+        embed=embed,
+        load_all=load_memory,
+        full=full_recompute,
+    )
+    items, ranked = _idea_items(new_records, embedded, query_vector, digest, doc_vectors, stories)
+    ideas = build_content_ideas(
+        items,
+        digest.query,
+        refresh=refresh_ideas,
+        ranked=ranked,
+        prompt=digest.prompt,
+        prompt_path=digest.prompt_path,
+    )
+    body = build_email_body(
+        query=digest.query, per_source=digest.per_source, index=index, results=results, stories=stories
+    )
+    return body + "\n\n---\nContent ideas (GPT)\n" + ideas
+
+
+def daily_scan(
+    digests: Sequence[DigestSpec],
+    max_posts: int,
+    send: bool,
+    due_only: bool = False,
+    refresh_ideas: bool = False,
+    full_recompute: bool = False,
+) -> None:
+    load_dotenv()
 
-    ideas = build_content_ideas([r.__dict__ for r in new_records] if new_records else [], query)
-    body = build_email_body(query=query, per_source=3)
-    body = body + "\n\n---\nContent ideas (GPT)\n" + ideas
+    queries = [digest.query for digest in digests]
+    with profile_stage("ingest"):
+        new_records, embedded = ingest_sources(queries, max_posts=max_posts, due_only=due_only)
+
+    with profile_stage("prepare"):
+        # Shared across digests and computed at most once: one embeddings call for
+        # queries without a stored vector, one load of the content index, one set of
+        # document vectors, and the full memory only if some digest must recompute.
+        states = {digest.slug: load_standing_query(digest.slug) for digest in digests}
+        to_embed = list(
+            dict.fromkeys(
+                digest.query
+                for digest in digests
+                if states[digest.slug] is None or states[digest.slug].query != digest.query
+            )
+        )
+        query_vectors = dict(zip(to_embed, embed_queries(to_embed)))
+        index = _load_content_index()
+        doc_vectors = document_vectors(embedded) if embedded else None
+        # Group the day's new documents into stories so a breaking story costs one
+        # prompt line and one email entry instead of one per outlet.
+        clusters = cluster_documents(doc_vectors) if doc_vectors else []
+        if clusters:
+            print(f"Grouped {len(doc_vectors)} new document(s) into {len(clusters)} story cluster(s)")
+        stories = story_index(clusters)
+    load_memory = _load_once(load_embedding_batch)
+
+    with ThreadPoolExecutor(max_workers=max(1, min(DIGEST_WORKERS, len(digests)))) as pool:
+        futures = [
+            pool.submit(
+                build_digest,
+                digest,
+                new_records,
+                embedded,
+                index,
+                query_vectors.__getitem__,
+                load_memory,
+                doc_vectors,
+                stories,
+                refresh_ideas,
+                full_recompute,
+            )
+            for digest in digests
+        ]
+        with stage("digests", items=len(digests)):
+            bodies = [future.result() for future in futures]
+    _print_idea_cache_stats()
+
+    if not send:
+        for digest, body in zip(digests, bodies):
+            if len(digests) > 1:
+                print(f"===== {digest.name} =====")
+            print(body)
+        return
 
-    if send:
-        to_addr = os.environ.get("EMAIL_TO")
-        if not to_addr:
-            raise RuntimeError("EMAIL_TO must be set to send email")
-        subject = f"Content Radar — {query}"
-        send_email(to_addr, subject, body)
-        print(f"Sent digest to {to_addr}")
-    else:
-        print(body)
+    messages = []
+    for digest, body in zip(digests, bodies):
+        if not digest.recipients:
+            raise RuntimeError(f"No recipients for digest '{digest.name}'; set EMAIL_TO or 'recipients'")
+        subject = f"Content Radar — {digest.query}"
+        messages.extend((to_addr, subject, body) for to_addr in digest.recipients)
+    with profile_stage("send"):
+        errors = send_emails(messages)
+    for exc in errors:
+        print(f"⚠️  Send failed: {exc}")
+    print(f"Sent {len(messages) - len(errors)}/{len(messages)} digest email(s) for {len(digests)} digest(s)")
+    if errors:
+        # The unsent items stay, so a re-run rebuilds the same prompts.
+        raise RuntimeError(f"{len(errors)} digest email(s) failed to send")
+    _confirm_sent(digests)
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Daily scan + digest")
-    parser.add_argument("--query", required=True, help="Search query for the digest")
+    query_group = parser.add_mutually_exclusive_group(required=True)
+    query_group.add_argument("--query", help="Search query for the digest")
+    query_group.add_argument(
+        "--digests",
+        help="JSON file of digests (query, recipients, prompt); ingests once and builds each concurrently",
+    )
     parser.add_argument("--max-posts", type=int, default=120, help="Max WordPress posts to fetch")
     parser.add_argument("--send", action="store_true", help="Send email instead of printing")
+    parser.add_argument(
+        "--due-only",
+        action="store_true",
+        help="Only fetch external feeds whose poll interval has elapsed (see scripts/poll_sources.py)",
+    )
+    parser.add_argument(
+        "--refresh-ideas",
+        action="store_true",
+        help="Ignore the cached content ideas and call the LLM again (also for a re-run's unsent items)",
+    )
+    parser.add_argument(
+        "--full-recompute",
+        action="store_true",
+        help="Rescore the whole index for every digest instead of only chunks added since the last run",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write cProfile stats and tracemalloc peaks per stage to data/profiles/",
+    )
     args = parser.parse_args()
 
-    daily_scan(query=args.query, max_posts=args.max_posts, send=args.send)
+    load_dotenv()
+    digests = load_digest_config(args.digests) if args.digests else [single_digest(args.query)]
+    if args.profile:
+        enable_profiling("daily_scan")
+    start_run("daily_scan")
+    status = "error"
+    try:
+        daily_scan(
+            digests=digests,
+            max_posts=args.max_posts,
+            send=args.send,
+            due_only=args.due_only,
+            refresh_ideas=args.refresh_ideas,
+            full_recompute=args.full_recompute,
+        )
+        status = "ok"
+    finally:
+        report = write_report(
+            {"status": status, "digests": [digest.name for digest in digests], "send": args.send, "due_only": args.due_only}
+        )
+        print(f"Run report: {report}")
+        profile_dir = finish_profiling()
+        if profile_dir:
+            print(f"Profiles: {profile_dir}")
 
 
 if __name__ == "__main__":
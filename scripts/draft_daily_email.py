@@ -13,7 +13,7 @@ import json
 import os
 from pathlib import Path
 import sys
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from dotenv import load_dotenv
 
@@ -21,7 +21,10 @@ from dotenv import load_dotenv
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
 from app.email.gmail_sender import send_email
+from app.memory.clustering import StoryCluster
+from app.memory.models import EmbeddingRecord
 from app.memory.query import search_memory_grouped
+from app.profiling import enable_profiling, finish_profiling, profile_stage
 
 CONTENT_JSONL = Path("data/content_records.jsonl")
 
@@ -60,19 +63,48 @@ def _format_entry(item: dict, record: dict | None) -> str:
     return "\n".join(lines)
 
 
-def build_email_body(query: str, per_source: int) -> str:
-    index = _load_content_index()
-    results = search_memory_grouped(query=query, per_source=per_source)
+def build_email_body(
+    query: str,
+    per_source: int,
+    query_embedding: Optional[Sequence[float]] = None,
+    records: Optional[Sequence[EmbeddingRecord]] = None,
+    index: Optional[Dict[Tuple[str, str], dict]] = None,
+    results: Optional[Dict[str, List[dict]]] = None,
+    stories: Optional[Dict[Tuple[str, str], StoryCluster]] = None,
+) -> str:
+    """Format the digest; pass `results` (grouped by source) to skip the search.
+
+    With `stories` (see app/memory/clustering.py), a story is listed once, under
+    the first source that surfaces it, with the other outlets noted.
+    """
+    if index is None:
+        index = _load_content_index()
+    if results is None:
+        results = search_memory_grouped(
+            query=query, per_source=per_source, query_embedding=query_embedding, records=records
+        )
 
     parts: List[str] = [f"Content Radar — query: '{query}'"]
+    shown_stories = set()
     for source, items in results.items():
-        if not items:
+        entries: List[str] = []
+        for item in items:
+            key = (item.get("source"), item.get("external_id"))
+            story = stories.get(key) if stories else None
+            if story is not None:
+                if story.representative in shown_stories:
+                    continue
+                shown_stories.add(story.representative)
+            entry = _format_entry(item, index.get(key))
+            others = [src for src in story.sources if src != key[0]] if story is not None else []
+            if others:
+                entry += f"\n  Also covered by: {', '.join(others)}"
+            entries.append(entry)
+        if not entries:
             continue
         parts.append("")
-        parts.append(f"{source.title()} highlights ({len(items)})")
-        for item in items:
-            record = index.get((item.get("source"), item.get("external_id")))
-            parts.append(_format_entry(item, record))
+        parts.append(f"{source.title()} highlights ({len(entries)})")
+        parts.extend(entries)
     return "\n".join(parts)
 
 
@@ -81,20 +113,34 @@ def main() -> None:
     parser.add_argument("--query", required=True, help="Search query to drive the digest")
     parser.add_argument("--per-source", type=int, default=3, help="Items per source")
     parser.add_argument("--send", action="store_true", help="Send via Gmail instead of printing")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write cProfile stats and tracemalloc peaks per stage to data/profiles/",
+    )
     args = parser.parse_args()
 
     load_dotenv()
-    body = build_email_body(query=args.query, per_source=args.per_source)
-
-    if args.send:
-        to_addr = os.environ.get("EMAIL_TO")
-        if not to_addr:
-            raise RuntimeError("EMAIL_TO must be set in environment to send email")
-        subject = f"Content Radar — {args.query}"
-        send_email(to_addr, subject, body)
-        print(f"Sent to {to_addr}")
-    else:
-        print(body)
+    if args.profile:
+        enable_profiling("draft_daily_email")
+    try:
+        with profile_stage("search"):
+            body = build_email_body(query=args.query, per_source=args.per_source)
+
+        if args.send:
+            to_addr = os.environ.get("EMAIL_TO")
+            if not to_addr:
+                raise RuntimeError("EMAIL_TO must be set in environment to send email")
+            subject = f"Content Radar — {args.query}"
+            with profile_stage("send"):
+                send_email(to_addr, subject, body)
+            print(f"Sent to {to_addr}")
+        else:
+            print(body)
+    finally:
+        profile_dir = finish_profiling()
+        if profile_dir:
+            print(f"Profiles: {profile_dir}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,151 @@
+"""Serve a local directory as a minimal Drive v3 API for offline runs.
+
+Each directory becomes a folder and each file a Drive file. IDs are the
+path relative to the served root ("root" for the root itself, "/" replaced
+by "__"). Supports the calls app/sources/drive.py makes: files.list with
+"'<id>' in parents" / mimeType queries and pagination, files.get metadata,
+and files.get?alt=media downloads.
+
+Usage:
+    python scripts/fake_drive_server.py --root fixtures/drive --port 8765
+    DRIVE_API_ENDPOINT=http://127.0.0.1:8765/ ROOT_DRIVE_FOLDER_ID=root \\
+        python scripts/ingest_content.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import mimetypes
+import re
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+FOLDER_MIME = "application/vnd.google-apps.folder"
+ROOT_ID = "root"
+
+_PARENT_RE = re.compile(r"'([^']+)' in parents")
+_MIME_RE = re.compile(r"mimeType\s*=\s*'([^']+)'")
+_MODIFIED_RE = re.compile(r"modifiedTime\s*(>=|>)\s*'([^']+)'")
+
+
+def _file_id(root: Path, path: Path) -> str:
+    rel = path.relative_to(root).as_posix()
+    return rel.replace("/", "__") if rel != "." else ROOT_ID
+
+
+def _path_for(root: Path, file_id: str) -> Path:
+    if file_id == ROOT_ID:
+        return root
+    path = (root / file_id.replace("__", "/")).resolve()
+    if root not in path.parents:
+        raise FileNotFoundError(file_id)
+    return path
+
+
+def _metadata(root: Path, path: Path) -> dict:
+    stat = path.stat()
+    modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+    meta = {
+        "id": _file_id(root, path),
+        "name": path.name,
+        "mimeType": FOLDER_MIME if path.is_dir() else (mimetypes.guess_type(path.name)[0] or "application/octet-stream"),
+        "modifiedTime": modified,
+        "createdTime": modified,
+    }
+    if path.is_file():
+        meta["size"] = str(stat.st_size)
+        meta["md5Checksum"] = hashlib.md5(path.read_bytes()).hexdigest()
+    return meta
+
+
+def make_handler(root: Path):
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, payload: dict, status: int = 200) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self) -> None:  # noqa: N802 - http.server API
+            parsed = urlparse(self.path)
+            params = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+            parts = [p for p in parsed.path.split("/") if p]
+            # [/drive/v3]/files[/<id>]; the prefix is dropped when the client's
+            # api_endpoint override replaces the whole base URL.
+            if parts[:2] == ["drive", "v3"]:
+                parts = parts[2:]
+            if parts[:1] != ["files"]:
+                self._send_json({"error": {"code": 404, "message": "not found"}}, 404)
+                return
+            try:
+                if len(parts) == 1:
+                    self._list(params)
+                else:
+                    self._get(parts[1], params)
+            except FileNotFoundError:
+                self._send_json({"error": {"code": 404, "message": "File not found"}}, 404)
+
+        def _list(self, params: dict) -> None:
+            q = params.get("q", "")
+            parent = _PARENT_RE.search(q)
+            folder = _path_for(root, parent.group(1)) if parent else root
+            if not folder.is_dir():
+                raise FileNotFoundError(str(folder))
+            mimes = set(_MIME_RE.findall(q))
+            modified = _MODIFIED_RE.search(q)
+
+            files = [_metadata(root, p) for p in sorted(folder.iterdir()) if not p.name.startswith(".")]
+            if mimes:
+                files = [f for f in files if f["mimeType"] in mimes]
+            if modified:
+                op, value = modified.groups()
+                files = [f for f in files if (f["modifiedTime"] > value if op == ">" else f["modifiedTime"] >= value)]
+
+            offset = int(params.get("pageToken") or 0)
+            page_size = int(params.get("pageSize") or 100)
+            payload = {"files": files[offset : offset + page_size]}
+            if offset + page_size < len(files):
+                payload["nextPageToken"] = str(offset + page_size)
+            self._send_json(payload)
+
+        def _get(self, file_id: str, params: dict) -> None:
+            path = _path_for(root, file_id)
+            if not path.exists():
+                raise FileNotFoundError(file_id)
+            if params.get("alt") != "media":
+                self._send_json(_metadata(root, path))
+                return
+            body = path.read_bytes()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/octet-stream")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, fmt: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve a directory as a fake Drive v3 API")
+    parser.add_argument("--root", required=True, help="Directory to expose as the Drive root")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    root = Path(args.root).resolve()
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(root))
+    print(f"Fake Drive serving {root} at http://{args.host}:{args.port}/ (root id '{ROOT_ID}')")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""List the existing posts/TikToks each new external document relates to.
+
+Runs one local similarity join over the stored chunk embeddings (no API
+calls): every document from the new sources gets its top-k most similar
+documents from the existing sources.
+
+Usage:
+    python scripts/find_connections.py --new-sources wsj_markets,cnbc_top,nyt [--existing-sources wordpress,tiktok] [--top-k 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure repo root imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.similarity_join import load_new_records, similarity_join
+from scripts.draft_daily_email import _load_content_index
+
+
+def _split(value: str) -> list[str]:
+    return [part.strip() for part in value.split(",") if part.strip()]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Match new documents to related existing content")
+    parser.add_argument("--new-sources", required=True, help="Comma-separated sources to match from")
+    parser.add_argument("--existing-sources", default="wordpress,tiktok", help="Comma-separated sources to match against")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--min-score", type=float, default=0.0, help="Hide matches below this cosine similarity")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    new_records = load_new_records(_split(args.new_sources))
+    matches = similarity_join(new_records, _split(args.existing_sources), top_k=args.top_k)
+    elapsed = time.perf_counter() - start
+
+    index = _load_content_index()
+    for (source, external_id), related in matches.items():
+        related = [m for m in related if m["score"] >= args.min_score]
+        if not related:
+            continue
+        title = (index.get((source, external_id)) or {}).get("title") or external_id
+        print(f"[{source}] {title}")
+        for match in related:
+            record = index.get((match["source"], match["external_id"])) or {}
+            print(f"  {match['score']:.3f} [{match['source']}] {record.get('title') or match['external_id']}")
+    print(f"Joined {len(new_records)} new chunk(s) across {len(matches)} document(s) in {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
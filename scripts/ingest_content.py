@@ -7,19 +7,25 @@ import os
 import sys
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, List
+from typing import Iterable, List, Optional
 
 from dotenv import load_dotenv
 
 # Ensure repo root is importable when running as a script
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 
+from app.memory.batch_embed import export_batch_job, pending_content_keys
+from app.memory.backfill import BACKFILL_CHUNKSIZE, BACKFILL_WORKERS, batched, prepare_records
 from app.memory.ingest import store_content
-from app.memory.models import ContentRecord
+from app.memory.models import ContentRecord, EmbeddingRecord
 from app.memory.storage import known_content_keys
-from app.memory.raw_text import write_raw_text
-from app.sources.drive import load_transcripts_from_root
-from app.sources.wordpress import fetch_wp_posts_all
+from app.memory.raw_text import write_raw_texts
+from app.profiling import enable_profiling, finish_profiling, profile_stage
+from app.sources.transcript_mirror import load_mirrored_transcripts, sync_transcripts
+from app.sources.wordpress import extract_post, fetch_wp_posts_all
+
+# Records per embed+upsert round in backfill mode.
+BACKFILL_STORE_BATCH = int(os.environ.get("BACKFILL_STORE_BATCH", "64"))
 
 
 def _parse_iso8601(value: str | None) -> datetime | None:
@@ -41,64 +47,151 @@ def _summarize(text: str, max_chars: int = 320) -> str:
     return text[: max_chars - 1].rsplit(" ", 1)[0] + "…"
 
 
+def wordpress_record(post: dict) -> Optional[ContentRecord]:
+    text = (post.get("content_text") or "").strip()
+    excerpt = (post.get("excerpt_text") or "").strip()
+    summary = excerpt or _summarize(text)
+    if not text:
+        text = summary
+    if not text:
+        return None
+    return ContentRecord(
+        source="wordpress",
+        external_id=str(post.get("slug") or post.get("id")),
+        title=(post.get("title") or "").strip(),
+        url=post.get("link"),
+        published_at=_parse_iso8601(post.get("date")),
+        summary=summary,
+        text=text,
+        media_type="article",
+        extra={
+            "wordpress_id": post.get("id"),
+        },
+    )
+
+
+def wordpress_record_from_api(post: dict) -> Optional[ContentRecord]:
+    """Backfill builder: HTML extraction happens here, inside the worker."""
+    return wordpress_record(extract_post(post))
+
+
+def tiktok_record(item: dict) -> Optional[ContentRecord]:
+    text = (item.get("text") or "").strip()
+    if not text:
+        return None
+    return ContentRecord(
+        source="tiktok",
+        external_id=item["id"],
+        title=item.get("name", "").strip(),
+        url=None,
+        published_at=_parse_iso8601(item.get("modifiedTime")),
+        summary=_summarize(text),
+        text=text,
+        media_type="video",
+        extra={
+            "drive_file_name": item.get("name"),
+        },
+    )
+
+
 def build_wordpress_records(base_url: str, max_posts: int) -> List[ContentRecord]:
     posts = fetch_wp_posts_all(base_url=base_url, max_posts=max_posts)
-    records: List[ContentRecord] = []
-
-    for post in posts:
-        text = (post.get("content_text") or "").strip()
-        excerpt = (post.get("excerpt_text") or "").strip()
-        summary = excerpt or _summarize(text)
-        if not text:
-            text = summary
-        if not text:
-            continue
-        records.append(
-            ContentRecord(
-                source="wordpress",
-                external_id=str(post.get("slug") or post.get("id")),
-                title=(post.get("title") or "").strip(),
-                url=post.get("link"),
-                published_at=_parse_iso8601(post.get("date")),
-                summary=summary,
-                text=text,
-                media_type="article",
-                extra={
-                    "wordpress_id": post.get("id"),
-                },
-            )
-        )
-    return records
-
-
-def build_tiktok_records(root_folder_id: str, transcripts_folder_name: str) -> List[ContentRecord]:
-    transcripts = load_transcripts_from_root(root_folder_id, transcripts_folder_name)
-    records: List[ContentRecord] = []
-
-    for item in transcripts:
-        text = (item.get("text") or "").strip()
-        if not text:
-            continue
-        summary = _summarize(text)
-        records.append(
-            ContentRecord(
-                source="tiktok",
-                external_id=item["id"],
-                title=item.get("name", "").strip(),
-                url=None,
-                published_at=_parse_iso8601(item.get("modifiedTime")),
-                summary=summary,
-                text=text,
-                media_type="video",
-                extra={
-                    "drive_file_name": item.get("name"),
-                },
-            )
-        )
-    return records
+    return [rec for rec in map(wordpress_record, posts) if rec is not None]
+
+
+def _load_transcripts(root_folder_id: str, transcripts_folder_name: str, full_sync: bool) -> List[dict]:
+    stats = sync_transcripts(root_folder_id, transcripts_folder_name, full=full_sync)
+    print(
+        f"Transcript mirror: {stats['listed']} listed, {stats['downloaded']} downloaded, "
+        f"{stats['removed']} removed."
+    )
+    return load_mirrored_transcripts()
+
+
+def build_tiktok_records(
+    root_folder_id: str,
+    transcripts_folder_name: str,
+    full_sync: bool = False,
+) -> List[ContentRecord]:
+    transcripts = _load_transcripts(root_folder_id, transcripts_folder_name, full_sync)
+    return [rec for rec in map(tiktok_record, transcripts) if rec is not None]
+
+
+def _write_raw(records: Iterable[ContentRecord]) -> None:
+    write_raw_texts(
+        (rec.source, rec.external_id, rec.text)
+        for rec in records
+        if rec.source in {"wordpress", "tiktok"} and rec.text
+    )
+
+
+def backfill_content(
+    max_wordpress_posts: int,
+    full_drive_sync: bool = False,
+    workers: int = BACKFILL_WORKERS,
+    chunksize: int = BACKFILL_CHUNKSIZE,
+    batch_export: bool = False,
+) -> None:
+    """Ingest with record building and chunking spread over a process pool.
+
+    Raw items are fetched up front, already-indexed ones are dropped, and the
+    rest stream back from the pool in order and are embedded and stored in
+    batches of BACKFILL_STORE_BATCH records. With `batch_export` the chunks
+    go to one batch-embedding job instead.
+    """
+    load_dotenv()
+
+    base_url = os.environ["BLOG_WP_BASE_URL"]
+    root_folder_id = os.environ["ROOT_DRIVE_FOLDER_ID"]
+    transcripts_folder_name = os.environ.get(
+        "TIKTOK_TRANSCRIPTS_FOLDER_NAME", "BFC_TikTok_Transcripts"
+    )
+
+    known = known_content_keys() | pending_content_keys()
+    with profile_stage("wordpress"):
+        posts = fetch_wp_posts_all(base_url=base_url, max_posts=max_wordpress_posts, extract=False)
+    posts = [p for p in posts if ("wordpress", str(p.get("slug") or p.get("id"))) not in known]
+    with profile_stage("tiktok"):
+        transcripts = _load_transcripts(root_folder_id, transcripts_folder_name, full_drive_sync)
+    transcripts = [t for t in transcripts if ("tiktok", t["id"]) not in known]
+
+    if not posts and not transcripts:
+        print("No new content to ingest (all items already indexed).")
+        return
+
+    print(
+        f"Backfilling {len(posts)} post(s) and {len(transcripts)} transcript(s) "
+        f"with {workers} worker(s), chunksize {chunksize}..."
+    )
+    ingested = 0
+    export_records: List[ContentRecord] = []
+    export_chunks: List[EmbeddingRecord] = []
+    with profile_stage("store_content"):
+        for build, items in ((wordpress_record_from_api, posts), (tiktok_record, transcripts)):
+            prepared = prepare_records(items, build, workers=workers, chunksize=chunksize)
+            for records, chunks in batched(prepared, BACKFILL_STORE_BATCH):
+                _write_raw(records)
+                if batch_export:
+                    export_records.extend(records)
+                    export_chunks.extend(chunks)
+                    continue
+                store_content(records, embedding_records=chunks)
+                ingested += len(records)
+                print(f"  stored {ingested} record(s)")
+        if batch_export:
+            _report_batch_job(export_batch_job(export_records, embedding_records=export_chunks))
+            return
+    print("Ingestion complete.")
 
 
-def ingest_content(max_wordpress_posts: int) -> None:
+def _report_batch_job(job_dir: Optional[Path]) -> None:
+    if job_dir is None:
+        print("No new content to export.")
+        return
+    print(f"Batch job written to {job_dir}. Submit it with: python scripts/batch_embed.py submit {job_dir.name}")
+
+
+def ingest_content(max_wordpress_posts: int, full_drive_sync: bool = False, batch_export: bool = False) -> None:
     load_dotenv()
 
     base_url = os.environ["BLOG_WP_BASE_URL"]
@@ -107,27 +200,33 @@ def ingest_content(max_wordpress_posts: int) -> None:
         "TIKTOK_TRANSCRIPTS_FOLDER_NAME", "BFC_TikTok_Transcripts"
     )
 
-    wordpress_records = build_wordpress_records(base_url, max_wordpress_posts)
-    tiktok_records = build_tiktok_records(root_folder_id, transcripts_folder_name)
+    with profile_stage("wordpress"):
+        wordpress_records = build_wordpress_records(base_url, max_wordpress_posts)
+    with profile_stage("tiktok"):
+        tiktok_records = build_tiktok_records(root_folder_id, transcripts_folder_name, full_sync=full_drive_sync)
 
     records: List[ContentRecord] = [*wordpress_records, *tiktok_records]
     if not records:
         print("No content fetched.")
         return
 
-    known = known_content_keys()
+    known = known_content_keys() | pending_content_keys()
     new_records = [r for r in records if (r.source, r.external_id) not in known]
 
     if not new_records:
         print("No new content to ingest (all items already indexed).")
         return
 
-    for rec in new_records:
-        if rec.source in {"wordpress", "tiktok"} and rec.text:
-            write_raw_text(rec.source, rec.external_id, rec.text)
+    _write_raw(new_records)
+
+    if batch_export:
+        print(f"Exporting {len(new_records)} new content record(s) as a batch-embedding job...")
+        _report_batch_job(export_batch_job(new_records))
+        return
 
     print(f"Ingesting {len(new_records)} new content record(s)...")
-    store_content(new_records)
+    with profile_stage("store_content"):
+        store_content(new_records)
     print("Ingestion complete.")
 
 
@@ -139,9 +238,61 @@ def main() -> None:
         default=200,
         help="Maximum number of WordPress posts to fetch",
     )
+    parser.add_argument(
+        "--full-drive-sync",
+        action="store_true",
+        help="List the whole transcripts folder instead of only files modified since the last sync",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write cProfile stats and tracemalloc peaks per stage to data/profiles/",
+    )
+    parser.add_argument(
+        "--backfill",
+        action="store_true",
+        help="Build records and chunks in a process pool (for large historical imports)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BACKFILL_WORKERS,
+        help="Backfill worker processes (default BACKFILL_WORKERS or the CPU count; 1 runs inline)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=BACKFILL_CHUNKSIZE,
+        help="Items handed to a backfill worker per task",
+    )
+    parser.add_argument(
+        "--batch-export",
+        action="store_true",
+        help="Write pending chunks to a batch-embedding job under data/batches/ instead of embedding now",
+    )
     args = parser.parse_args()
 
-    ingest_content(max_wordpress_posts=args.max_wordpress_posts)
+    if args.profile:
+        enable_profiling("ingest_content")
+    try:
+        if args.backfill:
+            backfill_content(
+                max_wordpress_posts=args.max_wordpress_posts,
+                full_drive_sync=args.full_drive_sync,
+                workers=args.workers,
+                chunksize=args.chunksize,
+                batch_export=args.batch_export,
+            )
+        else:
+            ingest_content(
+                max_wordpress_posts=args.max_wordpress_posts,
+                full_drive_sync=args.full_drive_sync,
+                batch_export=args.batch_export,
+            )
+    finally:
+        profile_dir = finish_profiling()
+        if profile_dir:
+            print(f"Profiles: {profile_dir}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,69 @@
+"""Build and inspect the source/month shards of the memory store.
+
+    python scripts/memory_shards.py sync [--rebuild]
+    python scripts/memory_shards.py stats
+    python scripts/memory_shards.py search "merchant cash advance" [--source hackernews] [--since-days 30] [--workers 4]
+
+search_memory uses the shards when MEMORY_SHARDS=1 and syncs them itself;
+running `sync` after ingest just moves that cost out of the first search.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure repo root is importable when running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.query import embed_query
+from app.memory.shards import SCAN_WORKERS, SHARDS_DIR, load_shard_manifest, search_shards, sync_shards
+
+
+def _stats() -> None:
+    manifest = load_shard_manifest()
+    print(f"Model: {manifest['model']}  updated {manifest.get('updated_at', 'never')}")
+    total_rows = total_bytes = 0
+    for shard in sorted(manifest["shards"], key=lambda s: (s["source"], s["month"])):
+        path = SHARDS_DIR / shard["source"] / f"{shard['name']}.vectors.npy"
+        size = path.stat().st_size if path.exists() else 0
+        total_rows += shard["rows"]
+        total_bytes += size
+        print(f"{shard['source']:<20} {shard['month']}  {shard['rows']:>9} chunks {size / 1e6:>9.1f} MB")
+    print(f"{len(manifest['shards'])} shard(s), {total_rows} chunks, {total_bytes / 1e6:.1f} MB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Source/month shards of the memory store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync = sub.add_parser("sync", help="Rebuild shards whose rows changed")
+    sync.add_argument("--rebuild", action="store_true", help="Rewrite every shard")
+    sub.add_parser("stats", help="List shards and sizes")
+    search = sub.add_parser("search", help="Search the shards for a query")
+    search.add_argument("query")
+    search.add_argument("--source", action="append", help="Restrict to a source (repeatable)")
+    search.add_argument("--since-days", type=float, help="Only chunks ingested in the last N days")
+    search.add_argument("--top-k", type=int, default=10)
+    search.add_argument("--workers", type=int, default=SCAN_WORKERS)
+    args = parser.parse_args()
+    load_dotenv()
+
+    if args.command == "sync":
+        stats = sync_shards(rebuild=args.rebuild)
+        print(f"{stats['built']} built, {stats['kept']} unchanged, {stats['removed']} file(s) removed")
+    elif args.command == "stats":
+        _stats()
+    else:
+        since = time.time() - args.since_days * 86400 if args.since_days else None
+        sync_shards()
+        vector = embed_query(args.query)
+        for item in search_shards(vector, sources=args.source, top_k=args.top_k, since=since, workers=args.workers):
+            print(f"{item['score']:.3f} {item['source']}/{item['external_id']}: {item['text_excerpt'][:100]}")
+
+
+if __name__ == "__main__":
+    main()
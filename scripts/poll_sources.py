@@ -0,0 +1,85 @@
+"""Fetch only the external feeds that are due and queue their new items.
+
+Meant to run often (e.g. hourly from cron) alongside the once-a-day digest:
+each feed is polled on its own interval from app/sources/registry.py, so
+fast aggregators are caught before items scroll off while quiet blogs are
+fetched rarely. New items wait in data/poll_queue.jsonl; the next
+daily_scan ingests them as part of its digest.
+
+Usage:
+    python scripts/poll_sources.py [--dry-run]
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure repo root imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.ingest import record_to_json
+from app.memory.storage import known_content_keys
+from app.sources.registry import due_sources, feed_sources, load_schedule, queue_polled, queued_keys, record_fetches
+from scripts.daily_scan import build_rss_records
+
+
+def poll_sources(dry_run: bool = False) -> None:
+    load_dotenv()
+
+    sources = feed_sources()
+    due = due_sources(sources)
+    if not due:
+        print("No feeds due.")
+        return
+    if dry_run:
+        print("Due: " + ", ".join(feed.label for feed in due))
+        return
+
+    known = known_content_keys() | queued_keys()
+    yields: dict[str, int] = {}
+    for feed in due:
+        try:
+            records = build_rss_records(feed.url, limit=50, source_label=feed.label)
+        except Exception as exc:  # one broken feed should not block the others
+            print(f"⚠️  {feed.label}: {exc}")
+            continue
+        fresh = [r for r in records if (r.source, r.external_id) not in known]
+        known.update((r.source, r.external_id) for r in fresh)
+        queue_polled(feed.label, [record_to_json(r) for r in fresh])
+        yields[feed.label] = len(fresh)
+        print(f"{feed.label}: {len(fresh)} new of {len(records)}")
+
+    queued = sum(yields.values())
+    if queued:
+        print(f"Queued {queued} new record(s) for the next digest.")
+    record_fetches(yields)
+
+    schedule = load_schedule()
+    now = time.time()
+    print("\nNext polls:")
+    for feed in sources:
+        state = schedule.get(feed.label)
+        if not state or state.get("last_fetch") is None:
+            continue
+        due_in_h = (state["last_fetch"] + state["interval_h"] * 3600 - now) / 3600
+        print(
+            f"  {feed.label:<20} every {state['interval_h']:>5.1f}h, "
+            f"yield {state['yield_ema'] or 0:>5.1f}/fetch, next in {max(0.0, due_in_h):.1f}h"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Poll feeds that are due")
+    parser.add_argument("--dry-run", action="store_true", help="List due feeds without fetching")
+    args = parser.parse_args()
+
+    poll_sources(dry_run=args.dry_run)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""Inspect and convert the packed raw-text archive (data/raw_archive/).
+
+    python scripts/raw_archive.py stats
+    python scripts/raw_archive.py get wordpress my-post-slug
+    python scripts/raw_archive.py export out/raw [--source wordpress]
+    python scripts/raw_archive.py import-loose [--dir data/raw] [--delete]
+
+import-loose packs the old one-file-per-item data/raw/ tree (ids are taken
+from the file names) and, with --delete, removes the loose files afterwards.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+# Ensure repo root is importable when running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.raw_text import RAW_DIR, archive_stats, export_raw_texts, import_loose_files, read_raw_text
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Packed raw-text archive tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("stats")
+    get = sub.add_parser("get", help="Print one archived text")
+    get.add_argument("source")
+    get.add_argument("external_id")
+    export = sub.add_parser("export", help="Write loose <source>/<id>.txt files")
+    export.add_argument("out_dir")
+    export.add_argument("--source", action="append")
+    loose = sub.add_parser("import-loose", help="Pack an existing data/raw tree")
+    loose.add_argument("--dir", default=str(RAW_DIR))
+    loose.add_argument("--delete", action="store_true", help="Remove the loose files once packed")
+    args = parser.parse_args()
+
+    if args.command == "stats":
+        stats = archive_stats()
+        ratio = stats["text_bytes"] / stats["stored_bytes"] if stats["stored_bytes"] else 0
+        print(
+            f"{stats['items']} item(s), {stats['unique_texts']} unique text(s) in {stats['shards']} shard(s): "
+            f"{stats['text_bytes'] / 1e6:.1f} MB text -> {stats['shard_bytes'] / 1e6:.1f} MB on disk ({ratio:.1f}x)"
+        )
+    elif args.command == "get":
+        text = read_raw_text(args.source, args.external_id)
+        if text is None:
+            raise SystemExit(f"Not archived: {args.source}/{args.external_id}")
+        sys.stdout.write(text)
+    elif args.command == "export":
+        print(f"Exported {export_raw_texts(Path(args.out_dir), args.source)} file(s) to {args.out_dir}")
+    elif args.command == "import-loose":
+        files = sorted(Path(args.dir).glob("*/*.txt"))
+        stats = import_loose_files(Path(args.dir))
+        print(f"Packed {len(files)} file(s): {stats}")
+        if args.delete:
+            for path in files:
+                path.unlink()
+            print(f"Removed {len(files)} loose file(s).")
+
+
+if __name__ == "__main__":
+    main()
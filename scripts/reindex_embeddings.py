@@ -0,0 +1,106 @@
+"""Re-embed the memory store with another model through a shadow index.
+
+    python scripts/reindex_embeddings.py --model text-embedding-3-small [--dimensions 1024] \
+        [--rate 3000] [--batch 256] [--max-minutes 60] [--no-switch]
+    python scripts/reindex_embeddings.py --status
+    python scripts/reindex_embeddings.py --switch      # switch now if coverage is 100%
+    python scripts/reindex_embeddings.py --abort
+
+Search and ingest keep using the current index while this runs. Stop it at
+any time; the same command resumes where it left off. When every live chunk
+is covered the shadow becomes the live index in one transaction. Run it
+under nohup or cron with --max-minutes to spread the cost.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+# Ensure repo root is importable when running as a script
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.memory.reindex import (
+    REINDEX_BATCH_CHUNKS,
+    REINDEX_CHUNKS_PER_MIN,
+    abort_reindex,
+    reindex_status,
+    run_reindex,
+    start_reindex,
+    switchover,
+)
+from app.memory.storage import active_embedding_model
+
+
+def format_status(status: dict) -> str:
+    rate = status["chunks_per_s"]
+    eta = status["eta_s"]
+    return (
+        f"{status['covered']}/{status['total']} chunks ({status['coverage']:.1%}) "
+        f"-> {status['model']}{'@' + str(status['dimensions']) if status.get('dimensions') else ''} | "
+        f"{status['embedded']} embedded, {status['tokens']} tokens | "
+        f"{f'{rate:.1f} chunks/s' if rate else '- chunks/s'} | "
+        f"ETA {f'{eta / 60:.1f} min' if eta is not None else '-'}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Shadow re-index of the embedding store")
+    parser.add_argument("--model", help="Target embedding model")
+    parser.add_argument("--dimensions", type=int, help="Requested output dimensions (text-embedding-3 models)")
+    parser.add_argument("--rate", type=float, default=REINDEX_CHUNKS_PER_MIN, help="Max chunks per minute (0 = unthrottled)")
+    parser.add_argument("--batch", type=int, default=REINDEX_BATCH_CHUNKS, help="Chunks per embeddings call")
+    parser.add_argument("--max-minutes", type=float, help="Stop after this long; rerun to resume")
+    parser.add_argument("--no-switch", action="store_true", help="Fill the shadow but keep serving the old index")
+    parser.add_argument("--restart", action="store_true", help="Drop a shadow built for a different target")
+    parser.add_argument("--report-every", type=float, default=30.0, help="Seconds between progress lines")
+    parser.add_argument("--status", action="store_true")
+    parser.add_argument("--switch", action="store_true")
+    parser.add_argument("--abort", action="store_true")
+    args = parser.parse_args()
+    load_dotenv()
+
+    if args.abort:
+        abort_reindex()
+        print("Re-index aborted; shadow dropped.")
+        return
+    if args.status or args.switch:
+        model, dimensions = active_embedding_model()
+        print(f"Active: {model}{'@' + str(dimensions) if dimensions else ''}")
+        status = reindex_status()
+        print(format_status(status) if status else "No re-index in progress.")
+        if args.switch and status:
+            print("Switched over." if switchover() else "Not switched: shadow does not cover every chunk yet.")
+        return
+    if not args.model:
+        parser.error("--model is required to start or resume a re-index")
+
+    start_reindex(args.model, args.dimensions, restart=args.restart)
+    print(format_status(reindex_status()))
+    last_report = [time.monotonic()]
+
+    def report(status: dict) -> None:
+        if time.monotonic() - last_report[0] >= args.report_every:
+            print(format_status(status), flush=True)
+            last_report[0] = time.monotonic()
+
+    switched = run_reindex(
+        chunks_per_min=args.rate,
+        batch=args.batch,
+        max_seconds=args.max_minutes * 60 if args.max_minutes else None,
+        switch=not args.no_switch,
+        report=report,
+    )
+    if switched:
+        print(f"Coverage reached 100%; now serving {args.model}.")
+    else:
+        print(format_status(reindex_status()))
+        print("Stopped before switchover; rerun to resume.")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,4 +11,14 @@ MAX_POSTS=${MAX_POSTS:-120}
 export IDEA_SYSTEM_PROMPT_PATH=${IDEA_SYSTEM_PROMPT_PATH:-"app/llm/prompts/content_radar_system.md"}
 
 # Ensure .env is picked up by the Python script (load_dotenv runs inside)
-"${PYTHON_BIN}" scripts/daily_scan.py --query "$QUERY" --max-posts "$MAX_POSTS" --send
+# DIGESTS_CONFIG (JSON file of query/recipients/prompt digests) replaces QUERY/EMAIL_TO.
+if [[ -n "${DIGESTS_CONFIG:-}" ]]; then
+  "${PYTHON_BIN}" scripts/daily_scan.py --digests "$DIGESTS_CONFIG" --max-posts "$MAX_POSTS" --send
+else
+  "${PYTHON_BIN}" scripts/daily_scan.py --query "$QUERY" --max-posts "$MAX_POSTS" --send
+fi
+
+# Move feed chunks past their retention to the cold archive (opt-in).
+if [[ -n "${RETENTION_POLICY_PATH:-}" ]]; then
+  "${PYTHON_BIN}" scripts/archive_memory.py
+fi
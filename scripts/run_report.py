@@ -0,0 +1,96 @@
+"""Summarize the JSON run reports under data/runs/.
+
+Prints one line per run (wall time, items, chunks scored, API calls,
+tokens) and then compares the latest run's stage timings with the median of
+the earlier ones, flagging stages that slowed down.
+
+Usage:
+    python scripts/run_report.py [--run daily_scan] [--last 14] [--threshold 1.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+from pathlib import Path
+
+# Ensure repo root imports
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.metrics import RUNS_DIR
+
+
+def load_reports(run: str | None, last: int) -> list[dict]:
+    reports = []
+    for path in sorted(RUNS_DIR.glob("*.json")):
+        try:
+            report = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            continue
+        if run and report.get("run") != run:
+            continue
+        reports.append(report)
+    return reports[-last:]
+
+
+def _stat(report: dict, stage: str, key: str) -> float:
+    return report.get("stages", {}).get(stage, {}).get(key, 0)
+
+
+def _sum(report: dict, key: str) -> float:
+    return sum(values.get(key, 0) for values in report.get("stages", {}).values())
+
+
+def print_runs(reports: list[dict]) -> None:
+    print(
+        f"{'started (UTC)':<20} {'run':<12} {'status':<7} {'wall s':>7} {'fetched':>8} {'new':>5} "
+        f"{'embedded':>9} {'scored':>8} {'api':>5} {'tokens':>8}"
+    )
+    for report in reports:
+        tokens = _stat(report, "embed", "tokens") + _stat(report, "llm.ideas", "prompt_tokens") + _stat(
+            report, "llm.ideas", "completion_tokens"
+        )
+        scored = _stat(report, "search", "chunks") + _stat(report, "search.standing", "chunks")
+        print(
+            f"{report.get('started_at', '')[:19]:<20} {report.get('run') or '':<12} "
+            f"{report.get('meta', {}).get('status', ''):<7} {report.get('wall_seconds', 0):>7.1f} "
+            f"{_stat(report, 'ingest', 'fetched'):>8.0f} {_stat(report, 'ingest', 'new'):>5.0f} "
+            f"{_stat(report, 'embed', 'chunks'):>9.0f} {scored:>8.0f} {_sum(report, 'api_calls'):>5.0f} {tokens:>8.0f}"
+        )
+
+
+def print_regressions(reports: list[dict], threshold: float) -> None:
+    if len(reports) < 3:
+        print("\nNeed at least 3 runs to compare stage timings.")
+        return
+    latest, history = reports[-1], reports[:-1]
+    print(f"\nLatest run vs median of previous {len(history)} (flagged at {threshold:.1f}x):")
+    print(f"{'stage':<18} {'latest s':>9} {'median s':>9} {'ratio':>6}")
+    for name, values in sorted(latest.get("stages", {}).items()):
+        previous = [r["stages"][name]["seconds"] for r in history if name in r.get("stages", {})]
+        median = statistics.median(previous) if previous else 0.0
+        if median <= 0:
+            continue
+        ratio = values.get("seconds", 0) / median
+        flag = "  ⚠️" if ratio >= threshold and values.get("seconds", 0) >= 0.5 else ""
+        print(f"{name:<18} {values.get('seconds', 0):>9.2f} {median:>9.2f} {ratio:>6.2f}{flag}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Summarize run reports and flag slow stages")
+    parser.add_argument("--run", default="daily_scan", help="Only reports from this run name ('' for all)")
+    parser.add_argument("--last", type=int, default=14, help="How many recent runs to show")
+    parser.add_argument("--threshold", type=float, default=1.5, help="Slowdown ratio that flags a stage")
+    args = parser.parse_args()
+
+    reports = load_reports(args.run or None, args.last)
+    if not reports:
+        raise SystemExit(f"No run reports in {RUNS_DIR}")
+    print_runs(reports)
+    print_regressions(reports, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
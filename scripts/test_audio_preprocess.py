@@ -0,0 +1,74 @@
+"""Check audio-only preprocessing against local video files.
+
+Reports original vs. uploaded bytes and segment layout per file. With
+--transcribe it also sends both the original file (when under the API
+limit) and the prepared segments to OpenAI and compares latency.
+
+Usage:
+    python scripts/test_audio_preprocess.py samples/*.mp4 [--max-upload-mb 25] [--transcribe]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from dotenv import load_dotenv
+
+from app.transcribe.audio import MAX_UPLOAD_BYTES, ffmpeg_available, prepare_audio, probe_duration
+
+
+def _transcribe(client, path: Path) -> tuple[str, float]:
+    started = time.perf_counter()
+    with open(path, "rb") as fh:
+        response = client.audio.transcriptions.create(model="gpt-4o-mini-transcribe", file=fh)
+    return (response.text or "").strip(), time.perf_counter() - started
+
+
+parser = argparse.ArgumentParser(description="Audio-only preprocessing check")
+parser.add_argument("files", nargs="+", type=Path)
+parser.add_argument("--max-upload-mb", type=float, default=MAX_UPLOAD_BYTES / (1024 * 1024))
+parser.add_argument("--transcribe", action="store_true", help="Also call the transcription API")
+args = parser.parse_args()
+
+if not ffmpeg_available():
+    raise SystemExit("❌ ffmpeg/ffprobe not found on PATH")
+
+client = None
+if args.transcribe:
+    load_dotenv()
+    from openai import OpenAI
+
+    client = OpenAI()
+
+max_bytes = int(args.max_upload_mb * 1024 * 1024)
+for video in args.files:
+    with tempfile.TemporaryDirectory() as tmpdir:
+        started = time.perf_counter()
+        segments = prepare_audio(video, Path(tmpdir), max_bytes=max_bytes)
+        prep_s = time.perf_counter() - started
+
+        original = video.stat().st_size
+        prepared = sum(s.stat().st_size for s in segments)
+        print(f"✅ {video.name}: {original / 1e6:.1f} MB -> {prepared / 1e6:.2f} MB "
+              f"({prepared / original:.1%}) in {len(segments)} segment(s), prep {prep_s:.1f}s")
+        for seg in segments:
+            print(f"   {seg.name}: {probe_duration(seg):.1f}s, {seg.stat().st_size / 1e6:.2f} MB")
+
+        if client:
+            if original <= MAX_UPLOAD_BYTES:
+                _, full_s = _transcribe(client, video)
+                print(f"   original upload: {full_s:.1f}s")
+            else:
+                print("   original upload: skipped (over API limit)")
+            seg_s = 0.0
+            parts = []
+            for seg in segments:
+                text, elapsed = _transcribe(client, seg)
+                parts.append(text)
+                seg_s += elapsed
+            print(f"   audio-only upload: {seg_s:.1f}s, {len(' '.join(parts).split())} words")
+    print("")
@@ -13,18 +13,29 @@ transcripts folder. Requires:
 
 Usage:
     python scripts/transcribe_tiktok_videos.py [--limit 3] [--force]
+        [--download-workers 2] [--transcribe-workers 2] [--upload-workers 2]
 
 By default, already-transcribed videos are skipped (matching on base filename).
 Use --force to regenerate transcripts.
+
+Videos flow through download -> transcribe -> upload stages connected by
+bounded queues, each stage with its own worker count. Job state is kept in
+`data/transcribe_jobs.sqlite` and artifacts under `data/transcribe_work/`,
+so a rerun after a crash resumes each video at the stage it had reached.
+
+With --audio-only (requires ffmpeg), only a compressed mono audio track is
+uploaded, split at silences when it exceeds --max-upload-mb; the segment
+transcripts are joined back in order.
 """
 
 from __future__ import annotations
 
 import argparse
 import os
+import shutil
 from pathlib import Path
 import sys
-import tempfile
+import time
 
 from dotenv import load_dotenv
 
@@ -39,6 +50,10 @@ from app.sources.drive import (
     list_files,
     upload_text_file,
 )
+from app.transcribe import jobs
+from app.transcribe.audio import MAX_UPLOAD_BYTES, ffmpeg_available, prepare_audio
+from app.transcribe.pipeline import Stage, run_pipeline
+from app.profiling import enable_profiling, finish_profiling, profile_stage
 
 VIDEO_MIME_TYPES = [
     "video/mp4",
@@ -63,9 +78,100 @@ def gather_drive_folder_id(root_folder_id: str, folder_name: str) -> str:
     return folders[normalized]
 
 
-def transcribe_videos(limit: int | None, force: bool) -> None:
+def _download_stage(job: dict) -> tuple[dict | None, int]:
+    local_path = jobs.job_dir(job["video_id"]) / job["name"]
+    print(f"⬇️  Downloading {job['name']} ({job['video_id']})...")
+    download_file(job["video_id"], str(local_path))
+    jobs.update_job(job["video_id"], state=jobs.DOWNLOADED, local_path=str(local_path), error=None)
+    return {**job, "state": jobs.DOWNLOADED, "local_path": str(local_path)}, local_path.stat().st_size
+
+
+def _transcribe_file(client: OpenAI, path: Path) -> str:
+    with open(path, "rb") as file_handle:
+        response = client.audio.transcriptions.create(
+            model="gpt-4o-mini-transcribe",
+            file=file_handle,
+        )
+    return (response.text or "").strip()
+
+
+def _make_transcribe_stage(client: OpenAI, audio_only: bool, max_upload_bytes: int):
+    def _transcribe_stage(job: dict) -> tuple[dict | None, int]:
+        local_path = Path(job["local_path"])
+        if audio_only:
+            segments = prepare_audio(local_path, local_path.parent / "audio", max_bytes=max_upload_bytes)
+        else:
+            segments = [local_path]
+        uploaded_bytes = sum(segment.stat().st_size for segment in segments)
+        print(
+            f"🎙️  Transcribing {job['name']} ({len(segments)} upload(s), "
+            f"{uploaded_bytes / (1024 * 1024):.1f} MB)..."
+        )
+        started = time.perf_counter()
+        # Segments are cut at silences, so plain joining keeps sentences intact.
+        parts = [_transcribe_file(client, segment) for segment in segments]
+        print(f"   {job['name']}: transcribed in {time.perf_counter() - started:.1f}s")
+
+        transcript_text = "\n".join(part for part in parts if part).strip()
+        if not transcript_text:
+            print(f"⚠️  Empty transcript returned for {job['name']}. Skipping upload.")
+            jobs.record_failure(job["video_id"], "empty transcript")
+            return None, uploaded_bytes
+
+        transcript_path = local_path.with_suffix(".txt")
+        transcript_path.write_text(transcript_text, encoding="utf-8")
+        jobs.update_job(job["video_id"], state=jobs.TRANSCRIBED, transcript_path=str(transcript_path), error=None)
+        # The video is no longer needed once the transcript is safely on disk.
+        local_path.unlink(missing_ok=True)
+        shutil.rmtree(local_path.parent / "audio", ignore_errors=True)
+        return {**job, "state": jobs.TRANSCRIBED, "transcript_path": str(transcript_path)}, uploaded_bytes
+
+    return _transcribe_stage
+
+
+def _make_upload_stage(transcripts_folder_id: str):
+    def _upload_stage(job: dict) -> tuple[dict | None, int]:
+        transcript_text = Path(job["transcript_path"]).read_text(encoding="utf-8")
+        transcript_filename = f"{_normalize_name(job['name'])}.txt"
+        print(f"☁️  Uploading transcript as {transcript_filename}...")
+        upload_text_file(transcripts_folder_id, transcript_filename, transcript_text)
+        jobs.update_job(job["video_id"], state=jobs.DONE, error=None)
+        shutil.rmtree(jobs.WORK_DIR / job["video_id"], ignore_errors=True)
+        print(f"✅ Completed {job['name']}")
+        return {**job, "state": jobs.DONE}, len(transcript_text.encode("utf-8"))
+
+    return _upload_stage
+
+
+def _on_error(job: dict, exc: BaseException) -> None:
+    print(f"❌ {job['name']}: {exc}")
+    jobs.record_failure(job["video_id"], f"{type(exc).__name__}: {exc}")
+
+
+def _entry_stage(job: dict) -> str:
+    """Pick the stage a job resumes at, falling back if its artifact is missing."""
+    if job["state"] == jobs.TRANSCRIBED and job["transcript_path"] and Path(job["transcript_path"]).exists():
+        return "upload"
+    if job["state"] in (jobs.DOWNLOADED, jobs.TRANSCRIBED) and job["local_path"] and Path(job["local_path"]).exists():
+        return "transcribe"
+    return "download"
+
+
+def transcribe_videos(
+    limit: int | None,
+    force: bool,
+    download_workers: int = 2,
+    transcribe_workers: int = 2,
+    upload_workers: int = 2,
+    queue_size: int = 4,
+    audio_only: bool = False,
+    max_upload_mb: float = MAX_UPLOAD_BYTES / (1024 * 1024),
+) -> None:
     load_dotenv()
 
+    if audio_only and not ffmpeg_available():
+        raise RuntimeError("--audio-only requires ffmpeg and ffprobe on PATH.")
+
     root_folder_id = os.environ["ROOT_DRIVE_FOLDER_ID"]
     videos_folder_name = os.environ.get("TIKTOK_VIDEOS_FOLDER_NAME", "BFC_TikTok_Videos")
     transcripts_folder_name = os.environ.get(
@@ -77,11 +183,12 @@ def transcribe_videos(limit: int | None, force: bool) -> None:
     if not openai_api_key:
         raise RuntimeError("OPENAI_API_KEY is required for transcription.")
 
-    videos_folder_id = gather_drive_folder_id(root_folder_id, videos_folder_name)
-    transcripts_folder_id = gather_drive_folder_id(root_folder_id, transcripts_folder_name)
+    with profile_stage("list"):
+        videos_folder_id = gather_drive_folder_id(root_folder_id, videos_folder_name)
+        transcripts_folder_id = gather_drive_folder_id(root_folder_id, transcripts_folder_name)
 
-    video_files = list_files(videos_folder_id, mime_types=VIDEO_MIME_TYPES)
-    transcript_files = list_files(transcripts_folder_id, mime_types=TRANSCRIPT_MIME_TYPES)
+        video_files = list_files(videos_folder_id, mime_types=VIDEO_MIME_TYPES)
+        transcript_files = list_files(transcripts_folder_id, mime_types=TRANSCRIPT_MIME_TYPES)
 
     existing_transcripts = {
         _normalize_name(f["name"]): f for f in transcript_files
@@ -98,38 +205,36 @@ def transcribe_videos(limit: int | None, force: bool) -> None:
         if limit and len(pending) >= limit:
             break
 
-    if not pending:
+    jobs.enqueue_jobs(pending)
+    # Only work on videos selected this run; older unfinished jobs for videos that
+    # have since been transcribed elsewhere stay untouched.
+    open_jobs = jobs.open_jobs([video["id"] for video in pending])
+
+    if not open_jobs:
         print("✅ No videos to transcribe. All caught up!")
         return
 
-    print(f"Transcribing {len(pending)} video(s)...")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-
-        for video in pending:
-            base = _normalize_name(video["name"])
-            local_path = tmpdir_path / video["name"]
-            print(f"⬇️  Downloading {video['name']} ({video['id']})...")
-            download_file(video["id"], str(local_path))
-
-            print("🎙️  Sending to OpenAI transcription API...")
-            with open(local_path, "rb") as file_handle:
-                response = client.audio.transcriptions.create(
-                    model="gpt-4o-mini-transcribe",
-                    file=file_handle,
-                )
-
-            transcript_text = (response.text or "").strip()
-            if not transcript_text:
-                print(f"⚠️  Empty transcript returned for {video['name']}. Skipping upload.")
-                continue
-
-            transcript_filename = f"{base}.txt"
-            print(f"☁️  Uploading transcript as {transcript_filename}...")
-            upload_text_file(transcripts_folder_id, transcript_filename, transcript_text)
-            print(f"✅ Completed {video['name']}")
-
+    entries: dict[str, list[dict]] = {"download": [], "transcribe": [], "upload": []}
+    for job in open_jobs:
+        entries[_entry_stage(job)].append(job)
+    resumed = len(open_jobs) - len(entries["download"])
+    print(f"Transcribing {len(open_jobs)} video(s)" + (f" ({resumed} resumed)..." if resumed else "..."))
+
+    stages = [
+        Stage("download", _download_stage, download_workers, on_error=_on_error),
+        Stage(
+            "transcribe",
+            _make_transcribe_stage(client, audio_only, int(max_upload_mb * 1024 * 1024)),
+            transcribe_workers,
+            on_error=_on_error,
+        ),
+        Stage("upload", _make_upload_stage(transcripts_folder_id), upload_workers, on_error=_on_error),
+    ]
+    metrics = run_pipeline(stages, entries, queue_size=queue_size)
+
+    print("Stage metrics:")
+    for stage_metrics in metrics:
+        print(f"  {stage_metrics.summary()}")
     print("✨ Done")
 
 
@@ -141,9 +246,45 @@ def main() -> None:
         action="store_true",
         help="Re-transcribe even if a transcript already exists",
     )
+    parser.add_argument("--download-workers", type=int, default=2, help="Concurrent Drive downloads")
+    parser.add_argument("--transcribe-workers", type=int, default=2, help="Concurrent transcription requests")
+    parser.add_argument("--upload-workers", type=int, default=2, help="Concurrent transcript uploads")
+    parser.add_argument("--queue-size", type=int, default=4, help="Bounded queue size between stages")
+    parser.add_argument(
+        "--audio-only",
+        action="store_true",
+        help="Extract a compressed mono audio track with ffmpeg and split it at silences before upload",
+    )
+    parser.add_argument(
+        "--max-upload-mb",
+        type=float,
+        default=MAX_UPLOAD_BYTES / (1024 * 1024),
+        help="Largest single transcription upload when using --audio-only",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Write cProfile stats and tracemalloc peaks per stage to data/profiles/",
+    )
     args = parser.parse_args()
 
-    transcribe_videos(limit=args.limit, force=args.force)
+    if args.profile:
+        enable_profiling("transcribe")
+    try:
+        transcribe_videos(
+            limit=args.limit,
+            force=args.force,
+            download_workers=args.download_workers,
+            transcribe_workers=args.transcribe_workers,
+            upload_workers=args.upload_workers,
+            queue_size=args.queue_size,
+            audio_only=args.audio_only,
+            max_upload_mb=args.max_upload_mb,
+        )
+    finally:
+        profile_dir = finish_profiling()
+        if profile_dir:
+            print(f"Profiles: {profile_dir}")
 
 
 if __name__ == "__main__":